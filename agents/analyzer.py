@@ -4,9 +4,9 @@ from models.schemas import (
     RFPAnalysis,
     ClientContext,
     RFPSection,
-    Question,
     QuestionCategory,
     Priority,
+    QuestionListAdapter,
 )
 from services.llm_service import LLMService
 
@@ -94,40 +94,41 @@ Respond in JSON format."""
 
     def _group_questions_by_category(self, questions: List[Dict[str, Any]]) -> List[RFPSection]:
         """Group questions by category into sections."""
-        sections_dict = {}
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        categories: Dict[str, QuestionCategory] = {}
 
         for q in questions:
             category = q.get("category", "company_info")
-            try:
-                cat_enum = QuestionCategory(category)
-            except ValueError:
-                cat_enum = QuestionCategory.COMPANY_INFO
-
-            if category not in sections_dict:
-                sections_dict[category] = RFPSection(
-                    section_id=f"S-{category}",
-                    title=category.replace("_", " ").title(),
-                    category=cat_enum,
-                    questions=[],
-                )
+            if category not in categories:
+                try:
+                    categories[category] = QuestionCategory(category)
+                except ValueError:
+                    categories[category] = QuestionCategory.COMPANY_INFO
+                grouped[category] = []
 
-            # Create Question object
             try:
                 priority = Priority(q.get("priority", "should_have"))
             except ValueError:
                 priority = Priority.SHOULD_HAVE
 
-            question = Question(
-                q_id=q.get("q_id", f"Q{len(sections_dict[category].questions) + 1}"),
-                text=q.get("text", ""),
-                category=cat_enum,
-                priority=priority,
-                complexity=q.get("complexity", "medium"),
+            grouped[category].append({
+                "q_id": q.get("q_id", f"Q{len(grouped[category]) + 1}"),
+                "text": q.get("text", ""),
+                "category": categories[category],
+                "priority": priority,
+                "complexity": q.get("complexity", "medium"),
+            })
+
+        # Validate each section's questions in one batch through the compiled adapter
+        return [
+            RFPSection(
+                section_id=f"S-{category}",
+                title=category.replace("_", " ").title(),
+                category=categories[category],
+                questions=QuestionListAdapter.validate_python(section_questions),
             )
-
-            sections_dict[category].questions.append(question)
-
-        return list(sections_dict.values())
+            for category, section_questions in grouped.items()
+        ]
 
     def quick_analyze(self, company_name: str, contact_title: str = None) -> ClientContext:
         """Quick analysis for simple proposal requests."""
@@ -157,10 +157,15 @@ class OrchestratorAgent:
             traceback.print_exc()
             raise
 
-    def create_quick_proposal(self, request: ProposalRequest) -> WorkflowStatus:
-        """Create a quick proposal for sales outreach."""
+    def create_quick_proposal(self, request: ProposalRequest, workflow_id: Optional[str] = None) -> WorkflowStatus:
+        """Create a quick proposal for sales outreach.
 
-        workflow_id = f"WF-QUICK-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        Args:
+            request: Proposal request
+            workflow_id: ID of the persisted workflow; generated when omitted
+        """
+
+        workflow_id = workflow_id or f"WF-QUICK-{datetime.now().strftime('%Y%m%d%H%M%S')}"
         print(f"[{workflow_id}] Creating quick proposal for {request.client_name}")
 
         workflow = WorkflowStatus(
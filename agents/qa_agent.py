@@ -2,6 +2,8 @@
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+
 from models.schemas import QAResponse, QASource
 from services.llm_service import LLMService
 from services.vector_store import VectorStore
@@ -20,7 +22,8 @@ class QAAgent:
         question: str,
         top_k: int = 5,
         include_sources: bool = True,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> QAResponse:
         """
         Answer a question using RAG.
@@ -30,12 +33,17 @@ class QAAgent:
             top_k: Number of chunks to retrieve
             include_sources: Whether to include source chunks in response
             context: Optional additional context for the question
+            query_embedding: Precomputed embedding of the question (from
+                VectorStore.encode_queries), to skip encoding it again
 
         Returns:
             QAResponse with answer, sources, and confidence
         """
         # Step 1: Retrieve relevant chunks
-        search_results = self.vector_store.search(question, top_k=top_k)
+        if query_embedding is not None:
+            search_results = self.vector_store.search_with_embedding(query_embedding, top_k=top_k)
+        else:
+            search_results = self.vector_store.search(question, top_k=top_k)
 
         # Step 2: Generate answer using LLM
         answer, confidence = self._generate_answer(question, search_results, context)
@@ -179,6 +187,8 @@ Please provide a comprehensive answer based on the context above. Include source
         if not search_results:
             return 0.0
 
+        # Plain Python on purpose: there are at most top_k scores, and building
+        # a NumPy array (let alone a JIT call) costs more than the arithmetic
         scores = [score for _, score, _ in search_results]
 
         # Calculate metrics
@@ -1,16 +1,25 @@
 """FastAPI routes for the sales proposal system."""
+import asyncio
+import json
 import os
+import time
+import uuid
+import httpx
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from urllib.parse import urlsplit
 
-from models.schemas import ProposalRequest, RFPUploadRequest, WorkflowStatus, QARequest, QAResponse
+from models.schemas import (
+    ProposalRequest, QuickProposalBatchRequest, QuickProposalBatchError, QuickProposalBatchResult,
+    RFPUploadRequest, WorkflowStatus, QARequest, QAResponse, KnowledgeItem, KnowledgeAddBatchRequest, KnowledgeSearchBatchRequest
+)
 from models.database import (
-    init_database, save_document, get_document, get_all_documents,
-    get_default_user, get_all_users, get_user_by_id,
-    create_workflow, get_workflow, get_all_workflows, update_workflow_state
+    init_database, get_workflow, get_workflow_progress, get_all_workflows, aget_workflow, aget_workflow_progress,
+    asave_document, aget_document, aget_all_documents, aget_default_user, aget_all_users,
+    acreate_workflow, aupdate_workflow_state, aupdate_workflow_final
 )
 from services.llm_service import LLMService
 from services.vector_store import VectorStore
@@ -44,6 +53,21 @@ qa_agent = None
 rfp_processor = None
 doc_processor = DocumentProcessor()
 
+# Workflow event streaming (SSE)
+WORKFLOW_TERMINAL_STATES = {"ready", "human_review", "closed", "error"}
+WORKFLOW_EVENT_CHECK_INTERVAL = 0.25  # seconds between server-side state checks
+WORKFLOW_EVENT_KEEPALIVE = 15  # seconds between keep-alive comments
+
+# Suggested client poll interval per in-progress state; generation is the long step
+WORKFLOW_STATUS_CHECK_HINTS = {
+    "created": 0.5,
+    "analyzing": 1.0,
+    "routing": 0.5,
+    "generating": 2.0,
+    "reviewing": 1.0,
+    "formatting": 0.5,
+}
+
 
 def get_orchestrator() -> OrchestratorAgent:
     """Get or create orchestrator instance."""
@@ -101,14 +125,19 @@ def root():
         "endpoints": {
             "health": "/health",
             "quick_proposal": "/api/v1/proposals/quick",
+            "quick_proposal_batch": "/api/v1/proposals/quick/batch",
             "upload_rfp": "/api/v1/rfp/upload",
             "workflow_status": "/api/v1/workflows/{workflow_id}",
+            "workflow_progress": "/api/v1/workflows/{workflow_id}/status",
+            "workflow_events": "/api/v1/workflows/{workflow_id}/events",
             "download": "/api/v1/download/{workflow_id}",
             "qa_ask": "/api/v1/qa/ask",
             "qa_batch": "/api/v1/qa/batch",
             "qa_suggestions": "/api/v1/qa/suggestions",
             "knowledge_search": "/api/v1/knowledge/search",
+            "knowledge_search_batch": "/api/v1/knowledge/search/batch",
             "knowledge_add": "/api/v1/knowledge/add",
+            "knowledge_add_batch": "/api/v1/knowledge/add/batch",
             "documents_list": "/api/v1/documents",
             "document_get": "/api/v1/documents/{workflow_id}",
             "document_update": "/api/v1/documents/{workflow_id}",
@@ -132,6 +161,31 @@ def health_check():
     }
 
 
+async def run_quick_proposal(request: ProposalRequest, workflow_id: str):
+    """Create, generate and persist a quick proposal workflow."""
+    # Create workflow in database
+    await acreate_workflow(
+        workflow_id=workflow_id,
+        client_name=request.client_name,
+        workflow_type="quick_proposal",
+        industry=request.industry
+    )
+
+    # Process using orchestrator (blocking LLM calls run off the event loop)
+    orch = get_orchestrator()
+    workflow = await asyncio.to_thread(orch.create_quick_proposal, request, workflow_id)
+
+    # Update workflow in database with results
+    await aupdate_workflow_final(
+        workflow_id=workflow_id,
+        output_file_path=workflow.output_file_path,
+        proposal_content=workflow.proposal_content,
+        state=workflow.state
+    )
+
+    return workflow
+
+
 @app.post("/api/v1/proposals/quick", response_model=WorkflowStatus)
 async def create_quick_proposal(request: ProposalRequest):
     """
@@ -140,34 +194,39 @@ async def create_quick_proposal(request: ProposalRequest):
     This is the fast-track pipeline for sales reps who need a proposal quickly.
     """
     try:
-        # Generate workflow ID
-        workflow_id = f"WF-QUICK-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # Generate workflow ID; the suffix keeps concurrent requests within the
+        # same second from colliding on the unique workflow_id
+        workflow_id = f"WF-QUICK-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
 
-        # Create workflow in database
-        create_workflow(
-            workflow_id=workflow_id,
-            client_name=request.client_name,
-            workflow_type="quick_proposal",
-            industry=request.industry
-        )
+        return await run_quick_proposal(request, workflow_id)
 
-        # Process using orchestrator (synchronous for quick proposals)
-        orch = get_orchestrator()
-        workflow = orch.create_quick_proposal(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create proposal: {str(e)}")
 
-        # Update workflow in database with results
-        from models.database import update_workflow_final
-        update_workflow_final(
-            workflow_id=workflow_id,
-            output_file_path=workflow.output_file_path,
-            proposal_content=workflow.proposal_content,
-            state=workflow.state
-        )
 
-        return workflow
+@app.post("/api/v1/proposals/quick/batch", response_model=List[QuickProposalBatchResult])
+async def create_quick_proposals_batch(request: QuickProposalBatchRequest):
+    """
+    Create several quick proposals in one request.
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create proposal: {str(e)}")
+    Proposals are generated concurrently; results are returned in request order.
+    A proposal that fails is reported as an error entry without affecting the
+    others.
+    """
+    batch_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    workflow_ids = [f"WF-QUICK-{batch_id}-{i}" for i in range(1, len(request.proposals) + 1)]
+
+    results = await asyncio.gather(
+        *(run_quick_proposal(proposal, workflow_id)
+          for proposal, workflow_id in zip(request.proposals, workflow_ids)),
+        return_exceptions=True,
+    )
+
+    return [
+        QuickProposalBatchError(workflow_id=workflow_id, error=str(result))
+        if isinstance(result, Exception) else result
+        for workflow_id, result in zip(workflow_ids, results)
+    ]
 
 
 @app.post("/api/v1/rfp/upload")
@@ -175,6 +234,7 @@ async def upload_rfp(
     file: UploadFile = File(...),
     client_name: str = "",
     industry: Optional[str] = None,
+    callback_url: Optional[str] = None,
     background_tasks: BackgroundTasks = None,
 ):
     """
@@ -186,7 +246,15 @@ async def upload_rfp(
       2. generating - Generate answers
       3. reviewing - Quality review
       4. ready - Format document
+
+    If callback_url is given, the final workflow JSON is POSTed to it when
+    background processing finishes (successfully or not). Callbacks must be
+    enabled with WORKFLOW_CALLBACKS_ENABLED and the URL's host must be in
+    WORKFLOW_CALLBACK_ALLOWED_HOSTS; anything else is rejected with 400.
     """
+    if callback_url is not None:
+        validate_callback_url(callback_url)
+
     try:
         # Validate file type
         allowed_extensions = [".pdf", ".docx", ".doc", ".txt"]
@@ -209,7 +277,7 @@ async def upload_rfp(
 
         # Create workflow in database
         workflow_id = f"WF-RFP-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        create_workflow(
+        await acreate_workflow(
             workflow_id=workflow_id,
             client_name=client_name,
             workflow_type="rfp_response",
@@ -224,12 +292,14 @@ async def upload_rfp(
                 workflow_id,
                 rfp_text,
                 client_name,
-                industry
+                industry,
+                callback_url
             )
             return {
                 "workflow_id": workflow_id,
                 "status": "processing",
                 "message": "RFP uploaded successfully. Processing in background.",
+                "callback_registered": callback_url is not None,
             }
         else:
             # Process synchronously (for testing)
@@ -245,7 +315,13 @@ async def upload_rfp(
         raise HTTPException(status_code=500, detail=f"Failed to process RFP: {str(e)}")
 
 
-async def process_rfp_background(workflow_id: str, rfp_text: str, client_name: str, industry: Optional[str]):
+async def process_rfp_background(
+    workflow_id: str,
+    rfp_text: str,
+    client_name: str,
+    industry: Optional[str],
+    callback_url: Optional[str] = None,
+):
     """Background task to process RFP using new stepwise processor."""
     try:
         print(f"[Background Task] Starting RFP processing for workflow {workflow_id}")
@@ -258,10 +334,48 @@ async def process_rfp_background(workflow_id: str, rfp_text: str, client_name: s
         traceback.print_exc()
         # Update workflow to error state
         try:
-            update_workflow_state(workflow_id, "error")
+            await aupdate_workflow_state(workflow_id, "error")
         except:
             pass
 
+    if callback_url:
+        await notify_workflow_callback(callback_url, workflow_id)
+
+
+def validate_callback_url(callback_url: str):
+    """Reject callback URLs the server must not POST to.
+
+    Raises:
+        HTTPException: 400 if callbacks are disabled, the URL is not http(s),
+            or its host is not in the configured allowlist.
+    """
+    if not settings.workflow_callbacks_enabled:
+        raise HTTPException(status_code=400, detail="Workflow callbacks are disabled")
+
+    parts = urlsplit(callback_url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise HTTPException(status_code=400, detail="callback_url must be an http(s) URL")
+
+    allowed_hosts = {
+        host.strip().lower()
+        for host in settings.workflow_callback_allowed_hosts.split(",")
+        if host.strip()
+    }
+    if parts.hostname.lower() not in allowed_hosts:
+        raise HTTPException(
+            status_code=400, detail=f"callback_url host not allowed: {parts.hostname}"
+        )
+
+
+async def notify_workflow_callback(callback_url: str, workflow_id: str):
+    """POST the final workflow JSON to a client-supplied callback URL."""
+    try:
+        workflow = await aget_workflow(workflow_id)
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.post(callback_url, json=workflow)
+    except Exception as e:
+        print(f"[Background Task] Failed to notify callback for workflow {workflow_id}: {e}")
+
 
 @app.get("/api/v1/workflows/{workflow_id}")
 def get_workflow_status(workflow_id: str):
@@ -273,14 +387,96 @@ def get_workflow_status(workflow_id: str):
     - generated_responses progressively populated during 'generating' state
     - review_result available after 'reviewing' state
     - output_file_path available when state is 'ready'
+    - status_check_interval_hint_seconds suggests when to poll again while in progress
     """
     workflow = get_workflow(workflow_id)
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
 
+    hint = WORKFLOW_STATUS_CHECK_HINTS.get(workflow["state"])
+    if hint is not None:
+        workflow["status_check_interval_hint_seconds"] = hint
+
     return workflow
 
 
+@app.get("/api/v1/workflows/{workflow_id}/status")
+def get_workflow_progress_summary(workflow_id: str):
+    """Get a workflow's state and progress counters only.
+
+    Cheap to poll: the analysis, responses and review payloads are left out
+    (responses_count and total_questions summarize them). Fetch
+    /api/v1/workflows/{workflow_id} once the workflow is finished.
+    """
+    progress = get_workflow_progress(workflow_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    hint = WORKFLOW_STATUS_CHECK_HINTS.get(progress["state"])
+    if hint is not None:
+        progress["status_check_interval_hint_seconds"] = hint
+
+    return progress
+
+
+@app.get("/api/v1/workflows/{workflow_id}/events")
+async def stream_workflow_events(workflow_id: str, states: Optional[str] = None):
+    """Stream workflow state transitions as Server-Sent Events.
+
+    Each state change is sent as an ``event: state`` message whose data is the
+    workflow JSON. The stream closes after a terminal state (ready,
+    human_review, closed, error).
+
+    Args:
+        workflow_id: Workflow to subscribe to
+        states: Optional comma-separated states to subscribe to. Terminal
+            states are always delivered so the client knows when to stop.
+    """
+    workflow = await aget_workflow(workflow_id)
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    subscribed = {state.strip() for state in states.split(",") if state.strip()} if states else None
+
+    async def event_stream():
+        # Changes are detected with the lightweight progress query; the full
+        # row (with every generated response) is only loaded for a state
+        # change that is actually sent
+        current = workflow
+        state = workflow["state"]
+        last_state = None
+        last_sent = time.monotonic()
+
+        while True:
+            if state != last_state:
+                last_state = state
+                if subscribed is None or state in subscribed or state in WORKFLOW_TERMINAL_STATES:
+                    if current is None:
+                        current = await aget_workflow(workflow_id)
+                        if current is None:
+                            return
+                    yield f"event: state\ndata: {json.dumps(current)}\n\n"
+                    last_sent = time.monotonic()
+                if state in WORKFLOW_TERMINAL_STATES:
+                    return
+            elif time.monotonic() - last_sent >= WORKFLOW_EVENT_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(WORKFLOW_EVENT_CHECK_INTERVAL)
+            progress = await aget_workflow_progress(workflow_id)
+            if progress is None:
+                return
+            state = progress["state"]
+            current = None
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/v1/workflows")
 def list_workflows(limit: int = 50):
     """List all workflows, most recent first."""
@@ -323,15 +519,29 @@ def download_proposal(workflow_id: str):
 
 
 @app.post("/api/v1/knowledge/add")
-async def add_knowledge(text: str, metadata: Optional[dict] = None):
+async def add_knowledge(
+    item: Optional[KnowledgeItem] = None,
+    text: Optional[str] = None,
+    metadata: Optional[str] = None
+):
     """
     Add content to the knowledge base (vector store).
 
     Use this to populate the system with past proposals, case studies, etc.
+    Send ``{"text": ..., "metadata": {...}}`` as the JSON body; the legacy
+    ``text`` and ``metadata`` (JSON string) query parameters still work.
     """
+    if item is None:
+        if text is None:
+            raise HTTPException(status_code=400, detail="Provide text in the JSON body")
+        try:
+            item = KnowledgeItem(text=text, metadata=json.loads(metadata) if metadata else {})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid metadata: {str(e)}")
+
     try:
         vs = get_orchestrator().vector_store
-        vs.add_documents([text], [metadata] if metadata else None)
+        vs.add_documents([item.text], [item.metadata])
         vs.save()
 
         return {"status": "success", "message": "Content added to knowledge base"}
@@ -340,6 +550,24 @@ async def add_knowledge(text: str, metadata: Optional[dict] = None):
         raise HTTPException(status_code=500, detail=f"Failed to add knowledge: {str(e)}")
 
 
+@app.post("/api/v1/knowledge/add/batch")
+def add_knowledge_batch(request: KnowledgeAddBatchRequest):
+    """Add several pieces of content to the knowledge base in one request.
+
+    Items are embedded together, added to the index in one call, and the
+    vector store is saved once.
+    """
+    try:
+        vs = get_orchestrator().vector_store
+        vs.add_documents([item.text for item in request.items], [item.metadata for item in request.items])
+        vs.save()
+
+        return {"status": "success", "message": f"{len(request.items)} items added to knowledge base"}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to add knowledge: {str(e)}")
+
+
 @app.get("/api/v1/knowledge/search")
 def search_knowledge(query: str, top_k: int = 5):
     """Search the knowledge base."""
@@ -356,6 +584,31 @@ def search_knowledge(query: str, top_k: int = 5):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@app.post("/api/v1/knowledge/search/batch")
+def search_knowledge_batch(request: KnowledgeSearchBatchRequest):
+    """Search the knowledge base for several queries in one request.
+
+    Queries are embedded together and looked up in a single index search.
+    Results are returned in the same order as the queries.
+    """
+    try:
+        vs = get_orchestrator().vector_store
+        batch_results = vs.search_batch(request.queries, top_k=request.top_k)
+
+        return {
+            "results": [
+                {
+                    "query": query,
+                    "results": [{"text": doc, "score": score, "metadata": meta} for doc, score, meta in results],
+                }
+                for query, results in zip(request.queries, batch_results)
+            ],
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
 # ==================== Q&A Endpoints ====================
 
 @app.post("/api/v1/qa/ask", response_model=QAResponse)
@@ -462,7 +715,7 @@ async def list_documents(limit: int = 50):
     Returns documents sorted by most recently updated.
     """
     try:
-        documents = get_all_documents(limit=limit)
+        documents = await aget_all_documents(limit=limit)
         return {
             "count": len(documents),
             "documents": documents
@@ -477,7 +730,7 @@ async def get_document_content(workflow_id: str):
     Get a specific document by workflow ID.
     """
     try:
-        document = get_document(workflow_id)
+        document = await aget_document(workflow_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         return document
@@ -497,16 +750,16 @@ async def update_document(workflow_id: str, title: str, content: str, user_id: O
     try:
         # Use default user if not specified
         if user_id is None:
-            default_user = get_default_user()
+            default_user = await aget_default_user()
             if default_user:
                 user_id = default_user.id
 
         # Get existing document to preserve client_name
-        existing = get_document(workflow_id)
+        existing = await aget_document(workflow_id)
         client_name = existing.get("client_name") if existing else None
         document_type = existing.get("document_type", "proposal") if existing else "proposal"
 
-        document = save_document(
+        document = await asave_document(
             workflow_id=workflow_id,
             title=title,
             content=content,
@@ -537,11 +790,11 @@ async def create_document(
     """
     try:
         # Check if document already exists
-        existing = get_document(workflow_id)
+        existing = await aget_document(workflow_id)
         if existing:
             raise HTTPException(status_code=400, detail="Document with this workflow_id already exists")
 
-        document = save_document(
+        document = await asave_document(
             workflow_id=workflow_id,
             title=title,
             content=content,
@@ -566,7 +819,7 @@ async def list_users():
     List all active users.
     """
     try:
-        users = get_all_users()
+        users = await aget_all_users()
         return {
             "count": len(users),
             "users": users
@@ -581,7 +834,7 @@ async def get_current_user():
     Get the current (default) user.
     """
     try:
-        user = get_default_user()
+        user = await aget_default_user()
         if not user:
             raise HTTPException(status_code=404, detail="No default user found")
         return user.to_dict()
@@ -10,17 +10,34 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
+    openai_api_keys: Optional[str] = None  # comma-separated; calls round-robin across keys
+    anthropic_api_keys: Optional[str] = None  # comma-separated; calls round-robin across keys
 
     # LLM Settings
     default_llm_provider: str = "anthropic"  # openai or anthropic
     default_model: str = "claude-haiku-4-5-20251001"
     temperature: float = 0.7
     max_tokens: int = 2000
+    llm_max_concurrency: int = 8  # concurrent async LLM requests per service
 
     # Vector Store Settings
     embedding_model: str = "all-MiniLM-L6-v2"
+    embed_device: Optional[str] = None  # cpu, cuda or mps; auto-detected when unset
     vector_store_path: str = "./data/vector_store"
     top_k_results: int = 5
+    vector_index_type: str = "hnsw"  # hnsw or flat
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    hnsw_min_documents: int = 1000  # exact flat index until the store reaches this size
+    faiss_omp_threads: int = 0  # OpenMP threads for FAISS adds/searches (0 keeps FAISS's default: all cores)
+    vector_storage_dtype: str = "fp32"  # fp32, fp16 (halves index memory) or int8 (quarters it)
+    int8_min_documents: int = 1000  # int8 codes are trained once the store reaches this size
+    embedding_cache_max_files: int = 50000  # on-disk query embeddings kept; least recently used pruned
+
+    # Question Cache
+    question_cache_ttl_seconds: int = 86400  # cached extractions expire after a day
+    question_cache_max_entries: int = 10000  # least recently used entries evicted beyond this
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/proposals.db"
@@ -36,6 +53,8 @@ class Settings(BaseSettings):
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    workflow_callbacks_enabled: bool = False  # allow upload_rfp(callback_url=...) completion POSTs
+    workflow_callback_allowed_hosts: str = "127.0.0.1,localhost,::1"  # comma-separated callback hosts
 
     class Config:
         env_file = ".env"
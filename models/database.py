@@ -1,11 +1,19 @@
 """SQLAlchemy database models for document editing and user tracking."""
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Float
+from sqlalchemy import create_engine, event, make_url, select, update, func, literal, literal_column, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Float
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, relationship, load_only, joinedload
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from datetime import datetime
+import asyncio
 import os
 import json
 
+import orjson
+
+from config import settings
+
 # Create base class for models
 Base = declarative_base()
 
@@ -76,6 +84,22 @@ class EditableDocument(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
+    def to_summary_dict(self):
+        """Convert document to a lightweight dictionary for list views (no content bodies)."""
+        return {
+            "id": self.id,
+            "workflow_id": self.workflow_id,
+            "title": self.title,
+            "client_name": self.client_name,
+            "document_type": self.document_type,
+            "last_edited_by": self.last_edited_by,
+            "last_edited_by_user": self.last_edited_by_user.to_dict() if self.last_edited_by_user else None,
+            "last_edited_at": self.last_edited_at.isoformat() if self.last_edited_at else None,
+            "edit_count": self.edit_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
 
 class Workflow(Base):
     """Workflow model for tracking RFP and proposal processing state."""
@@ -105,7 +129,7 @@ class Workflow(Base):
     proposal_content = Column(Text, nullable=True)  # For quick proposals
 
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # list order
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
 
@@ -130,10 +154,38 @@ class Workflow(Base):
         }
 
 
+# Columns returned by workflow list views (excludes JSON/content columns)
+WORKFLOW_SUMMARY_COLUMNS = (
+    Workflow.id, Workflow.workflow_id, Workflow.state, Workflow.workflow_type,
+    Workflow.client_name, Workflow.industry, Workflow.output_file_path,
+    Workflow.created_at, Workflow.updated_at, Workflow.completed_at
+)
+
+
 # Database connection management
 _engine = None
 _SessionLocal = None
 
+# Upper bound on the database file bytes SQLite memory-maps for reads
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _json_serializer(value) -> str:
+    """Encode JSON columns with orjson, falling back to json for what it rejects."""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # e.g. integers beyond 64 bits
+        return json.dumps(value)
+
+
+def _json_deserializer(text: str):
+    """Decode JSON columns with orjson; rows json wrote with NaN/Infinity need json."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
 
 def get_engine():
     """Get or create database engine."""
@@ -143,11 +195,35 @@ def get_engine():
         os.makedirs("./data", exist_ok=True)
 
         # Use synchronous SQLite (not aiosqlite)
-        database_url = "sqlite:///./data/proposals.db"
-        _engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        database_url = settings.database_url.replace("+aiosqlite", "")
+        is_sqlite = make_url(database_url).get_backend_name() == "sqlite"
+        _engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False} if is_sqlite else {},
+            json_serializer=_json_serializer,
+            json_deserializer=_json_deserializer,
+        )
+        if is_sqlite:
+            event.listen(_engine, "connect", _set_sqlite_pragmas)
     return _engine
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL with synchronous=NORMAL on every new connection.
+
+    Commits then append to the WAL without an fsync each (the WAL is synced at
+    checkpoints), and readers no longer block the writer. Reads go through a
+    memory map of the database file, and temporary sort/index b-trees stay in
+    memory instead of spilling to temp files.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
 def get_session():
     """Get a new database session."""
     global _SessionLocal
@@ -161,6 +237,9 @@ def init_database():
     """Initialize database and create tables."""
     engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced later
+    for index in Workflow.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
     # Create default user if not exists
     session = get_session()
@@ -196,40 +275,44 @@ def get_default_user():
 
 def save_document(workflow_id: str, title: str, content: str, client_name: str = None,
                   document_type: str = "proposal", user_id: int = None):
-    """Save or update an editable document."""
+    """Save or update an editable document.
+
+    Uses a single SQLite UPSERT keyed on workflow_id instead of a SELECT
+    followed by an INSERT or UPDATE.
+    """
     session = get_session()
     try:
-        # Check if document exists
-        doc = session.query(EditableDocument).filter_by(workflow_id=workflow_id).first()
-
-        if doc:
-            # Update existing document
-            doc.content = content
-            doc.title = title
-            doc.client_name = client_name
-            doc.last_edited_by = user_id
-            doc.last_edited_at = datetime.utcnow()
-            doc.edit_count += 1
-        else:
-            # Create new document
-            doc = EditableDocument(
-                workflow_id=workflow_id,
-                title=title,
-                content=content,
-                original_content=content,
-                client_name=client_name,
-                document_type=document_type,
-                last_edited_by=user_id,
-                last_edited_at=datetime.utcnow() if user_id else None,
-                edit_count=0
-            )
-            session.add(doc)
-
+        now = datetime.utcnow()
+        stmt = sqlite_insert(EditableDocument).values(
+            workflow_id=workflow_id,
+            title=title,
+            content=content,
+            original_content=content,
+            client_name=client_name,
+            document_type=document_type,
+            last_edited_by=user_id,
+            last_edited_at=now if user_id else None,
+            edit_count=0,
+            created_at=now,
+            updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EditableDocument.workflow_id],
+            set_={
+                "content": stmt.excluded.content,
+                "title": stmt.excluded.title,
+                "client_name": stmt.excluded.client_name,
+                "last_edited_by": stmt.excluded.last_edited_by,
+                "last_edited_at": now,
+                "edit_count": EditableDocument.edit_count + 1,
+                "updated_at": now
+            }
+        ).returning(EditableDocument)
+
+        doc = session.scalars(stmt, execution_options={"populate_existing": True}).one()
+        result = doc.to_dict()
         session.commit()
-
-        # Refresh to get relationships
-        session.refresh(doc)
-        return doc.to_dict()
+        return result
     except Exception as e:
         session.rollback()
         raise e
@@ -248,13 +331,21 @@ def get_document(workflow_id: str):
 
 
 def get_all_documents(limit: int = 50):
-    """Get all documents, most recent first."""
+    """Get all documents, most recent first (summary fields only)."""
     session = get_session()
     try:
-        docs = session.query(EditableDocument).order_by(
+        docs = session.query(EditableDocument).options(
+            load_only(
+                EditableDocument.id, EditableDocument.workflow_id, EditableDocument.title,
+                EditableDocument.client_name, EditableDocument.document_type,
+                EditableDocument.last_edited_by, EditableDocument.last_edited_at,
+                EditableDocument.edit_count, EditableDocument.created_at, EditableDocument.updated_at
+            ),
+            joinedload(EditableDocument.last_edited_by_user)
+        ).order_by(
             EditableDocument.updated_at.desc()
         ).limit(limit).all()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_summary_dict() for doc in docs]
     finally:
         session.close()
 
@@ -281,6 +372,33 @@ def get_all_users():
 
 # ==================== Workflow Database Functions ====================
 
+def _core_execute(stmt):
+    """Execute a Core statement in its own transaction, bypassing the ORM session.
+
+    The result is buffered so it can be read after the connection is released.
+    """
+    with get_engine().begin() as conn:
+        return conn.execute(stmt).freeze()()
+
+
+def _serialize_row(row) -> dict:
+    """Convert a Core row mapping to a JSON-friendly dict (datetimes as ISO strings)."""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
+
+def _commit_and_serialize(session, workflow):
+    """Flush, serialize and commit a workflow.
+
+    Serializing before commit avoids the extra SELECT that a refresh (or
+    expire-on-commit attribute access) would issue afterwards. The flush
+    populates the autoincrement id and column defaults.
+    """
+    session.flush()
+    result = workflow.to_dict()
+    session.commit()
+    return result
+
+
 def create_workflow(workflow_id: str, client_name: str, workflow_type: str = "rfp_response",
                    industry: str = None, file_path: str = None):
     """Create a new workflow in the database."""
@@ -295,9 +413,7 @@ def create_workflow(workflow_id: str, client_name: str, workflow_type: str = "rf
             file_path=file_path
         )
         session.add(workflow)
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
+        return _commit_and_serialize(session, workflow)
     except Exception as e:
         session.rollback()
         raise e
@@ -315,24 +431,39 @@ def get_workflow(workflow_id: str):
         session.close()
 
 
-def update_workflow_state(workflow_id: str, state: str):
-    """Update workflow state."""
-    session = get_session()
-    try:
-        workflow = session.query(Workflow).filter_by(workflow_id=workflow_id).first()
-        if not workflow:
-            raise ValueError(f"Workflow {workflow_id} not found")
+def get_workflow_progress(workflow_id: str):
+    """Get a workflow's state and progress counters without its JSON payloads.
 
-        workflow.state = state
-        workflow.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+    The counts are computed by SQLite (json_array_length / json_extract), so
+    status polls never load or decode the analysis and response blobs.
+    """
+    stmt = select(
+        Workflow.workflow_id,
+        Workflow.state,
+        func.coalesce(func.json_array_length(Workflow.generated_responses), 0).label("responses_count"),
+        func.json_extract(Workflow.rfp_analysis, "$.total_questions").label("total_questions"),
+        Workflow.updated_at,
+    ).where(Workflow.workflow_id == workflow_id)
+    row = _core_execute(stmt).mappings().first()
+    return _serialize_row(row) if row else None
+
+
+def update_workflow_state(workflow_id: str, state: str):
+    """Update workflow state.
+
+    Issued as a single Core UPDATE ... RETURNING; state ticks are frequent
+    during processing and don't need the ORM unit of work.
+    """
+    stmt = (
+        update(Workflow)
+        .where(Workflow.workflow_id == workflow_id)
+        .values(state=state, updated_at=datetime.utcnow())
+        .returning(*Workflow.__table__.c)
+    )
+    row = _core_execute(stmt).mappings().first()
+    if not row:
+        raise ValueError(f"Workflow {workflow_id} not found")
+    return _serialize_row(row)
 
 
 def update_workflow_analysis(workflow_id: str, rfp_analysis: dict):
@@ -345,9 +476,7 @@ def update_workflow_analysis(workflow_id: str, rfp_analysis: dict):
 
         workflow.rfp_analysis = rfp_analysis
         workflow.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
+        return _commit_and_serialize(session, workflow)
     except Exception as e:
         session.rollback()
         raise e
@@ -365,9 +494,7 @@ def update_workflow_responses(workflow_id: str, responses: list):
 
         workflow.generated_responses = responses
         workflow.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
+        return _commit_and_serialize(session, workflow)
     except Exception as e:
         session.rollback()
         raise e
@@ -375,6 +502,29 @@ def update_workflow_responses(workflow_id: str, responses: list):
         session.close()
 
 
+def append_workflow_responses(workflow_id: str, responses: list):
+    """Append generated responses to a workflow's stored list.
+
+    Uses SQLite's json_insert to append in place, so each progressive write
+    serializes only the new responses instead of the whole list.
+    """
+    if not responses:
+        return
+
+    appended = func.coalesce(Workflow.generated_responses, literal_column("'[]'"))
+    args = []
+    for response in responses:
+        args += ["$[#]", func.json(literal(_json_serializer(response)))]
+    stmt = (
+        update(Workflow)
+        .where(Workflow.workflow_id == workflow_id)
+        .values(generated_responses=func.json_insert(appended, *args), updated_at=datetime.utcnow())
+    )
+    with get_engine().begin() as conn:
+        if conn.execute(stmt).rowcount == 0:
+            raise ValueError(f"Workflow {workflow_id} not found")
+
+
 def update_workflow_review(workflow_id: str, review_result: dict):
     """Update workflow with review results."""
     session = get_session()
@@ -385,9 +535,7 @@ def update_workflow_review(workflow_id: str, review_result: dict):
 
         workflow.review_result = review_result
         workflow.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
+        return _commit_and_serialize(session, workflow)
     except Exception as e:
         session.rollback()
         raise e
@@ -411,9 +559,7 @@ def update_workflow_final(workflow_id: str, output_file_path: str = None,
             workflow.proposal_content = proposal_content
         workflow.completed_at = datetime.utcnow()
         workflow.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(workflow)
-        return workflow.to_dict()
+        return _commit_and_serialize(session, workflow)
     except Exception as e:
         session.rollback()
         raise e
@@ -422,12 +568,57 @@ def update_workflow_final(workflow_id: str, output_file_path: str = None,
 
 
 def get_all_workflows(limit: int = 50):
-    """Get all workflows, most recent first."""
+    """Get all workflows, most recent first (summary fields only).
+
+    Uses a Core SELECT returning plain row mappings so list views skip ORM
+    object hydration entirely.
+    """
     session = get_session()
     try:
-        workflows = session.query(Workflow).order_by(
+        stmt = select(*WORKFLOW_SUMMARY_COLUMNS).order_by(
             Workflow.created_at.desc()
-        ).limit(limit).all()
-        return [wf.to_dict() for wf in workflows]
+        ).limit(limit)
+        return [_serialize_row(row) for row in session.execute(stmt).mappings()]
     finally:
         session.close()
+
+
+# ==================== Async Wrappers ====================
+# SQLite allows a single writer at a time, so all async writes are serialized on
+# one dedicated thread while reads fan out over a small pool. This keeps blocking
+# SQLite calls off the FastAPI event loop without contending for the write lock.
+
+_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+_READ_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="db-reader")
+
+
+def _run_in_executor(executor: ThreadPoolExecutor, func):
+    """Wrap a synchronous database function as a coroutine running on executor."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    wrapper.__name__ = f"a{func.__name__}"
+    wrapper.__qualname__ = wrapper.__name__
+    return wrapper
+
+
+# Writes (serialized through the single writer thread)
+asave_document = _run_in_executor(_WRITE_EXECUTOR, save_document)
+acreate_workflow = _run_in_executor(_WRITE_EXECUTOR, create_workflow)
+aupdate_workflow_state = _run_in_executor(_WRITE_EXECUTOR, update_workflow_state)
+aupdate_workflow_analysis = _run_in_executor(_WRITE_EXECUTOR, update_workflow_analysis)
+aupdate_workflow_responses = _run_in_executor(_WRITE_EXECUTOR, update_workflow_responses)
+aappend_workflow_responses = _run_in_executor(_WRITE_EXECUTOR, append_workflow_responses)
+aupdate_workflow_review = _run_in_executor(_WRITE_EXECUTOR, update_workflow_review)
+aupdate_workflow_final = _run_in_executor(_WRITE_EXECUTOR, update_workflow_final)
+
+# Reads
+aget_document = _run_in_executor(_READ_EXECUTOR, get_document)
+aget_all_documents = _run_in_executor(_READ_EXECUTOR, get_all_documents)
+aget_default_user = _run_in_executor(_READ_EXECUTOR, get_default_user)
+aget_all_users = _run_in_executor(_READ_EXECUTOR, get_all_users)
+aget_workflow = _run_in_executor(_READ_EXECUTOR, get_workflow)
+aget_workflow_progress = _run_in_executor(_READ_EXECUTOR, get_workflow_progress)
+aget_all_workflows = _run_in_executor(_READ_EXECUTOR, get_all_workflows)
@@ -1,10 +1,15 @@
 """Pydantic schemas for data validation."""
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
 
 
+class BaseSchema(BaseModel):
+    """Base model with shared Pydantic v2 configuration."""
+    model_config = ConfigDict(protected_namespaces=())
+
+
 class QuestionCategory(str, Enum):
     """Question categories."""
     TECHNICAL = "technical"
@@ -35,8 +40,10 @@ class WorkflowState(str, Enum):
     CLOSED = "closed"
 
 
-class Question(BaseModel):
+class Question(BaseSchema):
     """Individual question from RFP."""
+    model_config = ConfigDict(frozen=True)
+
     q_id: str
     text: str
     category: QuestionCategory
@@ -46,7 +53,11 @@ class Question(BaseModel):
     similar_past_questions: List[str] = Field(default_factory=list)
 
 
-class RFPSection(BaseModel):
+# Compiled once at import; validates a whole list of questions in a single pass.
+QuestionListAdapter = TypeAdapter(List[Question])
+
+
+class RFPSection(BaseSchema):
     """Section of an RFP."""
     section_id: str
     title: str
@@ -54,7 +65,7 @@ class RFPSection(BaseModel):
     questions: List[Question] = Field(default_factory=list)
 
 
-class ClientContext(BaseModel):
+class ClientContext(BaseSchema):
     """Client context information."""
     company_name: str
     industry: Optional[str] = None
@@ -63,7 +74,7 @@ class ClientContext(BaseModel):
     additional_context: Dict[str, Any] = Field(default_factory=dict)
 
 
-class RFPAnalysis(BaseModel):
+class RFPAnalysis(BaseSchema):
     """Analysis result from Analyzer Agent."""
     rfp_id: str
     client: ClientContext
@@ -75,7 +86,7 @@ class RFPAnalysis(BaseModel):
     confidence: float = 0.0
 
 
-class RetrievedContent(BaseModel):
+class RetrievedContent(BaseSchema):
     """Content retrieved by Retriever Agent."""
     source: str
     section: str
@@ -86,14 +97,14 @@ class RetrievedContent(BaseModel):
     win_outcome: Optional[bool] = None
 
 
-class RetrievalResult(BaseModel):
+class RetrievalResult(BaseSchema):
     """Result from retrieval."""
     query: str
     client_context: ClientContext
     retrieved_content: List[RetrievedContent] = Field(default_factory=list)
 
 
-class GeneratedResponse(BaseModel):
+class GeneratedResponse(BaseSchema):
     """Generated response for a question."""
     question_id: str
     question_text: str
@@ -104,7 +115,7 @@ class GeneratedResponse(BaseModel):
     flags: List[str] = Field(default_factory=list)
 
 
-class ReviewIssue(BaseModel):
+class ReviewIssue(BaseSchema):
     """Issue found during review."""
     severity: str  # warning, error
     location: str
@@ -112,7 +123,7 @@ class ReviewIssue(BaseModel):
     suggestion: Optional[str] = None
 
 
-class ReviewResult(BaseModel):
+class ReviewResult(BaseSchema):
     """Result from Reviewer Agent."""
     compliance_status: str  # PASS, FAIL, WARNING
     checks_performed: Dict[str, bool] = Field(default_factory=dict)
@@ -121,7 +132,7 @@ class ReviewResult(BaseModel):
     overall_readiness: str
 
 
-class ProposalRequest(BaseModel):
+class ProposalRequest(BaseSchema):
     """Request to create a proposal."""
     client_name: str
     contact_title: Optional[str] = None
@@ -131,7 +142,12 @@ class ProposalRequest(BaseModel):
     tone: Optional[str] = "professional"  # professional, friendly, formal
 
 
-class RFPUploadRequest(BaseModel):
+class QuickProposalBatchRequest(BaseSchema):
+    """Request to create several quick proposals at once."""
+    proposals: List[ProposalRequest] = Field(max_length=20)
+
+
+class RFPUploadRequest(BaseSchema):
     """Request to upload and process RFP."""
     client_name: str
     deadline: Optional[datetime] = None
@@ -139,7 +155,7 @@ class RFPUploadRequest(BaseModel):
     company_size: Optional[str] = None
 
 
-class WorkflowStatus(BaseModel):
+class WorkflowStatus(BaseSchema):
     """Status of a workflow."""
     workflow_id: str
     state: WorkflowState
@@ -152,14 +168,41 @@ class WorkflowStatus(BaseModel):
     proposal_content: Optional[str] = None  # Raw proposal content for editing
 
 
-class QASource(BaseModel):
+class QuickProposalBatchError(BaseSchema):
+    """A batch proposal that failed, in place of its WorkflowStatus."""
+    workflow_id: str
+    state: str = "error"
+    error: str
+
+
+QuickProposalBatchResult = Union[WorkflowStatus, QuickProposalBatchError]
+
+
+class QASource(BaseSchema):
     """Source chunk used in Q&A response."""
     text: str
     score: float
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-class QARequest(BaseModel):
+class KnowledgeItem(BaseSchema):
+    """A piece of content to add to the knowledge base."""
+    text: str
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class KnowledgeAddBatchRequest(BaseSchema):
+    """Request to add several pieces of content to the knowledge base at once."""
+    items: List[KnowledgeItem] = Field(max_length=500)
+
+
+class KnowledgeSearchBatchRequest(BaseSchema):
+    """Request to search the knowledge base for several queries at once."""
+    queries: List[str] = Field(max_length=100)
+    top_k: int = 5
+
+
+class QARequest(BaseSchema):
     """Request for Q&A endpoint."""
     question: str
     top_k: int = 5
@@ -167,7 +210,7 @@ class QARequest(BaseModel):
     context: Optional[str] = None  # Optional additional context
 
 
-class QAResponse(BaseModel):
+class QAResponse(BaseSchema):
     """Response from Q&A endpoint."""
     question: str
     answer: str
@@ -13,265 +13,25 @@ Run this script with different scenarios to demo the system capabilities.
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import functools
+import io
+import sys
+import threading
 import time
 import os
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Iterable, Optional, Tuple
 from datetime import datetime
 
+import orjson
 
-class ProposalSystemDemo:
-    """Demo harness for the Automated Sales Proposal System."""
-
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.results = []
-
-    def print_banner(self, text: str, char: str = "="):
-        """Print a formatted banner."""
-        print("\n" + char * 100)
-        print(f"  {text}")
-        print(char * 100 + "\n")
-
-    def print_step(self, step: str):
-        """Print a step header."""
-        print(f"\n{'➤' * 3} {step}")
-        print("-" * 80)
-
-    def check_health(self) -> bool:
-        """Check if the system is healthy."""
-        try:
-            response = self.session.get(f"{self.base_url}/health")
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ System Status: {data['status'].upper()}")
-                print(f"   Timestamp: {data['timestamp']}")
-                print(f"   Services: LLM={data['services']['llm']}, "
-                      f"VectorStore={data['services']['vector_store']}, "
-                      f"Orchestrator={data['services']['orchestrator']}")
-                return True
-            else:
-                print(f"❌ Health check failed: {response.status_code}")
-                return False
-        except Exception as e:
-            print(f"❌ Cannot connect to system: {e}")
-            return False
-
-    def wait_for_workflow(self, workflow_id: str, timeout: int = 120) -> Dict[str, Any]:
-        """Poll workflow status until completion or timeout."""
-        start_time = time.time()
-        last_state = None
-
-        while time.time() - start_time < timeout:
-            response = self.session.get(f"{self.base_url}/api/v1/workflows/{workflow_id}")
-            if response.status_code == 200:
-                workflow = response.json()
-                current_state = workflow["state"]
-
-                if current_state != last_state:
-                    print(f"   State: {current_state.upper()}")
-                    last_state = current_state
-
-                if current_state in ["ready", "human_review", "closed"]:
-                    return workflow
-
-            time.sleep(2)
-
-        print(f"⚠️  Workflow timeout after {timeout}s")
-        return None
-
-    def download_proposal(self, workflow_id: str, output_dir: str = "./demo_outputs") -> str:
-        """Download generated proposal."""
-        try:
-            os.makedirs(output_dir, exist_ok=True)
-            response = self.session.get(f"{self.base_url}/api/v1/download/{workflow_id}")
-
-            if response.status_code == 200:
-                filename = f"{workflow_id}.docx"
-                filepath = os.path.join(output_dir, filename)
-
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-
-                print(f"✅ Proposal downloaded: {filepath}")
-                return filepath
-            else:
-                print(f"❌ Download failed: {response.status_code}")
-                return None
-        except Exception as e:
-            print(f"❌ Error downloading: {e}")
-            return None
-
-    # ==================================================================================
-    # SCENARIO 1: QUICK PROPOSAL - Technology Company (SaaS)
-    # ==================================================================================
-    def scenario_quick_proposal_saas(self):
-        """Scenario: Sales rep needs a quick proposal for a SaaS company."""
-        self.print_banner("SCENARIO 1: Quick Proposal - Technology/SaaS Company")
-
-        print("📋 Use Case:")
-        print("   A sales rep is meeting with a VP of Engineering at a fast-growing")
-        print("   SaaS company. They need a tailored pitch deck highlighting talent")
-        print("   intelligence solutions for scaling their engineering team.\n")
-
-        self.print_step("Step 1: Creating Quick Proposal Request")
-
-        request_data = {
-            "company_name": "TechScale Inc",
-            "contact_title": "VP of Engineering",
-            "industry": "Technology - SaaS",
-            "proposal_type": "pitch_deck",
-            "additional_context": "Fast-growing SaaS company scaling from 50 to 200 engineers. "
-                                  "Interested in talent intelligence and skills taxonomy for tech roles."
-        }
-
-        print(f"Request Data:\n{json.dumps(request_data, indent=2)}")
-
-        self.print_step("Step 2: Submitting to API")
-        response = self.session.post(f"{self.base_url}/api/v1/proposals/quick", json=request_data)
-
-        if response.status_code == 200:
-            workflow = response.json()
-            workflow_id = workflow["workflow_id"]
-            print(f"✅ Workflow Created: {workflow_id}")
-
-            self.print_step("Step 3: Monitoring Workflow Progress")
-            final_workflow = self.wait_for_workflow(workflow_id)
-
-            if final_workflow and final_workflow["state"] == "ready":
-                self.print_step("Step 4: Downloading Proposal")
-                filepath = self.download_proposal(workflow_id)
-
-                self.results.append({
-                    "scenario": "Quick Proposal - SaaS",
-                    "workflow_id": workflow_id,
-                    "status": "SUCCESS",
-                    "output": filepath
-                })
-
-                print("\n✅ Scenario 1 Complete!")
-                print(f"   Result: Sales rep has a customized pitch deck ready for the meeting")
-            else:
-                print("❌ Workflow did not complete successfully")
-        else:
-            print(f"❌ API Error: {response.status_code} - {response.text}")
-
-    # ==================================================================================
-    # SCENARIO 2: QUICK PROPOSAL - Healthcare Company (Compliance-Focused)
-    # ==================================================================================
-    def scenario_quick_proposal_healthcare(self):
-        """Scenario: Healthcare company requiring HIPAA-compliant solutions."""
-        self.print_banner("SCENARIO 2: Quick Proposal - Healthcare Company")
-
-        print("📋 Use Case:")
-        print("   A healthcare provider network needs workforce analytics for their")
-        print("   nursing and clinical staff. They require HIPAA compliance and")
-        print("   secure data handling.\n")
-
-        self.print_step("Step 1: Creating Proposal Request")
-
-        request_data = {
-            "company_name": "HealthFirst Medical Group",
-            "contact_title": "Chief Nursing Officer",
-            "industry": "Healthcare",
-            "proposal_type": "pitch_deck",
-            "additional_context": "Healthcare provider network with 500+ nurses and clinical staff. "
-                                  "Requires HIPAA-compliant workforce analytics, talent retention analysis, "
-                                  "and skills tracking for clinical certifications."
-        }
 
-        print(f"Request Data:\n{json.dumps(request_data, indent=2)}")
-
-        self.print_step("Step 2: Submitting to API")
-        response = self.session.post(f"{self.base_url}/api/v1/proposals/quick", json=request_data)
-
-        if response.status_code == 200:
-            workflow = response.json()
-            workflow_id = workflow["workflow_id"]
-            print(f"✅ Workflow Created: {workflow_id}")
-
-            self.print_step("Step 3: Monitoring Progress")
-            final_workflow = self.wait_for_workflow(workflow_id)
-
-            if final_workflow and final_workflow["state"] == "ready":
-                self.print_step("Step 4: Downloading Proposal")
-                filepath = self.download_proposal(workflow_id)
-
-                self.results.append({
-                    "scenario": "Quick Proposal - Healthcare",
-                    "workflow_id": workflow_id,
-                    "status": "SUCCESS",
-                    "output": filepath
-                })
-
-                print("\n✅ Scenario 2 Complete!")
-            else:
-                print("❌ Workflow did not complete")
-        else:
-            print(f"❌ API Error: {response.status_code}")
-
-    # ==================================================================================
-    # SCENARIO 3: QUICK PROPOSAL - Financial Services (Security-Focused)
-    # ==================================================================================
-    def scenario_quick_proposal_finance(self):
-        """Scenario: Financial services company with strong security requirements."""
-        self.print_banner("SCENARIO 3: Quick Proposal - Financial Services")
-
-        print("📋 Use Case:")
-        print("   A fintech company needs talent intelligence for their security and")
-        print("   compliance teams. Strong emphasis on data security, SOC2, and")
-        print("   regulatory compliance.\n")
-
-        request_data = {
-            "company_name": "SecureBank Fintech",
-            "contact_title": "Head of Security & Compliance",
-            "industry": "Financial Services",
-            "proposal_type": "pitch_deck",
-            "additional_context": "Fintech company hiring for cybersecurity, risk management, and "
-                                  "compliance roles. Requires SOC2 Type II compliance, data encryption, "
-                                  "and audit trails for all talent analytics."
-        }
-
-        print(f"Request Data:\n{json.dumps(request_data, indent=2)}")
-        response = self.session.post(f"{self.base_url}/api/v1/proposals/quick", json=request_data)
-
-        if response.status_code == 200:
-            workflow = response.json()
-            workflow_id = workflow["workflow_id"]
-            print(f"✅ Workflow Created: {workflow_id}")
-
-            final_workflow = self.wait_for_workflow(workflow_id)
-
-            if final_workflow and final_workflow["state"] == "ready":
-                filepath = self.download_proposal(workflow_id)
-
-                self.results.append({
-                    "scenario": "Quick Proposal - Finance",
-                    "workflow_id": workflow_id,
-                    "status": "SUCCESS",
-                    "output": filepath
-                })
-
-                print("\n✅ Scenario 3 Complete!")
-        else:
-            print(f"❌ API Error: {response.status_code}")
-
-    # ==================================================================================
-    # SCENARIO 4: RFP PROCESSING - Basic Technical RFP
-    # ==================================================================================
-    def scenario_rfp_processing_basic(self):
-        """Scenario: Processing a basic technical RFP."""
-        self.print_banner("SCENARIO 4: RFP Processing - Basic Technical RFP")
-
-        print("📋 Use Case:")
-        print("   A mid-size technology company has issued an RFP for talent analytics")
-        print("   platform. The RFP contains technical requirements, company info, and")
-        print("   pricing questions.\n")
-
-        self.print_step("Step 1: Creating Sample RFP Document")
-
-        rfp_content = """
+# Sample RFP documents uploaded by the RFP processing scenarios
+_RFP_TECHVENTURES = """
 REQUEST FOR PROPOSAL (RFP)
 Company: TechVentures Corp
 RFP ID: RFP-2024-TV-001
@@ -324,100 +84,7 @@ Q13. Provide detailed pricing for an organization with 1,000 employees, includin
 Q14. What is included in the base price, and what features require additional fees?
 """
 
-        # Create temp file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(rfp_content)
-            temp_file = f.name
-
-        print(f"✅ RFP document created ({len(rfp_content)} characters)")
-        print(f"   Questions: 14")
-        print(f"   Sections: 5 (Company Info, Technical, Functional, Implementation, Pricing)")
-
-        self.print_step("Step 2: Uploading RFP")
-
-        try:
-            with open(temp_file, 'rb') as f:
-                files = {'file': ('techventures_rfp.txt', f, 'text/plain')}
-                data = {'client_name': 'TechVentures Corp', 'industry': 'Technology'}
-
-                response = self.session.post(
-                    f"{self.base_url}/api/v1/rfp/upload",
-                    files=files,
-                    data=data
-                )
-
-            if response.status_code == 200:
-                result = response.json()
-                workflow_id = result["workflow_id"]
-                print(f"✅ RFP Uploaded: {workflow_id}")
-
-                self.print_step("Step 3: Processing RFP")
-                print("   This will:")
-                print("   • Analyze the RFP and extract questions")
-                print("   • Categorize questions by type")
-                print("   • Retrieve relevant content from knowledge base")
-                print("   • Generate responses for each question")
-                print("   • Review responses for completeness and compliance")
-                print("   • Format final proposal document")
-                print("\n   (This may take 60-120 seconds...)")
-
-                final_workflow = self.wait_for_workflow(workflow_id, timeout=180)
-
-                if final_workflow:
-                    self.print_step("Step 4: RFP Analysis Results")
-
-                    if final_workflow.get("rfp_analysis"):
-                        analysis = final_workflow["rfp_analysis"]
-                        print(f"   Total Questions: {analysis['total_questions']}")
-                        print(f"   Estimated Effort: {analysis['estimated_effort_hours']} hours")
-                        print(f"   Sections: {len(analysis['sections'])}")
-
-                        if analysis.get('sections'):
-                            print("\n   Question Breakdown:")
-                            for section in analysis['sections']:
-                                print(f"   • {section['title']}: {len(section['questions'])} questions")
-
-                    if final_workflow["state"] == "ready":
-                        self.print_step("Step 5: Downloading Response")
-                        filepath = self.download_proposal(workflow_id)
-
-                        self.results.append({
-                            "scenario": "RFP Processing - Basic",
-                            "workflow_id": workflow_id,
-                            "status": "SUCCESS",
-                            "output": filepath
-                        })
-
-                        print("\n✅ Scenario 4 Complete!")
-                        print("   Result: Complete RFP response document ready for review")
-                    elif final_workflow["state"] == "human_review":
-                        print("\n⚠️  Workflow requires human review")
-                        print("   Some responses may need manual verification")
-                    else:
-                        print(f"\n⚠️  Workflow ended in state: {final_workflow['state']}")
-                else:
-                    print("❌ Workflow did not complete")
-            else:
-                print(f"❌ Upload failed: {response.status_code} - {response.text}")
-
-        finally:
-            # Cleanup
-            os.unlink(temp_file)
-
-    # ==================================================================================
-    # SCENARIO 5: RFP PROCESSING - Complex Healthcare RFP
-    # ==================================================================================
-    def scenario_rfp_processing_healthcare(self):
-        """Scenario: Processing a complex healthcare RFP with compliance requirements."""
-        self.print_banner("SCENARIO 5: RFP Processing - Complex Healthcare RFP")
-
-        print("📋 Use Case:")
-        print("   A large healthcare system has issued an RFP for clinical workforce")
-        print("   management. Requires HIPAA compliance, clinical certifications tracking,")
-        print("   and integration with existing healthcare IT systems.\n")
-
-        rfp_content = """
+_RFP_HEALTHCARE = """
 REQUEST FOR PROPOSAL (RFP)
 Company: Metropolitan Healthcare System
 RFP ID: RFP-2024-MHS-CLINICAL
@@ -482,56 +149,629 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
      integrations?
 """
 
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(rfp_content)
-            temp_file = f.name
+_RFP_TECHVENTURES_BYTES = _RFP_TECHVENTURES.encode("utf-8")
+_RFP_HEALTHCARE_BYTES = _RFP_HEALTHCARE.encode("utf-8")
+
+
+# Quick-proposal request payloads, shared by the single and batch scenarios
+_QUICK_SAAS_REQUEST = {
+    "client_name": "TechScale Inc",
+    "contact_title": "VP of Engineering",
+    "industry": "Technology - SaaS",
+    "proposal_type": "pitch_deck",
+    "requirements": "Fast-growing SaaS company scaling from 50 to 200 engineers. "
+                    "Interested in talent intelligence and skills taxonomy for tech roles."
+}
+
+_QUICK_HEALTHCARE_REQUEST = {
+    "client_name": "HealthFirst Medical Group",
+    "contact_title": "Chief Nursing Officer",
+    "industry": "Healthcare",
+    "proposal_type": "pitch_deck",
+    "requirements": "Healthcare provider network with 500+ nurses and clinical staff. "
+                    "Requires HIPAA-compliant workforce analytics, talent retention analysis, "
+                    "and skills tracking for clinical certifications."
+}
+
+_QUICK_FINANCE_REQUEST = {
+    "client_name": "SecureBank Fintech",
+    "contact_title": "Head of Security & Compliance",
+    "industry": "Financial Services",
+    "proposal_type": "pitch_deck",
+    "requirements": "Fintech company hiring for cybersecurity, risk management, and "
+                    "compliance roles. Requires SOC2 Type II compliance, data encryption, "
+                    "and audit trails for all talent analytics."
+}
+
+# Workflow states after which waiting stops
+_TERMINAL_STATES = frozenset({"ready", "human_review", "closed", "error"})
+
+
+def _dumps(obj: Any) -> str:
+    """Pretty-print JSON for console output."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def _loads(data) -> Any:
+    """Parse a JSON response body or string."""
+    return orjson.loads(data)
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    """Receives the workflow completion POST sent to a callback_url."""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.payload = _loads(self.rfile.read(length))
+        self.send_response(204)
+        self.end_headers()
+        self.server.done.set()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _CallbackReceiver:
+    """Local HTTP server on a free port that waits for one workflow callback."""
+
+    def __init__(self):
+        self.server = HTTPServer(("127.0.0.1", 0), _CallbackHandler)
+        self.server.payload = None
+        self.server.done = threading.Event()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/done"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def wait(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until the callback arrives, returning its workflow payload."""
+        if self.server.done.wait(timeout):
+            return self.server.payload
+        return None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ProposalSystemDemo:
+    """Demo harness for the Automated Sales Proposal System."""
+
+    _STEP_ARROW = "➤➤➤ "
+    _STEP_UNDERLINE = "-" * 80
+
+    def __init__(self, base_url: str = "http://localhost:8000", quiet: bool = False, unattended: bool = False,
+                 output_dir: str = "./demo_outputs"):
+        self.base_url = base_url
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.quiet = quiet
+        self.unattended = unattended
+        self._local = threading.local()
+        self._stdout_lock = threading.Lock()
+        self.session = requests.Session()
+        # Reuse keep-alive connections to the API across all scenarios
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.results = []
+        self._success_count = 0
+        self._results_lock = threading.Lock()
+
+    def _print(self, *args, sep: str = " ", end: str = "\n"):
+        """Write output to the current scenario buffer, or stdout when unbuffered."""
+        buffer = getattr(self._local, "buffer", None)
+        (buffer or sys.stdout).write(sep.join(map(str, args)) + end)
+
+    def _run_buffered(self, scenario):
+        """Run a scenario and emit its output in a single write when it finishes.
+
+        Keeps concurrently running scenarios from interleaving their output.
+        In quiet mode the output is discarded.
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            scenario()
+        finally:
+            output = self._local.buffer.getvalue()
+            self._local.buffer = None
+            if self.quiet:
+                return
+            with self._stdout_lock:
+                sys.stdout.write(output)
+                sys.stdout.flush()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _line(char: str) -> str:
+        """Build a banner line once per distinct character."""
+        return char * 100
+
+    def print_banner(self, text: str, char: str = "="):
+        """Print a formatted banner."""
+        line = self._line(char)
+        self._print(f"\n{line}\n  {text}\n{line}\n")
+
+    def _record_result(self, scenario: str, workflow_id: str, status: str, output: Optional[str] = None):
+        """Record a scenario result; scenarios may run concurrently."""
+        with self._results_lock:
+            self.results.append({
+                "scenario": scenario,
+                "workflow_id": workflow_id,
+                "status": status,
+                "output": output
+            })
+            if status == "SUCCESS":
+                self._success_count += 1
+
+    def print_step(self, step: str):
+        """Print a step header."""
+        self._print(f"\n{self._STEP_ARROW}{step}\n{self._STEP_UNDERLINE}")
+
+    def check_health(self) -> bool:
+        """Check if the system is healthy."""
+        try:
+            response = self.session.get(f"{self.base_url}/health")
+            if response.status_code == 200:
+                data = _loads(response.content)
+                self._print(f"✅ System Status: {data['status'].upper()}")
+                self._print(f"   Timestamp: {data['timestamp']}")
+                self._print(f"   Services: LLM={data['services']['llm']}, "
+                      f"VectorStore={data['services']['vector_store']}, "
+                      f"Orchestrator={data['services']['orchestrator']}")
+                return True
+            else:
+                self._print(f"❌ Health check failed: {response.status_code}")
+                return False
+        except Exception as e:
+            self._print(f"❌ Cannot connect to system: {e}")
+            return False
+
+    def wait_for_workflow(self, workflow_id: str, timeout: int = 120,
+                          states: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Wait for workflow completion, streaming state changes when available.
+
+        Subscribes to the server-sent events endpoint and falls back to polling
+        when the server does not expose it.
+
+        Args:
+            workflow_id: Workflow to wait on
+            timeout: Overall timeout in seconds
+            states: Optional state transitions to subscribe to (terminal
+                states are always delivered)
+        """
+        deadline = time.monotonic() + timeout
+        params = {"states": ",".join(states)} if states else None
+
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/workflows/{workflow_id}/events",
+                params=params,
+                headers={"Accept": "text/event-stream"},
+                stream=True,
+                timeout=(5, timeout),
+            )
+        except requests.exceptions.RequestException as e:
+            self._print(f"   Event stream unavailable ({e}), polling instead")
+            return self._poll_workflow(workflow_id, timeout, deadline)
+
+        if response.status_code == 404:
+            response.close()
+            return self._poll_workflow(workflow_id, timeout, deadline)
+
+        with response:
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if time.monotonic() >= deadline:
+                        break
+                    if not line or not line.startswith("data:"):
+                        continue
+
+                    workflow = _loads(line[5:])
+                    current_state = workflow["state"]
+                    self._print(f"   State: {current_state.upper()}")
+
+                    if current_state in _TERMINAL_STATES:
+                        return workflow
+            except requests.exceptions.RequestException as e:
+                self._print(f"   Event stream interrupted ({e}), polling instead")
+                return self._poll_workflow(workflow_id, timeout, deadline)
+
+        self._print(f"⚠️  Workflow timeout after {timeout}s")
+        return None
 
-        print(f"✅ Complex RFP created")
-        print(f"   Questions: 19")
-        print(f"   Focus: Healthcare compliance, clinical workforce, integrations")
+    def _wait_for_callback(self, receiver: _CallbackReceiver, upload_result: Dict[str, Any],
+                           timeout: int) -> Dict[str, Any]:
+        """Wait for the server to POST workflow completion to our callback URL.
 
+        Falls back to wait_for_workflow when the server did not accept the
+        callback_url.
+        """
         try:
-            with open(temp_file, 'rb') as f:
-                files = {'file': ('metropolitan_healthcare_rfp.txt', f, 'text/plain')}
-                data = {
-                    'client_name': 'Metropolitan Healthcare System',
-                    'industry': 'Healthcare'
-                }
-
-                response = self.session.post(
-                    f"{self.base_url}/api/v1/rfp/upload",
-                    files=files,
-                    data=data
-                )
+            if not upload_result.get("callback_registered"):
+                return self.wait_for_workflow(upload_result["workflow_id"], timeout=timeout)
+
+            workflow = receiver.wait(timeout)
+            if workflow is None:
+                self._print(f"⚠️  Workflow timeout after {timeout}s")
+            else:
+                self._print(f"   State: {workflow['state'].upper()}")
+            return workflow
+        finally:
+            receiver.close()
+
+    def _poll_workflow(self, workflow_id: str, timeout: int, deadline: float) -> Dict[str, Any]:
+        """Poll workflow status with exponential backoff until completion or timeout.
 
+        Starts at 200ms and backs off by 1.5x up to 3s. A ``Retry-After``
+        header or ``status_check_interval_hint_seconds`` field from the server
+        overrides the computed interval.
+        """
+        url = f"{self.base_url}/api/v1/workflows/{workflow_id}"
+        last_state = None
+        interval = 0.2
+        max_interval = 3.0
+
+        while time.monotonic() < deadline:
+            response = self.session.get(url)
+            hint = response.headers.get("Retry-After")
             if response.status_code == 200:
-                result = response.json()
-                workflow_id = result["workflow_id"]
-                print(f"✅ RFP Uploaded: {workflow_id}")
+                workflow = _loads(response.content)
+                current_state = workflow["state"]
 
-                print("\n⏳ Processing complex healthcare RFP (may take 2-3 minutes)...")
-                final_workflow = self.wait_for_workflow(workflow_id, timeout=240)
+                if current_state != last_state:
+                    self._print(f"   State: {current_state.upper()}")
+                    last_state = current_state
 
-                if final_workflow and final_workflow["state"] in ["ready", "human_review"]:
-                    if final_workflow.get("output_file_path"):
-                        filepath = self.download_proposal(workflow_id)
+                if current_state in _TERMINAL_STATES:
+                    return workflow
+
+                hint = hint or workflow.get("status_check_interval_hint_seconds")
+
+            interval = min(interval * 1.5, max_interval)
+            try:
+                delay = float(hint) if hint is not None else interval
+            except ValueError:
+                delay = interval
+            time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+        self._print(f"⚠️  Workflow timeout after {timeout}s")
+        return None
 
-                        self.results.append({
-                            "scenario": "RFP Processing - Healthcare",
-                            "workflow_id": workflow_id,
-                            "status": "SUCCESS",
-                            "output": filepath
-                        })
+    def _post_json(self, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST a JSON body serialized with orjson."""
+        return self.session.post(url, data=orjson.dumps(payload), headers={"Content-Type": "application/json"})
+
+    def submit_quick_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several quick proposals with one request, returning their workflows."""
+        response = self._post_json(f"{self.base_url}/api/v1/proposals/quick/batch", {"proposals": payloads})
+        response.raise_for_status()
+        return _loads(response.content)
+
+    @functools.lru_cache(maxsize=128)
+    def _search_cached(self, query: str, top_k: int) -> str:
+        """Run a knowledge search and return the raw JSON text.
+
+        Memoized per demo instance so repeated queries skip the HTTP round
+        trip. Failed searches raise and are therefore not cached.
+        """
+        response = self.session.get(
+            f"{self.base_url}/api/v1/knowledge/search",
+            params={"query": query, "top_k": top_k}
+        )
+        response.raise_for_status()
+        return response.text
+
+    def _search_knowledge(self, query: str, top_k: int) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Search the knowledge base, returning (status_code, results or None)."""
+        try:
+            return 200, _loads(self._search_cached(query, top_k))
+        except requests.exceptions.HTTPError as e:
+            return e.response.status_code, None
+
+    def _search_knowledge_many(self, queries: List[str], top_k: int) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Run several knowledge searches, returning (status_code, results or None) per query.
+
+        Uses the batch endpoint so the server embeds all queries in one pass;
+        falls back to concurrent single searches when it is unavailable.
+        """
+        response = self._post_json(
+            f"{self.base_url}/api/v1/knowledge/search/batch",
+            {"queries": queries, "top_k": top_k}
+        )
+        if response.status_code == 200:
+            return [(200, results) for results in _loads(response.content)["results"]]
+        if response.status_code != 404:
+            return [(response.status_code, None)] * len(queries)
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            return list(executor.map(lambda query: self._search_knowledge(query, top_k), queries))
+
+    def _run_quick_proposal(self, scenario_name: str, scenario_number: int, request_data: Dict[str, Any],
+                            result_message: Optional[str] = None):
+        """Submit a quick proposal, wait for it, download it and record the result."""
+        self.print_step("Step 1: Creating Quick Proposal Request")
+        self._print(f"Request Data:\n{_dumps(request_data)}")
 
-                    print("\n✅ Scenario 5 Complete!")
+        self.print_step("Step 2: Submitting to API")
+        response = self._post_json(f"{self.base_url}/api/v1/proposals/quick", request_data)
+
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            self._print(f"❌ API Error: {response.status_code} - {response.text}")
+            return
+
+        workflow = _loads(response.content)
+        workflow_id = workflow["workflow_id"]
+        self._print(f"✅ Workflow Created: {workflow_id}")
+
+        self.print_step("Step 3: Monitoring Workflow Progress")
+        final_workflow = self.wait_for_workflow(workflow_id)
+
+        if final_workflow and final_workflow["state"] == "ready":
+            self.print_step("Step 4: Downloading Proposal")
+            filepath = self.download_proposal(workflow_id)
+
+            self._record_result(scenario_name, workflow_id, "SUCCESS", filepath)
+
+            self._print(f"\n✅ Scenario {scenario_number} Complete!")
+            if result_message:
+                self._print(f"   Result: {result_message}")
+        else:
+            self._print("❌ Workflow did not complete successfully")
+
+    def _upload_rfp(self, filename: str, content: bytes, client_name: str,
+                    industry: str) -> Optional[Tuple[_CallbackReceiver, Dict[str, Any]]]:
+        """Upload an RFP with a completion callback.
+
+        If the server rejects the callback (callbacks are opt-in), the upload
+        is retried without one and _wait_for_callback falls back to polling.
+
+        Returns the callback receiver and upload response, or None if the
+        upload failed.
+        """
+        data = {'client_name': client_name, 'industry': industry}
+
+        receiver = _CallbackReceiver()
+        for params in ({"callback_url": receiver.url}, None):
+            files = {'file': (filename, io.BytesIO(content), 'text/plain')}
+            response = self.session.post(
+                f"{self.base_url}/api/v1/rfp/upload",
+                files=files,
+                data=data,
+                params=params
+            )
+            if response.status_code != 400 or params is None:
+                break
+
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            receiver.close()
+            self._print(f"❌ Upload failed: {response.status_code} - {response.text}")
+            return None
+
+        result = _loads(response.content)
+        self._print(f"✅ RFP Uploaded: {result['workflow_id']}")
+        return receiver, result
+
+    def download_proposal(self, workflow_id: str, output_dir: Optional[str] = None) -> str:
+        """Download generated proposal."""
+        try:
+            if output_dir is None:
+                output_dir = self.output_dir
+            else:
+                os.makedirs(output_dir, exist_ok=True)
+            with self.session.get(f"{self.base_url}/api/v1/download/{workflow_id}", stream=True) as response:
+                if response.status_code == 200:
+                    filename = f"{workflow_id}.docx"
+                    filepath = os.path.join(output_dir, filename)
+
+                    with open(filepath, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=65536):
+                            f.write(chunk)
+
+                    self._print(f"✅ Proposal downloaded: {filepath}")
+                    return filepath
                 else:
-                    print("❌ Workflow did not complete")
+                    self._print(f"❌ Download failed: {response.status_code}")
+                    return None
+        except Exception as e:
+            self._print(f"❌ Error downloading: {e}")
+            return None
+
+    # ==================================================================================
+    # SCENARIO 1: QUICK PROPOSAL - Technology Company (SaaS)
+    # ==================================================================================
+    def scenario_quick_proposal_saas(self):
+        """Scenario: Sales rep needs a quick proposal for a SaaS company."""
+        self.print_banner("SCENARIO 1: Quick Proposal - Technology/SaaS Company")
+
+        self._print("📋 Use Case:")
+        self._print("   A sales rep is meeting with a VP of Engineering at a fast-growing")
+        self._print("   SaaS company. They need a tailored pitch deck highlighting talent")
+        self._print("   intelligence solutions for scaling their engineering team.\n")
+
+        self._run_quick_proposal(
+            "Quick Proposal - SaaS", 1, _QUICK_SAAS_REQUEST,
+            result_message="Sales rep has a customized pitch deck ready for the meeting"
+        )
+
+    # ==================================================================================
+    # SCENARIO 2: QUICK PROPOSAL - Healthcare Company (Compliance-Focused)
+    # ==================================================================================
+    def scenario_quick_proposal_healthcare(self):
+        """Scenario: Healthcare company requiring HIPAA-compliant solutions."""
+        self.print_banner("SCENARIO 2: Quick Proposal - Healthcare Company")
+
+        self._print("📋 Use Case:")
+        self._print("   A healthcare provider network needs workforce analytics for their")
+        self._print("   nursing and clinical staff. They require HIPAA compliance and")
+        self._print("   secure data handling.\n")
+
+        self._run_quick_proposal("Quick Proposal - Healthcare", 2, _QUICK_HEALTHCARE_REQUEST)
+
+    # ==================================================================================
+    # SCENARIO 3: QUICK PROPOSAL - Financial Services (Security-Focused)
+    # ==================================================================================
+    def scenario_quick_proposal_finance(self):
+        """Scenario: Financial services company with strong security requirements."""
+        self.print_banner("SCENARIO 3: Quick Proposal - Financial Services")
+
+        self._print("📋 Use Case:")
+        self._print("   A fintech company needs talent intelligence for their security and")
+        self._print("   compliance teams. Strong emphasis on data security, SOC2, and")
+        self._print("   regulatory compliance.\n")
+
+        self._run_quick_proposal("Quick Proposal - Finance", 3, _QUICK_FINANCE_REQUEST)
+
+    # ==================================================================================
+    # SCENARIO 1-3 BATCHED: ALL QUICK PROPOSALS IN ONE REQUEST
+    # ==================================================================================
+    def scenario_quick_proposal_batch(self):
+        """Scenario: Submit the three quick proposals as a single batch."""
+        self.print_banner("SCENARIO 1-3: Quick Proposals - Batched")
+
+        self._print("📋 Use Case:")
+        self._print("   A sales team preparing for several meetings generates all of their")
+        self._print("   pitch decks at once.\n")
+
+        scenarios = [
+            ("Quick Proposal - SaaS", _QUICK_SAAS_REQUEST),
+            ("Quick Proposal - Healthcare", _QUICK_HEALTHCARE_REQUEST),
+            ("Quick Proposal - Finance", _QUICK_FINANCE_REQUEST),
+        ]
+
+        self.print_step("Step 1: Submitting Batch to API")
+        try:
+            workflows = self.submit_quick_batch([payload for _, payload in scenarios])
+        except requests.exceptions.HTTPError as e:
+            self._print(f"❌ API Error: {e.response.status_code} - {e.response.text}")
+            return
+
+        self.print_step("Step 2: Downloading Proposals")
+        for (scenario, _), workflow in zip(scenarios, workflows):
+            workflow_id = workflow["workflow_id"]
+            self._print(f"   {scenario}: {workflow_id} ({workflow['state'].upper()})")
+            if "error" in workflow:
+                self._print(f"      ❌ {workflow['error']}")
+
+            if workflow["state"] == "ready":
+                filepath = self.download_proposal(workflow_id)
+                self._record_result(scenario, workflow_id, "SUCCESS", filepath)
+
+        self._print("\n✅ Batched Quick Proposals Complete!")
+
+    # ==================================================================================
+    # SCENARIO 4: RFP PROCESSING - Basic Technical RFP
+    # ==================================================================================
+    def scenario_rfp_processing_basic(self):
+        """Scenario: Processing a basic technical RFP."""
+        self.print_banner("SCENARIO 4: RFP Processing - Basic Technical RFP")
+
+        self._print("📋 Use Case:")
+        self._print("   A mid-size technology company has issued an RFP for talent analytics")
+        self._print("   platform. The RFP contains technical requirements, company info, and")
+        self._print("   pricing questions.\n")
+
+        self.print_step("Step 1: Creating Sample RFP Document")
+
+        self._print(f"✅ RFP document created ({len(_RFP_TECHVENTURES)} characters)")
+        self._print(f"   Questions: 14")
+        self._print(f"   Sections: 5 (Company Info, Technical, Functional, Implementation, Pricing)")
+
+        self.print_step("Step 2: Uploading RFP")
+
+        upload = self._upload_rfp(
+            "techventures_rfp.txt", _RFP_TECHVENTURES_BYTES, "TechVentures Corp", "Technology"
+        )
+        if upload is None:
+            return
+        receiver, result = upload
+        workflow_id = result["workflow_id"]
+
+        self.print_step("Step 3: Processing RFP")
+        self._print("   This will:")
+        self._print("   • Analyze the RFP and extract questions")
+        self._print("   • Categorize questions by type")
+        self._print("   • Retrieve relevant content from knowledge base")
+        self._print("   • Generate responses for each question")
+        self._print("   • Review responses for completeness and compliance")
+        self._print("   • Format final proposal document")
+        self._print("\n   (This may take 60-120 seconds...)")
+
+        final_workflow = self._wait_for_callback(receiver, result, timeout=180)
+
+        if final_workflow:
+            self.print_step("Step 4: RFP Analysis Results")
+
+            if final_workflow.get("rfp_analysis"):
+                analysis = final_workflow["rfp_analysis"]
+                self._print(f"   Total Questions: {analysis['total_questions']}")
+                self._print(f"   Estimated Effort: {analysis['estimated_effort_hours']} hours")
+                self._print(f"   Sections: {len(analysis['sections'])}")
+
+                if analysis.get('sections'):
+                    self._print("\n   Question Breakdown:")
+                    for section in analysis['sections']:
+                        self._print(f"   • {section['title']}: {len(section['questions'])} questions")
+
+            if final_workflow["state"] == "ready":
+                self.print_step("Step 5: Downloading Response")
+                filepath = self.download_proposal(workflow_id)
+
+                self._record_result("RFP Processing - Basic", workflow_id, "SUCCESS", filepath)
+
+                self._print("\n✅ Scenario 4 Complete!")
+                self._print("   Result: Complete RFP response document ready for review")
+            elif final_workflow["state"] == "human_review":
+                self._print("\n⚠️  Workflow requires human review")
+                self._print("   Some responses may need manual verification")
             else:
-                print(f"❌ Upload failed: {response.status_code}")
+                self._print(f"\n⚠️  Workflow ended in state: {final_workflow['state']}")
+        else:
+            self._print("❌ Workflow did not complete")
 
-        finally:
-            os.unlink(temp_file)
+    # ==================================================================================
+    # SCENARIO 5: RFP PROCESSING - Complex Healthcare RFP
+    # ==================================================================================
+    def scenario_rfp_processing_healthcare(self):
+        """Scenario: Processing a complex healthcare RFP with compliance requirements."""
+        self.print_banner("SCENARIO 5: RFP Processing - Complex Healthcare RFP")
+
+        self._print("📋 Use Case:")
+        self._print("   A large healthcare system has issued an RFP for clinical workforce")
+        self._print("   management. Requires HIPAA compliance, clinical certifications tracking,")
+        self._print("   and integration with existing healthcare IT systems.\n")
+
+        self._print(f"✅ Complex RFP created")
+        self._print(f"   Questions: 19")
+        self._print(f"   Focus: Healthcare compliance, clinical workforce, integrations")
+
+        upload = self._upload_rfp(
+            "metropolitan_healthcare_rfp.txt", _RFP_HEALTHCARE_BYTES, "Metropolitan Healthcare System", "Healthcare"
+        )
+        if upload is None:
+            return
+        receiver, result = upload
+        workflow_id = result["workflow_id"]
+
+        self._print("\n⏳ Processing complex healthcare RFP (may take 2-3 minutes)...")
+        final_workflow = self._wait_for_callback(receiver, result, timeout=240)
+
+        if final_workflow and final_workflow["state"] in ["ready", "human_review"]:
+            if final_workflow.get("output_file_path"):
+                filepath = self.download_proposal(workflow_id)
+
+                self._record_result("RFP Processing - Healthcare", workflow_id, "SUCCESS", filepath)
+
+            self._print("\n✅ Scenario 5 Complete!")
+        else:
+            self._print("❌ Workflow did not complete")
 
     # ==================================================================================
     # SCENARIO 6: KNOWLEDGE BASE SEARCH
@@ -540,9 +780,9 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
         """Scenario: Searching knowledge base for relevant content."""
         self.print_banner("SCENARIO 6: Knowledge Base Search")
 
-        print("📋 Use Case:")
-        print("   Sales rep wants to find relevant past proposals and case studies")
-        print("   for different topics and industries.\n")
+        self._print("📋 Use Case:")
+        self._print("   Sales rep wants to find relevant past proposals and case studies")
+        self._print("   for different topics and industries.\n")
 
         search_queries = [
             {
@@ -567,43 +807,37 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
             }
         ]
 
-        for i, search in enumerate(search_queries, 1):
-            self.print_step(f"Search {i}: {search['context']}")
-            print(f"Query: \"{search['query']}\"")
+        responses = self._search_knowledge_many([search["query"] for search in search_queries], top_k=3)
 
-            response = self.session.get(
-                f"{self.base_url}/api/v1/knowledge/search",
-                params={"query": search["query"], "top_k": 3}
-            )
+        for i, (search, (status_code, results)) in enumerate(zip(search_queries, responses), 1):
+            self.print_step(f"Search {i}: {search['context']}")
+            self._print(f"Query: \"{search['query']}\"")
 
-            if response.status_code == 200:
-                results = response.json()
-                print(f"✅ Found {len(results['results'])} relevant documents")
+            if results is not None:
+                self._print(f"✅ Found {len(results['results'])} relevant documents")
 
                 for j, result in enumerate(results['results'][:3], 1):
-                    print(f"\n   Result {j}:")
-                    print(f"   • Relevance Score: {result['score']:.3f}")
+                    self._print(f"\n   Result {j}:")
+                    self._print(f"   • Relevance Score: {result['score']:.3f}")
                     text_preview = result['text'][:150].replace('\n', ' ')
-                    print(f"   • Preview: {text_preview}...")
+                    self._print(f"   • Preview: {text_preview}...")
 
                     if result.get('metadata'):
                         metadata = result['metadata']
                         if isinstance(metadata, str):
                             try:
-                                metadata = json.loads(metadata)
+                                metadata = _loads(metadata)
                             except:
                                 pass
                         if isinstance(metadata, dict):
                             if metadata.get('client'):
-                                print(f"   • Client: {metadata['client']}")
+                                self._print(f"   • Client: {metadata['client']}")
                             if metadata.get('category'):
-                                print(f"   • Category: {metadata['category']}")
+                                self._print(f"   • Category: {metadata['category']}")
             else:
-                print(f"❌ Search failed: {response.status_code}")
-
-            time.sleep(1)  # Brief pause between searches
+                self._print(f"❌ Search failed: {status_code}")
 
-        print("\n✅ Scenario 6 Complete!")
+        self._print("\n✅ Scenario 6 Complete!")
 
     # ==================================================================================
     # SCENARIO 7: CLIENT-SPECIFIC SEARCH
@@ -612,9 +846,9 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
         """Scenario: Find all content related to specific clients."""
         self.print_banner("SCENARIO 7: Client-Specific Content Search")
 
-        print("📋 Use Case:")
-        print("   Sales rep wants to review all past work and proposals for")
-        print("   specific clients before a meeting.\n")
+        self._print("📋 Use Case:")
+        self._print("   Sales rep wants to review all past work and proposals for")
+        self._print("   specific clients before a meeting.\n")
 
         clients = [
             "ASM",
@@ -624,82 +858,108 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
             "ARM"
         ]
 
-        for client in clients:
-            self.print_step(f"Searching content for: {client}")
+        responses = self._search_knowledge_many([f"{client} proposal case study" for client in clients], top_k=5)
 
-            response = self.session.get(
-                f"{self.base_url}/api/v1/knowledge/search",
-                params={"query": f"{client} proposal case study", "top_k": 5}
-            )
+        for client, (status_code, results) in zip(clients, responses):
+            self.print_step(f"Searching content for: {client}")
 
-            if response.status_code == 200:
-                results = response.json()
-                print(f"✅ Found {len(results['results'])} documents related to {client}")
+            if results is not None:
+                self._print(f"✅ Found {len(results['results'])} documents related to {client}")
 
                 for result in results['results'][:2]:
-                    print(f"   • Score: {result['score']:.3f}")
+                    self._print(f"   • Score: {result['score']:.3f}")
                     text_preview = result['text'][:100].replace('\n', ' ')
-                    print(f"     Preview: {text_preview}...")
+                    self._print(f"     Preview: {text_preview}...")
             else:
-                print(f"❌ Search failed for {client}")
+                self._print(f"❌ Search failed for {client}")
 
-            time.sleep(0.5)
-
-        print("\n✅ Scenario 7 Complete!")
+        self._print("\n✅ Scenario 7 Complete!")
 
     # ==================================================================================
     # RUN ALL SCENARIOS
     # ==================================================================================
-    def run_all_scenarios(self):
-        """Run all demo scenarios."""
+    def _pause(self):
+        """Give the presenter a moment between scenarios (skipped when unattended)."""
+        if not self.unattended:
+            time.sleep(2)
+
+    async def _run_scenarios_concurrently(self):
+        """Run independent scenarios side by side.
+
+        Each scenario is blocking, so it runs in a worker thread; the pooled
+        session lets their workflow waits overlap instead of adding up. Output
+        is buffered per scenario and written once it completes.
+        """
+        await asyncio.gather(
+            asyncio.to_thread(self._run_buffered, self.scenario_quick_proposal_saas),
+            asyncio.to_thread(self._run_buffered, self.scenario_quick_proposal_healthcare),
+            asyncio.to_thread(self._run_buffered, self.scenario_quick_proposal_finance),
+            asyncio.to_thread(self._run_buffered, self.scenario_rfp_processing_basic),
+            # asyncio.to_thread(self._run_buffered, self.scenario_rfp_processing_healthcare),
+            asyncio.to_thread(self._run_buffered, self.scenario_knowledge_search),
+            asyncio.to_thread(self._run_buffered, self.scenario_client_specific_search),
+        )
+
+    def run_all_scenarios(self, concurrent: bool = True):
+        """Run all demo scenarios.
+
+        Args:
+            concurrent: Run scenarios concurrently, printing each scenario's
+                output as a block once it finishes (in completion order);
+                set False for the step-by-step walkthrough.
+        """
         self.print_banner("AUTOMATED SALES PROPOSAL SYSTEM - COMPREHENSIVE DEMO", "🚀")
 
-        print("This demo will showcase the following scenarios:\n")
-        print("1. Quick Proposal - Technology/SaaS Company")
-        print("2. Quick Proposal - Healthcare Company (Compliance-Focused)")
-        print("3. Quick Proposal - Financial Services (Security-Focused)")
-        print("4. RFP Processing - Basic Technical RFP")
-        print("5. RFP Processing - Complex Healthcare RFP")
-        print("6. Knowledge Base Search")
-        print("7. Client-Specific Content Search")
-        print("\nTotal estimated time: 5-10 minutes")
+        self._print("This demo will showcase the following scenarios:\n")
+        self._print("1. Quick Proposal - Technology/SaaS Company")
+        self._print("2. Quick Proposal - Healthcare Company (Compliance-Focused)")
+        self._print("3. Quick Proposal - Financial Services (Security-Focused)")
+        self._print("4. RFP Processing - Basic Technical RFP")
+        self._print("5. RFP Processing - Complex Healthcare RFP")
+        self._print("6. Knowledge Base Search")
+        self._print("7. Client-Specific Content Search")
+        self._print("\nTotal estimated time: 5-10 minutes")
 
-        input("\nPress Enter to start the demo...")
+        if not self.unattended:
+            input("\nPress Enter to start the demo...")
 
         # Check health
         if not self.check_health():
-            print("\n❌ System is not healthy. Please start the server first:")
-            print("   python main.py")
+            self._print("\n❌ System is not healthy. Please start the server first:")
+            self._print("   python main.py")
             return
 
         # Run scenarios
         try:
-            self.scenario_quick_proposal_saas()
-            time.sleep(2)
+            if concurrent:
+                asyncio.run(self._run_scenarios_concurrently())
+            else:
+                self._run_buffered(self.scenario_quick_proposal_saas)
+                self._pause()
 
-            self.scenario_quick_proposal_healthcare()
-            time.sleep(2)
+                self._run_buffered(self.scenario_quick_proposal_healthcare)
+                self._pause()
 
-            self.scenario_quick_proposal_finance()
-            time.sleep(2)
+                self._run_buffered(self.scenario_quick_proposal_finance)
+                self._pause()
 
-            self.scenario_rfp_processing_basic()
-            time.sleep(2)
+                self._run_buffered(self.scenario_rfp_processing_basic)
+                self._pause()
 
-            # Uncomment if you want to run the complex healthcare scenario
-            # (it takes longer)
-            # self.scenario_rfp_processing_healthcare()
-            # time.sleep(2)
+                # Uncomment if you want to run the complex healthcare scenario
+                # (it takes longer)
+                # self._run_buffered(self.scenario_rfp_processing_healthcare)
+                # self._pause()
 
-            self.scenario_knowledge_search()
-            time.sleep(2)
+                self._run_buffered(self.scenario_knowledge_search)
+                self._pause()
 
-            self.scenario_client_specific_search()
+                self._run_buffered(self.scenario_client_specific_search)
 
         except KeyboardInterrupt:
-            print("\n\n⚠️  Demo interrupted by user")
+            self._print("\n\n⚠️  Demo interrupted by user")
         except Exception as e:
-            print(f"\n\n❌ Error during demo: {e}")
+            self._print(f"\n\n❌ Error during demo: {e}")
             import traceback
             traceback.print_exc()
 
@@ -710,24 +970,23 @@ Q19. Are there additional costs for HIPAA compliance features or healthcare-spec
         """Print summary of all results."""
         self.print_banner("DEMO SUMMARY", "🎯")
 
-        print(f"Total Scenarios Run: {len(self.results)}\n")
+        self._print(f"Total Scenarios Run: {len(self.results)}\n")
 
         for i, result in enumerate(self.results, 1):
-            print(f"{i}. {result['scenario']}")
-            print(f"   Workflow ID: {result['workflow_id']}")
-            print(f"   Status: {result['status']}")
+            self._print(f"{i}. {result['scenario']}")
+            self._print(f"   Workflow ID: {result['workflow_id']}")
+            self._print(f"   Status: {result['status']}")
             if result.get('output'):
-                print(f"   Output: {result['output']}")
-            print()
+                self._print(f"   Output: {result['output']}")
+            self._print()
 
         if self.results:
-            success_count = sum(1 for r in self.results if r['status'] == 'SUCCESS')
-            print(f"✅ Success Rate: {success_count}/{len(self.results)} "
-                  f"({100*success_count//len(self.results)}%)")
+            self._print(f"✅ Success Rate: {self._success_count}/{len(self.results)} "
+                        f"({100*self._success_count//len(self.results)}%)")
 
-        print("\n" + "=" * 100)
-        print("Demo complete! Check the demo_outputs/ directory for generated proposals.")
-        print("=" * 100)
+        self._print("\n" + "=" * 100)
+        self._print("Demo complete! Check the demo_outputs/ directory for generated proposals.")
+        self._print("=" * 100)
 
 
 def main():
@@ -743,6 +1002,7 @@ def main():
             "quick-saas",
             "quick-healthcare",
             "quick-finance",
+            "quick-batch",
             "rfp-basic",
             "rfp-healthcare",
             "knowledge-search",
@@ -757,14 +1017,29 @@ def main():
         default="http://localhost:8000",
         help="Base URL of the API"
     )
+    parser.add_argument(
+        "-y", "--yes",
+        action="store_true",
+        help="Run unattended: skip the start prompt and pauses between scenarios"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress scenario output when running all scenarios (the summary is still printed)"
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run scenarios one at a time instead of concurrently"
+    )
 
     args = parser.parse_args()
 
-    demo = ProposalSystemDemo(base_url=args.base_url)
+    demo = ProposalSystemDemo(base_url=args.base_url, quiet=args.quiet, unattended=args.yes)
 
     # Run selected scenario
     if args.scenario == "all":
-        demo.run_all_scenarios()
+        demo.run_all_scenarios(concurrent=not args.sequential)
     elif args.scenario == "quick-saas":
         demo.check_health()
         demo.scenario_quick_proposal_saas()
@@ -777,6 +1052,10 @@ def main():
         demo.check_health()
         demo.scenario_quick_proposal_finance()
         demo.print_summary()
+    elif args.scenario == "quick-batch":
+        demo.check_health()
+        demo.scenario_quick_proposal_batch()
+        demo.print_summary()
     elif args.scenario == "rfp-basic":
         demo.check_health()
         demo.scenario_rfp_processing_basic()
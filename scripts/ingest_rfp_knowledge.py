@@ -1,9 +1,14 @@
 """Batch ingestion script for RFP knowledge base."""
+import asyncio
 import os
 import sys
+import threading
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional
+import orjson
+import numpy as np
 from tqdm import tqdm
 
 # Add parent directory to path
@@ -13,14 +18,102 @@ from services.llm_service import LLMService
 from services.vector_store import VectorStore
 from services.document_processor import DocumentProcessor
 from services.embedding_service import EmbeddingService, ChunkingStrategy
-from services.metadata_extractor import MetadataExtractor, ClientMatcher
+from services.metadata_extractor import MetadataExtractor
+from services.extraction_cache import ExtractionCache
 from config import settings
 
 
+def extract_document(
+    file_path: str,
+    metadata_extractor: MetadataExtractor,
+    cache: Optional[ExtractionCache] = None,
+    defer_llm_metadata: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract text, metadata and chunks from a single document.
+
+    Has no shared state, so it can run in a worker process. Returns None when
+    the document has no meaningful content. When a cache is given, unchanged
+    files are served from it instead of being parsed again.
+
+    With ``defer_llm_metadata`` the LLM content analysis is left to the
+    caller: the document text is returned under "pending_content_text" (and
+    the cache key under "cache_key"), and the caller caches the document once
+    its metadata is complete.
+    """
+    if cache is not None:
+        variant = "llm" if defer_llm_metadata or metadata_extractor.llm is not None else "heuristic"
+        cache_key = ExtractionCache.fingerprint(file_path, variant)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    doc_data = _extract_document(file_path, metadata_extractor, defer_llm_metadata)
+
+    if cache is not None and doc_data is not None:
+        if defer_llm_metadata:
+            doc_data["cache_key"] = cache_key
+        else:
+            cache.set(cache_key, doc_data)
+
+    return doc_data
+
+
+def _extract_document(
+    file_path: str, metadata_extractor: MetadataExtractor, defer_llm_metadata: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Parse, describe and chunk a document without consulting the cache."""
+    # Step 1: Extract text
+    text = DocumentProcessor.extract_text(file_path)
+    if not text or len(text) < 50:
+        print(f"Skipping {file_path}: No meaningful content")
+        return None
+
+    # Step 2: Extract metadata
+    content_metadata = {} if defer_llm_metadata else None
+    metadata = metadata_extractor.extract_complete_metadata(file_path, text, content_metadata)
+
+    # Step 3: Chunk document
+    chunks = ChunkingStrategy.hybrid_chunk(text, max_chunk_size=800)
+
+    doc_data = {
+        "file_path": file_path,
+        "metadata": metadata,
+        "chunks": chunks,
+    }
+    if defer_llm_metadata:
+        doc_data["pending_content_text"] = text
+    return doc_data
+
+
+# Per-process state used by ingestion workers
+_worker_metadata_extractor = None
+_worker_cache = None
+_worker_defer_llm_metadata = False
+
+
+def _init_worker(defer_llm_metadata: bool, use_cache: bool):
+    """Set up the metadata extractor and cache once per worker process.
+
+    Workers never call the LLM themselves; when LLM metadata is enabled the
+    parent process fans those calls out concurrently instead.
+    """
+    global _worker_metadata_extractor, _worker_cache, _worker_defer_llm_metadata
+    _worker_cache = ExtractionCache() if use_cache else None
+    _worker_defer_llm_metadata = defer_llm_metadata
+    _worker_metadata_extractor = MetadataExtractor(None)
+
+
+def _extract_in_worker(file_path: str) -> Optional[Dict[str, Any]]:
+    """Worker entry point for extract_document."""
+    return extract_document(file_path, _worker_metadata_extractor, _worker_cache, _worker_defer_llm_metadata)
+
+
 class RFPKnowledgeIngestion:
     """Batch ingestion pipeline for RFP documents."""
 
-    def __init__(self, use_openai_embeddings: bool = False, use_gemini_embeddings: bool = False, use_llm_metadata: bool = True):
+    def __init__(self, use_openai_embeddings: bool = False, use_gemini_embeddings: bool = False, use_llm_metadata: bool = True,
+                 use_cache: bool = True):
         """Initialize ingestion pipeline."""
         print("Initializing RFP Knowledge Ingestion Pipeline...")
 
@@ -36,13 +129,18 @@ class RFPKnowledgeIngestion:
                 print("Continuing with heuristic-based metadata extraction only")
                 self.llm = None
 
+        self.use_cache = use_cache
+        self.extraction_cache = ExtractionCache() if use_cache else None
         self.doc_processor = DocumentProcessor()
         self.metadata_extractor = MetadataExtractor(self.llm)
         self.embedding_service = EmbeddingService(
             use_openai=use_openai_embeddings,
             use_gemini=use_gemini_embeddings
         )
-        self.vector_store = VectorStore()
+        self.reuse_embeddings = not (self.embedding_service.use_openai or self.embedding_service.use_gemini)
+        # With local embeddings both services use the same model; load it once.
+        # Worker processes only extract and chunk, so they never load it.
+        self.vector_store = VectorStore(encoder=self.embedding_service.encoder if self.reuse_embeddings else None)
         self.chunking = ChunkingStrategy()
 
         self.stats = {
@@ -65,10 +163,16 @@ class RFPKnowledgeIngestion:
             print(f"Warning: Directory {root_dir} not found!")
             return []
 
+        # Walk the tree once, bucketing by extension to keep the per-type order
+        by_extension = {ext: [] for ext in supported_extensions}
+        for dirpath, _, filenames in os.walk(root_path):
+            for filename in filenames:
+                bucket = by_extension.get(os.path.splitext(filename)[1])
+                if bucket is not None:
+                    bucket.append(os.path.join(dirpath, filename))
+
         for ext in supported_extensions:
-            pattern = f"**/*{ext}"
-            files = list(root_path.glob(pattern))
-            documents.extend([str(f) for f in files])
+            documents.extend(by_extension[ext])
 
         print(f"Discovered {len(documents)} documents")
         return documents
@@ -78,41 +182,54 @@ class RFPKnowledgeIngestion:
         Process a single document: extract text, metadata, chunk, embed.
         """
         try:
-            # Step 1: Extract text
-            text = self.doc_processor.extract_text(file_path)
-            if not text or len(text) < 50:
-                print(f"Skipping {file_path}: No meaningful content")
-                return None
+            doc_data = extract_document(file_path, self.metadata_extractor, self.extraction_cache)
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            self.stats["failed"] += 1
+            return None
 
-            # Step 2: Extract metadata
-            metadata = self.metadata_extractor.extract_complete_metadata(file_path, text)
+        if not doc_data:
+            return None
 
-            # Step 3: Chunk document
-            chunks = self.chunking.hybrid_chunk(text, max_chunk_size=800)
+        # Step 4: Generate embeddings for chunks
+        chunk_texts = [chunk["text"] for chunk in doc_data["chunks"]]
+        doc_data["embeddings"] = self.embedding_service.embed_batch(chunk_texts)
+        self._record_document(doc_data)
+        return doc_data
 
-            # Step 4: Generate embeddings for chunks
-            chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.embedding_service.embed_batch(chunk_texts)
+    def embed_documents(self, all_doc_data: List[Dict[str, Any]], batch_size: int = 1024, show_progress_bar: bool = True):
+        """
+        Embed the chunks of all documents in a single batched call.
 
-            # Step 5: Prepare for vector store
-            doc_data = {
-                "file_path": file_path,
-                "metadata": metadata,
-                "chunks": chunks,
-                "embeddings": embeddings,
-                "num_chunks": len(chunks),
-            }
+        Embeddings are scattered back onto each document by chunk offset.
+        """
+        all_chunk_texts = []
+        offsets = []
+        for doc_data in all_doc_data:
+            start = len(all_chunk_texts)
+            all_chunk_texts.extend(chunk["text"] for chunk in doc_data["chunks"])
+            offsets.append((start, len(all_chunk_texts)))
+
+        if not all_chunk_texts:
+            return
 
-            self.stats["total_chunks"] += len(chunks)
-            if metadata.get("client_name"):
-                self.stats["clients"].add(metadata["client_name"])
+        embeddings = self.embedding_service.embed_batch(all_chunk_texts, batch_size=batch_size, show_progress_bar=show_progress_bar)
 
-            return doc_data
+        for doc_data, (start, end) in zip(all_doc_data, offsets):
+            doc_data["embeddings"] = embeddings[start:end]
+            self._record_document(doc_data)
 
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
-            self.stats["failed"] += 1
-            return None
+    def _record_document(self, doc_data: Dict[str, Any]):
+        """
+        Record statistics for a processed document.
+        """
+        metadata = doc_data["metadata"]
+        doc_data["num_chunks"] = len(doc_data["chunks"])
+
+        self.stats["total_chunks"] += doc_data["num_chunks"]
+        self.stats["processed"] += 1
+        if metadata.get("client_name"):
+            self.stats["clients"].add(metadata["client_name"])
 
     def add_to_vector_store(self, doc_data: Dict[str, Any]):
         """
@@ -121,32 +238,35 @@ class RFPKnowledgeIngestion:
         if not doc_data:
             return
 
-        # Add each chunk to vector store
-        for i, (chunk, embedding) in enumerate(zip(doc_data["chunks"], doc_data["embeddings"])):
-            # Prepare chunk metadata
-            chunk_metadata = {
-                **doc_data["metadata"],
-                "chunk_id": i,
-                "chunk_type": chunk.get("type", "unknown"),
-                "chunk_size": chunk.get("size", 0),
-            }
-
-            # Add to vector store (but don't embed again, we already have embeddings)
-            # We need to add directly to FAISS
-            pass  # This requires modifying VectorStore to accept pre-computed embeddings
-
-        # For now, use the existing add_documents method
-        chunk_texts = [chunk["text"] for chunk in doc_data["chunks"]]
-        chunk_metadata_list = [
-            {
-                **doc_data["metadata"],
-                "chunk_id": i,
-                "chunk_type": chunk.get("type", "unknown"),
-            }
-            for i, chunk in enumerate(doc_data["chunks"])
-        ]
+        self.add_all_to_vector_store([doc_data])
 
-        self.vector_store.add_documents(chunk_texts, chunk_metadata_list)
+    def add_all_to_vector_store(self, all_doc_data: List[Dict[str, Any]]):
+        """
+        Add the chunks of all processed documents with a single index insert.
+        """
+        all_doc_data = [doc_data for doc_data in all_doc_data if doc_data and doc_data["chunks"]]
+        if not all_doc_data:
+            return
+
+        chunk_texts = []
+        chunk_metadata_list = []
+        for doc_data in all_doc_data:
+            # Chunks share the document's metadata through a ChainMap instead of
+            # each holding a copy; pickle also stores the shared dict only once.
+            base_metadata = doc_data["metadata"]
+            for i, chunk in enumerate(doc_data["chunks"]):
+                chunk_texts.append(chunk["text"])
+                chunk_metadata_list.append(
+                    ChainMap({"chunk_id": i, "chunk_type": chunk.get("type", "unknown")}, base_metadata)
+                )
+
+        # Reuse the embeddings computed during ingestion when they share the
+        # store's embedding space; API embeddings must be re-encoded locally.
+        if self.reuse_embeddings:
+            embeddings = np.concatenate([doc_data["embeddings"] for doc_data in all_doc_data])
+            self.vector_store.add_documents_with_embeddings(chunk_texts, embeddings, chunk_metadata_list)
+        else:
+            self.vector_store.add_documents(chunk_texts, chunk_metadata_list)
 
     def link_rfp_pairs(self, all_metadata: List[Dict[str, Any]]):
         """
@@ -154,33 +274,131 @@ class RFPKnowledgeIngestion:
         """
         print("\nLinking RFP pairs...")
 
-        # Group by client
-        by_client = {}
+        # Group received RFPs and responses by client in one pass
+        received_by_client = {}
+        responses_by_client = {}
         for meta in all_metadata:
-            client = meta.get("client_name", "Unknown")
-            if client not in by_client:
-                by_client[client] = []
-            by_client[client].append(meta)
-
-        # For each client, link received to response
+            if meta.get("doc_type") == "rfp_received":
+                received_by_client.setdefault(meta.get("client_name", "Unknown"), []).append(meta)
+            elif meta.get("doc_type") == "rfp_response":
+                responses_by_client.setdefault(meta.get("client_name", "Unknown"), []).append(meta)
+
+        # Every received/response pair for the same client is related (see
+        # ClientMatcher.link_rfp_to_response), so each document links to the
+        # last counterpart instead of being compared pairwise.
         linked_count = 0
-        for client, docs in by_client.items():
-            received = [d for d in docs if d.get("doc_type") == "rfp_received"]
-            responses = [d for d in docs if d.get("doc_type") == "rfp_response"]
+        for client in received_by_client.keys() & responses_by_client.keys():
+            received = received_by_client[client]
+            responses = responses_by_client[client]
 
+            # Store bidirectional link
             for rfp in received:
-                for response in responses:
-                    if ClientMatcher.link_rfp_to_response(rfp, response):
-                        # Store bidirectional link
-                        rfp["linked_response"] = response["file_path"]
-                        response["linked_request"] = rfp["file_path"]
-                        linked_count += 1
+                rfp["linked_response"] = responses[-1]["file_path"]
+            for response in responses:
+                response["linked_request"] = received[-1]["file_path"]
+            linked_count += len(received) * len(responses)
 
         print(f"Linked {linked_count} RFP-Response pairs")
 
-    def run(self, root_dir: str = "resources/RFP_Hackathon", dry_run: bool = False):
+    def extract_and_embed(
+        self, documents: List[str], workers: Optional[int] = None, batch_size: int = 1024
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract documents in worker processes and embed them as they arrive.
+
+        Chunks are embedded in batches of about ``batch_size`` while the pool
+        keeps parsing, so extraction and embedding overlap. The LLM metadata
+        calls for all documents are in flight concurrently alongside both
+        (bounded by LLMService's concurrency limit). Returns the non-empty
+        documents in the same order as ``documents``.
+        """
+        results = [None] * len(documents)
+        pending = []
+        pending_chunks = 0
+        metadata_jobs = []
+
+        # LLM metadata calls are I/O bound: run them on an event loop in a
+        # background thread so they overlap with parsing and embedding
+        llm_loop = asyncio.new_event_loop() if self.llm is not None else None
+        llm_thread = None
+        if llm_loop is not None:
+            llm_thread = threading.Thread(target=llm_loop.run_forever, daemon=True)
+            llm_thread.start()
+
+        try:
+            for i, doc_data in self._iter_extracted(documents, workers):
+                if not doc_data:
+                    continue
+                results[i] = doc_data
+
+                text = doc_data.pop("pending_content_text", None)
+                if text is not None:
+                    future = asyncio.run_coroutine_threadsafe(
+                        self.metadata_extractor.extract_from_content_async(text), llm_loop
+                    )
+                    metadata_jobs.append((doc_data, future))
+
+                pending.append(doc_data)
+                pending_chunks += len(doc_data["chunks"])
+
+                if pending_chunks >= batch_size:
+                    self.embed_documents(pending, batch_size=batch_size, show_progress_bar=False)
+                    pending = []
+                    pending_chunks = 0
+
+            if pending:
+                self.embed_documents(pending, batch_size=batch_size, show_progress_bar=False)
+
+            for doc_data, future in tqdm(metadata_jobs, desc="LLM metadata", disable=not metadata_jobs):
+                # Content keys (industry, categories, ...) never overlap the path/tracking keys
+                doc_data["metadata"].update(future.result())
+                self._cache_deferred(doc_data)
+        finally:
+            if llm_loop is not None:
+                asyncio.run_coroutine_threadsafe(self.llm.aclose(), llm_loop).result()
+                llm_loop.call_soon_threadsafe(llm_loop.stop)
+                llm_thread.join()
+                llm_loop.close()
+
+        return [doc_data for doc_data in results if doc_data]
+
+    def _cache_deferred(self, doc_data: Dict[str, Any]):
+        """Cache a document whose metadata was completed in this process."""
+        cache_key = doc_data.pop("cache_key", None)
+        if cache_key is not None and self.extraction_cache is not None:
+            self.extraction_cache.set(
+                cache_key, {key: doc_data[key] for key in ("file_path", "metadata", "chunks")}
+            )
+
+    def _iter_extracted(self, documents: List[str], workers: Optional[int] = None):
+        """
+        Yield ``(index, doc_data)`` pairs from the process pool as they complete.
+
+        Failed documents are counted and skipped.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self.llm is not None, self.use_cache),
+        ) as executor:
+            futures = {executor.submit(_extract_in_worker, file_path): i for i, file_path in enumerate(documents)}
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Extracting documents"):
+                i = futures[future]
+                try:
+                    doc_data = future.result()
+                except Exception as e:
+                    print(f"Error processing {documents[i]}: {str(e)}")
+                    self.stats["failed"] += 1
+                    continue
+                yield i, doc_data
+
+    def run(self, root_dir: str = "resources/RFP_Hackathon", dry_run: bool = False, workers: Optional[int] = None):
         """
         Run the complete ingestion pipeline.
+
+        Extraction and chunking run in a process pool while this process embeds
+        finished documents, so the model and index are loaded only once.
         """
         print("=" * 80)
         print("RFP KNOWLEDGE BASE INGESTION")
@@ -201,25 +419,17 @@ class RFPKnowledgeIngestion:
             print(f"  ... and {len(documents) - 10} more")
             return
 
-        # Step 2: Process each document
+        # Step 2: Process each document, embedding chunks while extraction continues
         print(f"\nProcessing {len(documents)} documents...")
-        all_doc_data = []
-        all_metadata = []
-
-        for file_path in tqdm(documents, desc="Processing documents"):
-            doc_data = self.process_document(file_path)
-            if doc_data:
-                all_doc_data.append(doc_data)
-                all_metadata.append(doc_data["metadata"])
-                self.stats["processed"] += 1
+        all_doc_data = self.extract_and_embed(documents, workers=workers)
+        all_metadata = [doc_data["metadata"] for doc_data in all_doc_data]
 
         # Step 3: Link RFP pairs
         self.link_rfp_pairs(all_metadata)
 
         # Step 4: Add to vector store
         print("\nAdding to vector store...")
-        for doc_data in tqdm(all_doc_data, desc="Indexing"):
-            self.add_to_vector_store(doc_data)
+        self.add_all_to_vector_store(all_doc_data)
 
         # Step 5: Save vector store
         print("\nSaving vector store...")
@@ -228,8 +438,8 @@ class RFPKnowledgeIngestion:
         # Step 6: Save metadata separately
         metadata_file = f"{settings.vector_store_path}/rfp_metadata.json"
         os.makedirs(os.path.dirname(metadata_file), exist_ok=True)
-        with open(metadata_file, "w") as f:
-            json.dump(all_metadata, f, indent=2, default=str)
+        with open(metadata_file, "wb") as f:
+            f.write(orjson.dumps(all_metadata, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
         # Print statistics
         self.print_stats()
@@ -259,6 +469,8 @@ def main():
     parser.add_argument("--use-gemini", action="store_true", help="Use Google Gemini embeddings (alternative to OpenAI)")
     parser.add_argument("--no-llm-metadata", action="store_true", help="Skip LLM-based metadata extraction (use heuristics only)")
     parser.add_argument("--root-dir", default="resources/RFP_Hackathon", help="Root directory of RFP files")
+    parser.add_argument("--no-cache", action="store_true", help="Re-extract every document, ignoring the extraction cache")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction worker processes (default: CPU count)")
 
     args = parser.parse_args()
 
@@ -266,9 +478,10 @@ def main():
     pipeline = RFPKnowledgeIngestion(
         use_openai_embeddings=args.use_openai,
         use_gemini_embeddings=args.use_gemini,
-        use_llm_metadata=not args.no_llm_metadata
+        use_llm_metadata=not args.no_llm_metadata,
+        use_cache=not args.no_cache
     )
-    pipeline.run(root_dir=args.root_dir, dry_run=args.dry_run)
+    pipeline.run(root_dir=args.root_dir, dry_run=args.dry_run, workers=args.workers)
 
 
 if __name__ == "__main__":
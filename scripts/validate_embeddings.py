@@ -7,7 +7,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from services.vector_store import VectorStore
 from services.llm_service import LLMService
 from config import settings
-import json
+import orjson
 
 
 class EmbeddingValidator:
@@ -21,8 +21,8 @@ class EmbeddingValidator:
         # Load metadata if available
         metadata_file = f"{settings.vector_store_path}/rfp_metadata.json"
         try:
-            with open(metadata_file, "r") as f:
-                self.metadata = json.load(f)
+            with open(metadata_file, "rb") as f:
+                self.metadata = orjson.loads(f.read())
         except:
             self.metadata = []
 
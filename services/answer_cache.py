@@ -0,0 +1,81 @@
+"""Answer cache - Reuses generated RFP answers for repeated questions."""
+from typing import Any, Dict, Optional
+
+from services.question_cache import QuestionCache
+
+
+class AnswerCache(QuestionCache):
+    """Persistent cache of generated answers, keyed by question and scope.
+
+    Questions are matched after lowercasing and collapsing whitespace. The
+    scope string should capture everything else the answer depends on
+    (model, retrieval depth, client context, knowledge base version), so a
+    cached answer is only reused where it would have been generated anyway.
+    Storage, expiry and eviction are inherited from QuestionCache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/cache/answers",
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """Initialize the answer cache.
+
+        Args:
+            cache_dir: Directory to store the cache database
+            ttl_seconds: Entry lifetime (defaults to settings.question_cache_ttl_seconds)
+            max_entries: Entry cap (defaults to settings.question_cache_max_entries)
+        """
+        super().__init__(cache_dir, ttl_seconds, max_entries)
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Normalize a question for matching (case and whitespace insensitive)."""
+        return " ".join(question.lower().split())
+
+    def _answer_key(self, question: str, scope: str) -> str:
+        """Cache key for a question within a scope."""
+        return self._generate_cache_key(f"{scope}\0{self.normalize_question(question)}")
+
+    def get_answer(self, question: str, scope: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached answer.
+
+        Args:
+            question: Question text
+            scope: Everything else the answer depends on
+
+        Returns:
+            The cached response dict, or None if not cached
+        """
+        cache_key = self._answer_key(question, scope)
+        try:
+            entry = self._load(cache_key)
+        except Exception as e:
+            print(f"[AnswerCache] ERROR - Failed to read cache: {e}")
+            return None
+
+        if entry is None:
+            return None
+
+        print(f"[AnswerCache] HIT - Reusing answer (key: {cache_key}, cached: {entry[1] or 'unknown'})")
+        return entry[0]
+
+    def set_answer(self, question: str, scope: str, response: Dict[str, Any]) -> bool:
+        """Store a generated answer.
+
+        Args:
+            question: Question text
+            scope: Everything else the answer depends on
+            response: JSON-serializable response dict
+
+        Returns:
+            True if caching succeeded, False otherwise
+        """
+        cache_key = self._answer_key(question, scope)
+        try:
+            self._store(cache_key, response, len(question))
+            return True
+        except Exception as e:
+            print(f"[AnswerCache] ERROR - Failed to write cache: {e}")
+            return False
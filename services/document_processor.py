@@ -9,15 +9,36 @@ class DocumentProcessor:
 
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text from PDF."""
+        """Extract text from PDF.
+
+        Uses pypdfium2 (PDFium bindings) when available, falling back to PyPDF2.
+        """
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            pdfium = None
+
+        if pdfium is not None:
+            try:
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    pages = []
+                    for page in pdf:
+                        textpage = page.get_textpage()
+                        pages.append(textpage.get_text_range())
+                        textpage.close()
+                        page.close()
+                    return "\n".join(pages).strip()
+                finally:
+                    pdf.close()
+            except Exception as e:
+                print(f"[DocumentProcessor] pypdfium2 failed, falling back to PyPDF2: {e}")
+
         try:
             from PyPDF2 import PdfReader
 
             reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
@@ -1,9 +1,47 @@
 """Enhanced embedding service with multi-model support."""
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional, Dict, Any
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from config import settings
 
+# OpenAI embedding requests: texts per request and requests in flight
+OPENAI_EMBEDDING_BATCH_SIZE = 2048
+OPENAI_EMBEDDING_CONCURRENCY = 8
+
+# Numbered Q&A pairs ("Q1:", "Question 2", "3.") used by structural chunking
+_QA_PATTERN = re.compile(
+    r"(?:Q\d+|Question \d+|^\d+\.)\s*:?\s*(.+?)(?=(?:Q\d+|Question \d+|^\d+\.)|$)",
+    re.MULTILINE | re.DOTALL,
+)
+# Just the markers, for a cheap linear check before running _QA_PATTERN
+_QA_MARKER = re.compile(r"Q\d+|Question \d+|^\d+\.", re.MULTILINE)
+
+
+def load_sentence_transformer(model_name: str) -> SentenceTransformer:
+    """Load a sentence-transformers model on the configured or best available device.
+
+    ``settings.embed_device`` overrides detection (CUDA, then Apple MPS, then
+    CPU). On CUDA the weights are cast to fp16, roughly halving encode time
+    and memory; callers cast the returned embeddings to float32 as needed.
+    """
+    device = settings.embed_device
+    if not device:
+        import torch
+
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif torch.backends.mps.is_available():
+            device = "mps"
+        else:
+            device = "cpu"
+
+    encoder = SentenceTransformer(model_name, device=device)
+    if device.startswith("cuda"):
+        encoder.half()
+    return encoder
+
 
 class EmbeddingService:
     """Advanced embedding service with multiple model support."""
@@ -45,7 +83,9 @@ class EmbeddingService:
                 import os
 
                 api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-                self.openai_client = OpenAI(api_key=api_key)
+                # The client retries 429s with exponential backoff; concurrent
+                # batch requests hit the rate limit more often than serial ones
+                self.openai_client = OpenAI(api_key=api_key, max_retries=5)
                 print(f"Using OpenAI embeddings: {openai_model}")
             except Exception as e:
                 print(f"Failed to initialize OpenAI: {e}. Falling back to sentence-transformers")
@@ -54,7 +94,7 @@ class EmbeddingService:
         # Fall back to sentence-transformers if no API provider is active
         if not self.use_openai and not self.use_gemini:
             model_name = primary_model or settings.embedding_model
-            self.encoder = SentenceTransformer(model_name)
+            self.encoder = load_sentence_transformer(model_name)
             self.dimension = self.encoder.get_sentence_embedding_dimension()
             print(f"Using sentence-transformers: {model_name} (dim={self.dimension})")
 
@@ -67,30 +107,62 @@ class EmbeddingService:
         else:
             return self.encoder.encode(text, convert_to_numpy=True)
 
-    def embed_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
-        """Embed multiple texts efficiently."""
+    def embed_batch(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        """Embed multiple texts efficiently.
+
+        Duplicate texts (shared boilerplate across RFPs) are embedded once and
+        fanned back out. sentence-transformers already length-sorts inputs into
+        mini-batches to minimise padding and returns embeddings in input order,
+        so texts are otherwise passed through as-is.
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        if len(unique_texts) == len(texts):
+            return self._embed_texts(texts, batch_size, show_progress_bar)
+
+        embeddings = self._embed_texts(unique_texts, batch_size, show_progress_bar)
+        positions = {text: i for i, text in enumerate(unique_texts)}
+        return embeddings[[positions[text] for text in texts]]
+
+    def _embed_texts(self, texts: List[str], batch_size: int, show_progress_bar: bool) -> np.ndarray:
+        """Embed texts with the active provider."""
         if self.use_gemini:
             return self._embed_gemini(texts)
         elif self.use_openai:
             return self._embed_openai(texts)
         else:
             return self.encoder.encode(
-                texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=True
+                texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=show_progress_bar
             )
 
     def _embed_openai(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings using OpenAI."""
+        """Generate embeddings using OpenAI.
+
+        Batches are sent concurrently; the round trip, not the server, is the
+        bottleneck when a large corpus is embedded one request at a time.
+        """
         try:
             # OpenAI allows batch up to 2048 texts
-            all_embeddings = []
+            batches = [texts[i : i + OPENAI_EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), OPENAI_EMBEDDING_BATCH_SIZE)]
 
-            for i in range(0, len(texts), 2048):
-                batch = texts[i : i + 2048]
+            def embed(batch: List[str]) -> List[List[float]]:
                 response = self.openai_client.embeddings.create(input=batch, model=self.openai_model)
-                embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(embeddings)
-
-            return np.array(all_embeddings, dtype=np.float32)
+                return [item.embedding for item in response.data]
+
+            # Each batch is written straight into one float32 buffer, sized
+            # from the first response since the width depends on the model
+            out = None
+            offset = 0
+            with ThreadPoolExecutor(max_workers=min(OPENAI_EMBEDDING_CONCURRENCY, max(len(batches), 1))) as executor:
+                # map() yields in submission order, so embeddings stay aligned with texts
+                for embeddings in executor.map(embed, batches):
+                    if out is None:
+                        out = np.empty((len(texts), len(embeddings[0])), dtype=np.float32)
+                    out[offset : offset + len(embeddings)] = embeddings
+                    offset += len(embeddings)
+
+            if out is None:
+                return np.empty((0, self.get_dimension()), dtype=np.float32)
+            return out
         except Exception as e:
             raise Exception(f"OpenAI embedding failed: {str(e)}")
 
@@ -144,12 +216,12 @@ class ChunkingStrategy:
         """
         chunks = []
 
-        # Pattern 1: Numbered Q&A pairs
-        import re
+        # Plain prose has no Q&A markers; skip the lazy pattern entirely
+        if not _QA_MARKER.search(text):
+            return ChunkingStrategy.semantic_chunk(text, max_chunk_size)
 
-        # Find all Q&A patterns
-        qa_pattern = r"(?:Q\d+|Question \d+|^\d+\.)\s*:?\s*(.+?)(?=(?:Q\d+|Question \d+|^\d+\.)|$)"
-        matches = re.finditer(qa_pattern, text, re.MULTILINE | re.DOTALL)
+        # Pattern 1: Numbered Q&A pairs
+        matches = _QA_PATTERN.finditer(text)
 
         for match in matches:
             question_text = match.group(1).strip()
@@ -170,26 +242,33 @@ class ChunkingStrategy:
         chunks = []
         paragraphs = text.split("\n\n")
 
-        current_chunk = ""
+        # Accumulate paragraphs in a list and join on flush; repeated string
+        # concatenation would copy the whole chunk for every paragraph.
+        current_parts: List[str] = []
+        current_len = 0
         for para in paragraphs:
             para = para.strip()
             if not para:
                 continue
 
             # If adding this para exceeds limit, save current chunk
-            if len(current_chunk) + len(para) > max_chunk_size and current_chunk:
-                chunks.append({"text": current_chunk.strip(), "type": "semantic", "size": len(current_chunk)})
+            if current_len + len(para) > max_chunk_size and current_parts:
+                current_chunk = "\n\n".join(current_parts)
+                chunks.append({"text": current_chunk.strip(), "type": "semantic", "size": current_len})
 
                 # Start new chunk with overlap
                 words = current_chunk.split()
                 overlap_text = " ".join(words[-overlap:]) if len(words) > overlap else ""
-                current_chunk = overlap_text + " " + para
+                current_parts = [overlap_text + " " + para]
+                current_len = len(current_parts[0])
             else:
-                current_chunk += "\n\n" + para if current_chunk else para
+                current_len += len(para) + 2 if current_parts else len(para)
+                current_parts.append(para)
 
         # Add final chunk
-        if current_chunk:
-            chunks.append({"text": current_chunk.strip(), "type": "semantic", "size": len(current_chunk)})
+        if current_parts:
+            current_chunk = "\n\n".join(current_parts)
+            chunks.append({"text": current_chunk.strip(), "type": "semantic", "size": current_len})
 
         return chunks
 
@@ -0,0 +1,101 @@
+"""File-based caching service for document extraction during ingestion.
+
+Re-ingesting an unchanged corpus would otherwise re-parse every PDF/DOCX and
+re-run metadata extraction. Results are keyed by a fingerprint of the file
+bytes, so edited files are picked up automatically.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+
+class ExtractionCache:
+    """File-based cache for extracted documents (metadata and chunks).
+
+    Entries are pickled to ``{cache_dir}/{key[:2]}/{key}.pkl``.
+    """
+
+    def __init__(self, cache_dir: str = "./data/cache/extraction"):
+        """Initialize the extraction cache.
+
+        Args:
+            cache_dir: Directory to store cache files
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(file_path: str, variant: str = "") -> str:
+        """Generate a cache key from a file's path and content.
+
+        Args:
+            file_path: Path of the document (metadata depends on it)
+            variant: Extra key material, e.g. the metadata extraction mode
+
+        Returns:
+            Hex digest to use as cache key
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{file_path}\0{variant}\0".encode("utf-8"))
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _get_cache_path(self, cache_key: str) -> Path:
+        """Get the file path for a cache key.
+
+        Args:
+            cache_key: Cache key identifier
+
+        Returns:
+            Path to cache file
+        """
+        return self.cache_dir / cache_key[:2] / f"{cache_key}.pkl"
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached extraction result.
+
+        Args:
+            cache_key: Key from fingerprint()
+
+        Returns:
+            Cached document data if present, None otherwise
+        """
+        cache_path = self._get_cache_path(cache_key)
+        if not cache_path.exists():
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[ExtractionCache] ERROR - Failed to read cache: {e}")
+            return None
+
+    def set(self, cache_key: str, doc_data: Dict[str, Any]) -> bool:
+        """Store an extraction result.
+
+        Args:
+            cache_key: Key from fingerprint()
+            doc_data: Extracted document data to cache
+
+        Returns:
+            True if caching succeeded, False otherwise
+        """
+        cache_path = self._get_cache_path(cache_key)
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a per-process temp file first so concurrent workers never
+            # read a partial entry or overwrite each other's temp file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(doc_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(cache_path)
+            return True
+        except Exception as e:
+            print(f"[ExtractionCache] ERROR - Failed to write cache: {e}")
+            return False
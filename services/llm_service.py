@@ -1,43 +1,246 @@
 """LLM service for interacting with language models."""
+import asyncio
+import functools
+import itertools
+import json
 import os
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Iterator
+import httpx
+import orjson
 from config import settings
 
+# Shared connection settings for provider SDK clients: keep TLS connections
+# alive between calls so repeated generations skip the handshake
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Seconds a rate-limited API key sits out when the response has no Retry-After
+_DEFAULT_RATE_LIMIT_COOLDOWN = 5.0
+
+
+def _pooled_http_client(sdk, async_client: bool = False):
+    """Build a keep-alive HTTP client for a provider SDK module.
+
+    Newer SDKs ship their own httpx-compatible client classes (which keep the
+    SDK defaults); older ones accept a plain httpx client.
+    """
+    if async_client:
+        factory = getattr(sdk, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+    else:
+        factory = getattr(sdk, "DefaultHttpxClient", httpx.Client)
+    return factory(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_client(provider: str, api_key: str):
+    """Return the shared sync SDK client for a provider and API key.
+
+    Clients are thread-safe and hold the keep-alive connection pool, so every
+    LLMService using the same key shares one instead of building its own.
+    """
+    if provider == "openai":
+        import openai
+
+        return openai.OpenAI(api_key=api_key, http_client=_pooled_http_client(openai))
+
+    import anthropic
+
+    # Use the modern Anthropic SDK (0.40.0+)
+    return anthropic.Anthropic(api_key=api_key, http_client=_pooled_http_client(anthropic))
+
+
+def _split_keys(keys: Optional[str]) -> List[str]:
+    """Split a comma-separated API key setting into individual keys."""
+    return [key.strip() for key in (keys or "").split(",") if key.strip()]
+
+
+def _rate_limit_cooldown(error: Exception) -> Optional[float]:
+    """Return how long to rest a key after ``error``, or None if it is not a rate limit."""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return _DEFAULT_RATE_LIMIT_COOLDOWN
+
+
+async def _close_async_clients(clients) -> None:
+    """Close async SDK clients, releasing their connection pools."""
+    for client in clients:
+        await client.close()
+
+
+def _structured_prompt(prompt: str, schema: Optional[Dict[str, Any]]) -> str:
+    """Append the JSON-only instruction (and schema, if any) to a prompt."""
+    structured_prompt = f"{prompt}\n\nRespond with valid JSON only."
+    if schema:
+        structured_prompt += f"\n\nExpected schema: {orjson.dumps(schema).decode()}"
+    return structured_prompt
+
+
+def _parse_json_response(response: str) -> Any:
+    """Parse the JSON value in an LLM response.
+
+    A response that is valid JSON as a whole is returned as parsed. Otherwise
+    the first complete JSON object (or, failing that, array) is extracted:
+    decoding starts at each opening brace in turn and stops at the end of that
+    value, so code fences, leading text and trailing prose are all ignored.
+    """
+    # Fast path: JSON-mode replies are usually bare JSON
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        pass
+
+    decoder = json.JSONDecoder()
+    for opener in "{[":
+        start = response.find(opener)
+        while start != -1:
+            try:
+                return decoder.raw_decode(response, start)[0]
+            except json.JSONDecodeError:
+                start = response.find(opener, start + 1)
+    raise ValueError(f"Failed to parse JSON from response: {response}")
+
 
 class LLMService:
-    """Service for LLM interactions."""
+    """Service for LLM interactions.
+
+    When several API keys are configured (``OPENAI_API_KEYS`` /
+    ``ANTHROPIC_API_KEYS``, comma-separated), calls are spread over them
+    round-robin. A key that hits a rate limit rests for its Retry-After period
+    while the remaining keys keep serving requests.
+    """
 
-    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
+    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None, api_keys: Optional[List[str]] = None):
         """Initialize LLM service."""
         self.provider = provider or settings.default_llm_provider
         self.model = model or settings.default_model
         self.client = None
+        self.clients = []
+        self.api_keys = list(api_keys or [])
+        self._async_clients = []
+        self._async_semaphore = None
+        self._async_loop = None
         self._initialize_client()
 
+        self._key_order = itertools.cycle(range(len(self.clients)))
+        self._cooling_until = [0.0] * len(self.clients)
+
     def _initialize_client(self):
-        """Initialize the LLM client based on provider."""
+        """Initialize one LLM client per API key based on provider."""
         if self.provider == "openai":
             try:
-                from openai import OpenAI
-                api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-                if not api_key:
+                if not self.api_keys:
+                    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
+                    self.api_keys = _split_keys(settings.openai_api_keys) or ([api_key] if api_key else [])
+                if not self.api_keys:
                     raise ValueError("OpenAI API key not found")
-                self.client = OpenAI(api_key=api_key)
+                self.clients = [_get_client(self.provider, api_key) for api_key in self.api_keys]
             except ImportError:
                 raise ImportError("openai package not installed")
         elif self.provider == "anthropic":
             try:
-                from anthropic import Anthropic
-                api_key = settings.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
-                if not api_key:
+                if not self.api_keys:
+                    api_key = settings.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
+                    self.api_keys = _split_keys(settings.anthropic_api_keys) or ([api_key] if api_key else [])
+                if not self.api_keys:
                     raise ValueError("Anthropic API key not found")
 
-                # Use the modern Anthropic SDK (0.40.0+)
-                self.client = Anthropic(api_key=api_key)
+                self.clients = [_get_client(self.provider, api_key) for api_key in self.api_keys]
             except ImportError:
                 raise ImportError("anthropic package not installed. Install with: pip install anthropic>=0.40.0")
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
+        self.client = self.clients[0]
+
+    def _next_key(self) -> int:
+        """Pick the next API key round-robin, skipping keys that are cooling down.
+
+        If every key is cooling down, the one that recovers first is returned;
+        callers wait out its remaining cooldown.
+        """
+        now = time.monotonic()
+        for _ in range(len(self.clients)):
+            index = next(self._key_order)
+            if self._cooling_until[index] <= now:
+                return index
+        return min(range(len(self.clients)), key=self._cooling_until.__getitem__)
+
+    def _cooldown_remaining(self, index: int) -> float:
+        """Seconds until the given key may be used again."""
+        return max(0.0, self._cooling_until[index] - time.monotonic())
+
+    def _handle_rate_limit(self, index: int, error: Exception, attempt: int) -> bool:
+        """Rest a rate-limited key; return True if the call should move to another key."""
+        cooldown = _rate_limit_cooldown(error)
+        if cooldown is None:
+            return False
+        self._cooling_until[index] = time.monotonic() + cooldown
+        return attempt + 1 < len(self.clients)
+
+    def _create(self, client: Any, kwargs: Dict[str, Any]) -> Any:
+        """Send a request with the given (sync or async) provider client."""
+        if self.provider == "openai":
+            return client.chat.completions.create(**kwargs)
+        return client.messages.create(**kwargs)
+
+    def _build_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        cache_system_prompt: bool = False,
+        json_mode: bool = False,
+    ) -> Dict[str, Any]:
+        """Build provider-specific request arguments.
+
+        With ``cache_system_prompt``, Anthropic requests mark the system prompt
+        as a cacheable prefix. OpenAI caches long shared prefixes automatically,
+        so the system message is simply kept first.
+
+        With ``json_mode``, OpenAI requests use JSON mode so the reply is
+        always a parseable object.
+        """
+        temp = temperature if temperature is not None else settings.temperature
+        tokens = max_tokens if max_tokens is not None else settings.max_tokens
+
+        if self.provider == "openai":
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            kwargs = {"model": self.model, "messages": messages, "temperature": temp, "max_tokens": tokens}
+            if json_mode:
+                kwargs["response_format"] = {"type": "json_object"}
+            return kwargs
+
+        # Use the Messages API (modern Anthropic API)
+        kwargs = {
+            "model": self.model,
+            "max_tokens": tokens,
+            "temperature": temp,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt and cache_system_prompt:
+            kwargs["system"] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        elif system_prompt:
+            kwargs["system"] = system_prompt
+        return kwargs
+
+    def _response_text(self, response: Any) -> str:
+        """Extract the generated text from a provider response."""
+        if self.provider == "openai":
+            return response.choices[0].message.content
+
+        cached_tokens = getattr(response.usage, "cache_read_input_tokens", None)
+        if cached_tokens:
+            print(f"[LLMService] Prompt cache hit: {cached_tokens} input tokens read from cache")
+        return response.content[0].text
 
     def generate(
         self,
@@ -45,74 +248,129 @@ class LLMService:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        cache_system_prompt: bool = False,
+        json_mode: bool = False,
     ) -> str:
-        """Generate text using the LLM."""
-        temp = temperature if temperature is not None else settings.temperature
-        tokens = max_tokens if max_tokens is not None else settings.max_tokens
+        """Generate text using the LLM.
 
+        Set ``cache_system_prompt`` when the system prompt is a large static
+        prefix shared across calls and only ``prompt`` varies.
+        """
+        try:
+            kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, cache_system_prompt, json_mode)
+            for attempt in range(len(self.clients)):
+                index = self._next_key()
+                wait = self._cooldown_remaining(index)
+                if wait:
+                    time.sleep(wait)
+                try:
+                    response = self._create(self.clients[index], kwargs)
+                    break
+                except Exception as e:
+                    if not self._handle_rate_limit(index, e, attempt):
+                        raise
+            return self._response_text(response)
+
+        except Exception as e:
+            raise Exception(f"LLM generation failed: {str(e)}")
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache_system_prompt: bool = False,
+    ) -> Iterator[str]:
+        """Generate text using the LLM, yielding text deltas as they arrive."""
         try:
+            kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, cache_system_prompt)
+            client = self.clients[self._next_key()]
             if self.provider == "openai":
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temp,
-                    max_tokens=tokens,
-                )
-                return response.choices[0].message.content
-
-            elif self.provider == "anthropic":
-                # Use the Messages API (modern Anthropic API)
-                kwargs = {
-                    "model": self.model,
-                    "max_tokens": tokens,
-                    "temperature": temp,
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-                if system_prompt:
-                    kwargs["system"] = system_prompt
-
-                response = self.client.messages.create(**kwargs)
-                return response.content[0].text
+                for chunk in client.chat.completions.create(stream=True, **kwargs):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            else:
+                with client.messages.stream(**kwargs) as stream:
+                    yield from stream.text_stream
 
         except Exception as e:
             raise Exception(f"LLM generation failed: {str(e)}")
 
     def generate_structured(
-        self, prompt: str, system_prompt: Optional[str] = None, schema: Optional[Dict[str, Any]] = None
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        cache_system_prompt: bool = False,
     ) -> Dict[str, Any]:
         """Generate structured output (JSON)."""
-        import json
+        response = self.generate(
+            prompt=_structured_prompt(prompt, schema),
+            system_prompt=system_prompt,
+            temperature=0.3,
+            cache_system_prompt=cache_system_prompt,
+            json_mode=True,
+        )
 
-        structured_prompt = f"{prompt}\n\nRespond with valid JSON only."
-        if schema:
-            structured_prompt += f"\n\nExpected schema: {json.dumps(schema)}"
+        return _parse_json_response(response)
+
+    async def generate_structured_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        cache_system_prompt: bool = False,
+    ) -> Dict[str, Any]:
+        """Async version of generate_structured."""
+        response = await self.generate_async(
+            prompt=_structured_prompt(prompt, schema),
+            system_prompt=system_prompt,
+            temperature=0.3,
+            cache_system_prompt=cache_system_prompt,
+            json_mode=True,
+        )
 
-        response = self.generate(prompt=structured_prompt, system_prompt=system_prompt, temperature=0.3)
+        return _parse_json_response(response)
 
-        # Try to extract JSON from response
-        try:
-            # Find JSON in response (might be wrapped in markdown code blocks)
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            return json.loads(response.strip())
-        except json.JSONDecodeError:
-            # Fallback: try to find JSON in the response
-            import re
-
-            json_match = re.search(r"\{.*\}", response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            raise ValueError(f"Failed to parse JSON from response: {response}")
+    def _get_async_state(self):
+        """Return the async clients (one per key) and concurrency semaphore for the running loop.
+
+        Both are bound to an event loop, so they are recreated when the loop
+        changes. Clients left from a loop that is still running are closed on
+        that loop; code that runs a short-lived loop (process_rfp_sync, the
+        ingestion script) awaits aclose() before the loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            old_loop, old_clients = self._async_loop, self._async_clients
+            if old_clients and old_loop is not None and old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(_close_async_clients(old_clients), old_loop)
+            if self.provider == "openai":
+                import openai
+
+                self._async_clients = [
+                    openai.AsyncOpenAI(api_key=api_key, http_client=_pooled_http_client(openai, async_client=True))
+                    for api_key in self.api_keys
+                ]
+            else:
+                import anthropic
+
+                self._async_clients = [
+                    anthropic.AsyncAnthropic(api_key=api_key, http_client=_pooled_http_client(anthropic, async_client=True))
+                    for api_key in self.api_keys
+                ]
+            self._async_semaphore = asyncio.Semaphore(settings.llm_max_concurrency * len(self.api_keys))
+            self._async_loop = loop
+        return self._async_clients, self._async_semaphore
+
+    async def aclose(self):
+        """Close the async clients (and their connection pools) opened on the running loop."""
+        if self._async_loop is not asyncio.get_running_loop():
+            return
+        clients = self._async_clients
+        self._async_clients, self._async_semaphore, self._async_loop = [], None, None
+        await _close_async_clients(clients)
 
     async def generate_async(
         self,
@@ -120,7 +378,30 @@ class LLMService:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        cache_system_prompt: bool = False,
+        json_mode: bool = False,
     ) -> str:
-        """Async version of generate (currently just wraps sync version)."""
-        # For MVP, we'll use sync version. In production, use async clients
-        return self.generate(prompt, system_prompt, temperature, max_tokens)
+        """Generate text with the provider's async client.
+
+        At most ``settings.llm_max_concurrency`` requests per API key are in
+        flight at once.
+        """
+        clients, semaphore = self._get_async_state()
+        try:
+            kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, cache_system_prompt, json_mode)
+            async with semaphore:
+                for attempt in range(len(clients)):
+                    index = self._next_key()
+                    wait = self._cooldown_remaining(index)
+                    if wait:
+                        await asyncio.sleep(wait)
+                    try:
+                        response = await self._create(clients[index], kwargs)
+                        break
+                    except Exception as e:
+                        if not self._handle_rate_limit(index, e, attempt):
+                            raise
+            return self._response_text(response)
+
+        except Exception as e:
+            raise Exception(f"LLM generation failed: {str(e)}")
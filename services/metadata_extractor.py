@@ -1,10 +1,109 @@
 """Metadata extraction for RFP documents using LLM."""
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import heapq
 import re
+from itertools import islice
 from pathlib import Path
 from services.llm_service import LLMService
 
+# Dates: YYYY-MM-DD or Month DD, YYYY
+_DATE_PATTERNS = [
+    re.compile(r"\d{4}-\d{2}-\d{2}"),  # 2025-05-20
+    re.compile(r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}"),  # May 20, 2025
+]
+
+# Keywords for heuristic industry and category detection, in priority order
+_INDUSTRY_KEYWORDS = {
+    "semiconductor": "Semiconductor",
+    "healthcare": "Healthcare",
+    "finance": "Finance",
+    "technology": "Technology",
+    "manufacturing": "Manufacturing",
+    "retail": "Retail",
+}
+_CATEGORY_KEYWORDS = [
+    ("talent_intelligence", ("talent", "hiring")),
+    ("skills_taxonomy", ("skill", "taxonomy")),
+    ("pricing", ("price", "pricing", "cost")),
+    ("technical", ("technical", "architecture")),
+    ("legal", ("legal", "compliance")),
+]
+_ALL_KEYWORDS = list(_INDUSTRY_KEYWORDS) + [kw for _, kws in _CATEGORY_KEYWORDS for kw in kws]
+
+# Optional Aho-Corasick automaton: finds every keyword in one pass over the text
+try:
+    import ahocorasick
+except ImportError:
+    _KEYWORD_AUTOMATON = None
+else:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _ALL_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+
+def _find_keywords(text_lower: str) -> set:
+    """Return the heuristic keywords that occur (as substrings) in lowercased text."""
+    if _KEYWORD_AUTOMATON is not None:
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(text_lower)}
+    return {keyword for keyword in _ALL_KEYWORDS if keyword in text_lower}
+
+# Numbered questions (Q1, Q2, or 1., 2.). The bodies are written as
+# greedy runs that stop at the next marker, which match exactly what the lazy
+# forms `(.+?)(?=(?:Q\d+|Question \d+|^\d+\.)|$)` and `(\d+\.\s+.+?)(?=^\d+\.|\Z)`
+# would, without testing a lookahead at every character.
+_QUESTION_PATTERNS = [
+    # Question body: up to the end of the line or the next Q<n> / "Question <n>"
+    re.compile(
+        r"(?:Q\d+|Question \d+|^\d+\.)\s*:?\s*(.[^Q\n]*(?:Q(?!\d|uestion \d)[^Q\n]*)*)", re.MULTILINE | re.DOTALL
+    ),
+    # Numbered list item: whole lines up to the next line starting with "<n>."
+    re.compile(r"^(\d+\.\s+.[^\n]*(?:\n(?!\d+\.)[^\n]*)*\n?)", re.MULTILINE | re.DOTALL),
+]
+
+# Static instructions live in the system prompt so they form a cacheable
+# prefix; only the document excerpt changes between calls.
+CONTENT_METADATA_SYSTEM_PROMPT = """You are an expert at analyzing RFP (Request for Proposal) documents.
+Extract structured metadata from the provided document excerpt.
+
+Extract and return as JSON:
+{
+    "industry": "The client's industry (e.g., Semiconductor, Technology, Healthcare, Finance)",
+    "categories": ["List of RFP categories like technical, legal, pricing, case_study, skills_taxonomy, talent_intelligence"],
+    "key_requirements": ["List of 3-5 main requirements or needs mentioned"],
+    "geographic_focus": ["Countries or regions mentioned"],
+    "timeline_mentions": ["Any dates, deadlines, or timeline references"],
+    "company_context": "Brief 1-sentence description of the client company if mentioned"
+}
+
+Return ONLY valid JSON, no additional text."""
+
+METADATA_AND_QUESTIONS_SYSTEM_PROMPT = """You are an expert at analyzing RFP (Request for Proposal) documents.
+Extract structured metadata and ALL questions and requirements from the provided document.
+
+For questions:
+1. Extract explicit questions (sentences ending with ?)
+2. Extract implicit requirements (e.g., "Vendor must provide...", "Describe your approach to...")
+3. Rephrase implicit requirements as questions
+4. Keep questions clear and specific
+5. Preserve technical terminology
+
+Return as JSON:
+{
+    "metadata": {
+        "industry": "The client's industry (e.g., Semiconductor, Technology, Healthcare, Finance)",
+        "categories": ["List of RFP categories like technical, legal, pricing, case_study, skills_taxonomy, talent_intelligence"],
+        "key_requirements": ["List of 3-5 main requirements or needs mentioned"],
+        "geographic_focus": ["Countries or regions mentioned"],
+        "timeline_mentions": ["Any dates, deadlines, or timeline references"],
+        "company_context": "Brief 1-sentence description of the client company if mentioned"
+    },
+    "questions": ["First question?", "Second question?"]
+}
+
+Return ONLY valid JSON, no additional text."""
+
 
 class MetadataExtractor:
     """Extract rich metadata from RFP documents."""
@@ -47,84 +146,109 @@ class MetadataExtractor:
         if self.llm is None:
             return self._fallback_extraction(text)
 
+        try:
+            result = self.llm.generate_structured(
+                prompt=self._content_prompt(text, max_chars),
+                system_prompt=CONTENT_METADATA_SYSTEM_PROMPT,
+                schema=None,  # Let LLM generate structure
+                cache_system_prompt=True,
+            )
+
+            return result
+        except Exception as e:
+            print(f"LLM metadata extraction failed: {e}")
+            return self._fallback_extraction(text)
+
+    async def extract_from_content_async(self, text: str, max_chars: int = 3000) -> Dict[str, Any]:
+        """Async version of extract_from_content, for fanning out many documents."""
+        if self.llm is None:
+            return self._fallback_extraction(text)
+
+        try:
+            return await self.llm.generate_structured_async(
+                prompt=self._content_prompt(text, max_chars),
+                system_prompt=CONTENT_METADATA_SYSTEM_PROMPT,
+                schema=None,
+                cache_system_prompt=True,
+            )
+        except Exception as e:
+            print(f"LLM metadata extraction failed: {e}")
+            return self._fallback_extraction(text)
+
+    @staticmethod
+    def _content_prompt(text: str, max_chars: int) -> str:
+        """Build the content metadata prompt from a truncated excerpt."""
         # Truncate to avoid token limits
         excerpt = text[:max_chars]
 
-        system_prompt = """You are an expert at analyzing RFP (Request for Proposal) documents.
-Extract structured metadata from the provided document excerpt."""
+        return f"""Analyze this RFP document excerpt and extract the metadata described above:
 
-        prompt = f"""Analyze this RFP document excerpt and extract the following information:
+{excerpt}"""
 
-{excerpt}
+    def extract_metadata_and_questions(self, text: str, max_chars: int = 8000) -> Optional[Dict[str, Any]]:
+        """Extract content metadata and RFP questions with a single LLM call.
 
-Extract and return as JSON:
-{{
-    "industry": "The client's industry (e.g., Semiconductor, Technology, Healthcare, Finance)",
-    "categories": ["List of RFP categories like technical, legal, pricing, case_study, skills_taxonomy, talent_intelligence"],
-    "key_requirements": ["List of 3-5 main requirements or needs mentioned"],
-    "geographic_focus": ["Countries or regions mentioned"],
-    "timeline_mentions": ["Any dates, deadlines, or timeline references"],
-    "company_context": "Brief 1-sentence description of the client company if mentioned"
-}}
+        Returns:
+            Dict with "metadata" and "questions" keys, or None when the LLM is
+            unavailable or its response is unusable (callers then fall back to
+            the separate extraction paths).
+        """
+        if self.llm is None:
+            return None
 
-Return ONLY valid JSON, no additional text."""
+        excerpt = text[:max_chars]
+
+        prompt = f"""Analyze this RFP document and extract the metadata and questions described above:
+
+{excerpt}"""
 
         try:
             result = self.llm.generate_structured(
-                prompt=prompt, system_prompt=system_prompt, schema=None  # Let LLM generate structure
+                prompt=prompt,
+                system_prompt=METADATA_AND_QUESTIONS_SYSTEM_PROMPT,
+                schema=None,
+                cache_system_prompt=True,
             )
-
-            return result
         except Exception as e:
-            print(f"LLM metadata extraction failed: {e}")
-            return self._fallback_extraction(text)
+            print(f"Combined metadata/question extraction failed: {e}")
+            return None
+
+        metadata = result.get("metadata")
+        questions = result.get("questions")
+        if not isinstance(metadata, dict) or not isinstance(questions, list):
+            return None
+
+        questions = [q.strip() for q in questions if isinstance(q, str) and len(q.strip()) > 10]
+        return {"metadata": metadata, "questions": questions}
 
     def _fallback_extraction(self, text: str) -> Dict[str, Any]:
         """Fallback heuristic-based metadata extraction."""
         metadata = {}
 
-        # Industry keywords
-        industry_keywords = {
-            "semiconductor": "Semiconductor",
-            "healthcare": "Healthcare",
-            "finance": "Finance",
-            "technology": "Technology",
-            "manufacturing": "Manufacturing",
-            "retail": "Retail",
-        }
-
+        # One lowercase copy plus C-level substring checks is much faster here
+        # than case-insensitive regex scans, which lose the fast literal search
         text_lower = text.lower()
-        for keyword, industry in industry_keywords.items():
-            if keyword in text_lower:
+        found = _find_keywords(text_lower)
+
+        # Industry: first keyword (in priority order) present in the text
+        for keyword, industry in _INDUSTRY_KEYWORDS.items():
+            if keyword in found:
                 metadata["industry"] = industry
                 break
 
-        # Extract dates (YYYY-MM-DD or Month DD, YYYY)
-        date_patterns = [
-            r"\d{4}-\d{2}-\d{2}",  # 2025-05-20
-            r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}",  # May 20, 2025
-        ]
-
+        # Extract dates (YYYY-MM-DD or Month DD, YYYY). Only the first 5 are
+        # kept, so each scan stops as soon as enough dates have been found.
         dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            dates.extend(matches)
+        for pattern in _DATE_PATTERNS:
+            dates.extend(match.group(0) for match in islice(pattern.finditer(text), 5 - len(dates)))
+            if len(dates) >= 5:
+                break
 
         if dates:
-            metadata["timeline_mentions"] = dates[:5]  # First 5 dates
+            metadata["timeline_mentions"] = dates  # First 5 dates
 
         # Category detection
-        categories = []
-        if "talent" in text_lower or "hiring" in text_lower:
-            categories.append("talent_intelligence")
-        if "skill" in text_lower or "taxonomy" in text_lower:
-            categories.append("skills_taxonomy")
-        if "price" in text_lower or "pricing" in text_lower or "cost" in text_lower:
-            categories.append("pricing")
-        if "technical" in text_lower or "architecture" in text_lower:
-            categories.append("technical")
-        if "legal" in text_lower or "compliance" in text_lower:
-            categories.append("legal")
+        categories = [category for category, keywords in _CATEGORY_KEYWORDS if found.intersection(keywords)]
 
         metadata["categories"] = categories if categories else ["general"]
 
@@ -135,14 +259,8 @@ Return ONLY valid JSON, no additional text."""
         qa_pairs = []
 
         # Pattern: Numbered questions (Q1, Q2, or 1., 2.)
-        # Looking for questions
-        question_patterns = [
-            r"(?:Q\d+|Question \d+|^\d+\.)\s*:?\s*(.+?)(?=(?:Q\d+|Question \d+|^\d+\.)|$)",
-            r"^(\d+\.\s+.+?)(?=^\d+\.|\Z)",  # Numbered list
-        ]
-
-        for pattern in question_patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        for pattern in _QUESTION_PATTERNS:
+            matches = pattern.finditer(text)
             for i, match in enumerate(matches, 1):
                 question_text = match.group(1).strip()
                 if len(question_text) > 20:  # Meaningful question
@@ -153,15 +271,21 @@ Return ONLY valid JSON, no additional text."""
 
         return qa_pairs
 
-    def extract_complete_metadata(self, file_path: str, text: str) -> Dict[str, Any]:
+    def extract_complete_metadata(
+        self, file_path: str, text: str, content_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Extract complete metadata combining path, content, and LLM analysis.
+
+        Pass ``content_metadata`` to skip content extraction, e.g. when the LLM
+        analysis is done separately for many documents at once.
         """
         # Step 1: Extract from path
         metadata = self.extract_from_path(file_path)
 
         # Step 2: Extract from content
-        content_metadata = self.extract_from_content(text)
+        if content_metadata is None:
+            content_metadata = self.extract_from_content(text)
         metadata.update(content_metadata)
 
         # Step 3: Extract Q&A pairs
@@ -211,12 +335,14 @@ class ClientMatcher:
         """
         Find similar clients based on metadata.
         """
+        target_client = target_metadata.get("client_name")
         target_industry = target_metadata.get("industry", "")
         target_categories = set(target_metadata.get("categories", []))
+        target_geo = set(target_metadata.get("geographic_focus", []))
 
         similar = []
         for meta in all_metadata:
-            if meta.get("client_name") == target_metadata.get("client_name"):
+            if meta.get("client_name") == target_client:
                 continue  # Skip self
 
             similarity = 0.0
@@ -226,21 +352,21 @@ class ClientMatcher:
                 similarity += 0.4
 
             # Category overlap (40% weight)
-            other_categories = set(meta.get("categories", []))
-            if target_categories and other_categories:
-                overlap = len(target_categories & other_categories) / len(target_categories | other_categories)
-                similarity += 0.4 * overlap
+            if target_categories:
+                other_categories = set(meta.get("categories", []))
+                if other_categories:
+                    overlap = len(target_categories & other_categories) / len(target_categories | other_categories)
+                    similarity += 0.4 * overlap
 
             # Geographic overlap (20% weight)
-            target_geo = set(target_metadata.get("geographic_focus", []))
-            other_geo = set(meta.get("geographic_focus", []))
-            if target_geo and other_geo:
-                geo_overlap = len(target_geo & other_geo) / len(target_geo | other_geo)
-                similarity += 0.2 * geo_overlap
+            if target_geo:
+                other_geo = set(meta.get("geographic_focus", []))
+                if other_geo:
+                    geo_overlap = len(target_geo & other_geo) / len(target_geo | other_geo)
+                    similarity += 0.2 * geo_overlap
 
             if similarity > 0.3:  # Threshold
                 similar.append((meta.get("client_name", "Unknown"), similarity))
 
-        # Sort by similarity
-        similar.sort(key=lambda x: x[1], reverse=True)
-        return similar[:top_k]
+        # Top k by similarity (same order as a stable descending sort)
+        return heapq.nlargest(top_k, similar, key=lambda x: x[1])
@@ -1,30 +1,77 @@
-"""File-based caching service for RFP question extraction.
+"""SQLite-backed caching service for RFP question extraction.
 
-This service provides a simple file-based cache to avoid redundant LLM calls
+This service provides a simple persistent cache to avoid redundant LLM calls
 for the same RFP documents.
 """
-import json
 import hashlib
-import os
+import pickle
+import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from config import settings
+
 
 class QuestionCache:
-    """File-based cache for extracted questions.
+    """Persistent cache for extracted questions.
 
-    Uses content hashing to determine cache keys, storing results as JSON files.
+    Uses content hashing to determine cache keys. All entries live in a single
+    SQLite database (WAL mode) under ``cache_dir``, so a lookup is one indexed
+    query instead of a file open and JSON parse. Entries expire after a TTL,
+    and the least recently used ones are evicted once the cache is full.
     """
 
-    def __init__(self, cache_dir: str = "./data/cache/questions"):
+    # Eviction is checked once per this many writes
+    EVICT_EVERY = 100
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/cache/questions",
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
         """Initialize the question cache.
 
         Args:
-            cache_dir: Directory to store cache files
+            cache_dir: Directory to store the cache database
+            ttl_seconds: Entry lifetime (defaults to settings.question_cache_ttl_seconds)
+            max_entries: Entry cap (defaults to settings.question_cache_max_entries)
         """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.question_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.question_cache_max_entries
+        self._writes_since_evict = 0
+        self._last_key = (None, None)  # (document text, key) of the latest lookup
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.db"
+
+        # One connection shared across request threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            "key TEXT PRIMARY KEY, questions BLOB NOT NULL, cached_at TEXT, document_length INTEGER, "
+            "last_access INTEGER, expires_at INTEGER)"
+        )
+        # Databases created before expiry was tracked lack the newer columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(question_cache)")}
+        for column in ("last_access", "expires_at"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE question_cache ADD COLUMN {column} INTEGER")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_question_cache_last_access ON question_cache (last_access)")
 
     def _generate_cache_key(self, document_text: str) -> str:
         """Generate a cache key from document text.
@@ -35,20 +82,47 @@ class QuestionCache:
         Returns:
             Hash string to use as cache key
         """
-        # Create hash of the document text
-        text_hash = hashlib.sha256(document_text.encode('utf-8')).hexdigest()
-        return text_hash[:16]  # Use first 16 chars for readability
-
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get the file path for a cache key.
+        # A lookup is usually followed by set() for the same string object, so
+        # reuse the last key instead of re-encoding and hashing the whole
+        # document
+        last_text, last_key = self._last_key
+        if document_text is last_text:
+            return last_key
+
+        # Create hash of the document text. The key only needs to be unique
+        # locally, so the fast non-cryptographic xxh3 is used when installed.
+        data = document_text.encode('utf-8')
+        if xxhash is not None:
+            text_hash = xxhash.xxh3_128_hexdigest(data)
+        else:
+            text_hash = hashlib.sha256(data).hexdigest()
+        cache_key = text_hash[:16]  # Use first 16 chars for readability
+        self._last_key = (document_text, cache_key)
+        return cache_key
+
+    def _load(self, cache_key: str) -> Optional[tuple]:
+        """Load the questions and timestamp stored under a cache key.
+
+        Expired entries are deleted; live ones have their access time updated.
 
         Args:
             cache_key: Cache key identifier
 
         Returns:
-            Path to cache file
+            (questions, cached_at) tuple, or None if the key is not cached
         """
-        return self.cache_dir / f"{cache_key}.json"
+        now = int(time.time())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT questions, cached_at, expires_at FROM question_cache WHERE key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] is None or row[2] <= now:
+                self._conn.execute("DELETE FROM question_cache WHERE key = ?", (cache_key,))
+                return None
+            self._conn.execute("UPDATE question_cache SET last_access = ? WHERE key = ?", (now, cache_key))
+        return orjson.loads(row[0]), row[1]
 
     def get(self, document_text: str) -> Optional[List[str]]:
         """Retrieve cached questions for a document.
@@ -60,50 +134,62 @@ class QuestionCache:
             List of questions if cached, None otherwise
         """
         cache_key = self._generate_cache_key(document_text)
-        cache_path = self._get_cache_path(cache_key)
-
-        if not cache_path.exists():
+        questions = self._get_exact(cache_key)
+        if questions is None:
             print(f"[Cache] MISS - No cached questions for key {cache_key}")
-            return None
+        return questions
 
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+    def lookup(self, document_text: str) -> Tuple[Optional[List[str]], Optional[np.ndarray]]:
+        """Retrieve cached questions, plus any document embedding computed on the way.
+
+        Callers that go on to extract the questions pass the embedding back to
+        set(), so it is not computed twice. This cache never embeds documents.
 
-            questions = cache_data.get('questions', [])
-            cached_at = cache_data.get('cached_at', 'unknown')
+        Args:
+            document_text: Full text of the RFP document
 
-            print(f"[Cache] HIT - Found {len(questions)} cached questions (key: {cache_key}, cached: {cached_at})")
-            return questions
+        Returns:
+            (questions or None, embedding or None) tuple
+        """
+        return self.get(document_text), None
 
+    def _get_exact(self, cache_key: str) -> Optional[List[str]]:
+        """Read the questions stored under a cache key, logging hits.
+
+        Args:
+            cache_key: Cache key identifier
+
+        Returns:
+            List of questions if cached, None otherwise
+        """
+        try:
+            entry = self._load(cache_key)
         except Exception as e:
             print(f"[Cache] ERROR - Failed to read cache: {e}")
             return None
 
-    def set(self, document_text: str, questions: List[str]) -> bool:
+        if entry is None:
+            return None
+
+        questions, cached_at = entry
+        print(f"[Cache] HIT - Found {len(questions)} cached questions (key: {cache_key}, cached: {cached_at or 'unknown'})")
+        return questions
+
+    def set(self, document_text: str, questions: List[str], embedding: Optional[np.ndarray] = None) -> bool:
         """Store questions in cache for a document.
 
         Args:
             document_text: Full text of the RFP document
             questions: Extracted questions to cache
+            embedding: Document embedding returned by lookup() (unused here)
 
         Returns:
             True if caching succeeded, False otherwise
         """
         cache_key = self._generate_cache_key(document_text)
-        cache_path = self._get_cache_path(cache_key)
 
         try:
-            cache_data = {
-                'questions': questions,
-                'cached_at': datetime.utcnow().isoformat(),
-                'question_count': len(questions),
-                'document_length': len(document_text)
-            }
-
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-
+            self._store(cache_key, questions, len(document_text))
             print(f"[Cache] SAVED - Cached {len(questions)} questions (key: {cache_key})")
             return True
 
@@ -111,18 +197,76 @@ class QuestionCache:
             print(f"[Cache] ERROR - Failed to write cache: {e}")
             return False
 
+    def _store(self, cache_key: str, value: Any, document_length: int):
+        """Write a JSON-serializable value under a cache key, evicting when due.
+
+        Args:
+            cache_key: Cache key identifier
+            value: Value to cache (stored as JSON)
+            document_length: Length of the text the key was derived from
+        """
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_cache "
+                "(key, questions, cached_at, document_length, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    orjson.dumps(value),
+                    datetime.utcnow().isoformat(),
+                    document_length,
+                    now,
+                    now + self.ttl_seconds,
+                ),
+            )
+            self._writes_since_evict += 1
+            evict_due = self._writes_since_evict >= self.EVICT_EVERY
+
+        if evict_due:
+            self.evict()
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Delete expired entries, then the least recently used beyond the cap.
+
+        Args:
+            max_entries: Entry cap (defaults to self.max_entries)
+
+        Returns:
+            Number of cache entries deleted
+        """
+        cap = max_entries if max_entries is not None else self.max_entries
+        try:
+            with self._lock:
+                self._writes_since_evict = 0
+                removed = self._conn.execute(
+                    "DELETE FROM question_cache WHERE expires_at IS NULL OR expires_at <= ?", (int(time.time()),)
+                ).rowcount
+                (count,) = self._conn.execute("SELECT count(*) FROM question_cache").fetchone()
+                if count > cap:
+                    removed += self._conn.execute(
+                        "DELETE FROM question_cache WHERE key IN "
+                        "(SELECT key FROM question_cache ORDER BY last_access LIMIT ?)",
+                        (count - cap,),
+                    ).rowcount
+            if removed:
+                print(f"[Cache] EVICTED - Removed {removed} cache entries")
+            return removed
+        except Exception as e:
+            print(f"[Cache] ERROR - Failed to evict cache entries: {e}")
+            return 0
+
     def clear(self) -> int:
         """Clear all cached questions.
 
         Returns:
-            Number of cache files deleted
+            Number of cache entries deleted
         """
         count = 0
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                cache_file.unlink()
-                count += 1
-            print(f"[Cache] CLEARED - Removed {count} cache files")
+            with self._lock:
+                count = self._conn.execute("DELETE FROM question_cache").rowcount
+            print(f"[Cache] CLEARED - Removed {count} cache entries")
             return count
         except Exception as e:
             print(f"[Cache] ERROR - Failed to clear cache: {e}")
@@ -135,11 +279,13 @@ class QuestionCache:
             Dictionary with cache statistics
         """
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_size = sum(f.stat().st_size for f in cache_files)
+            with self._lock:
+                count, total_size = self._conn.execute(
+                    "SELECT count(*), coalesce(sum(length(questions)), 0) FROM question_cache"
+                ).fetchone()
 
             return {
-                'cache_count': len(cache_files),
+                'cache_count': count,
                 'total_size_bytes': total_size,
                 'cache_dir': str(self.cache_dir)
             }
@@ -150,3 +296,232 @@ class QuestionCache:
                 'total_size_bytes': 0,
                 'cache_dir': str(self.cache_dir)
             }
+
+
+class SemanticQuestionCache(QuestionCache):
+    """Question cache that also matches near-identical documents.
+
+    Exact content hashes are checked first. On a miss, the document is
+    embedded and compared with previously cached documents, so a re-uploaded
+    RFP with whitespace or header changes reuses the earlier extraction.
+    """
+
+    # Long documents are embedded in pieces and mean-pooled, since the
+    # encoder only reads the first few hundred tokens of its input
+    CHUNK_CHARS = 2000
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/cache/questions",
+        encoder=None,
+        similarity_threshold: float = 0.95,
+        max_length_ratio: float = 1.1,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """Initialize the semantic question cache.
+
+        Args:
+            cache_dir: Directory to store the cache database and index
+            encoder: SentenceTransformer used for document embeddings
+                (defaults to settings.embedding_model)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_length_ratio: Maximum length ratio between matched documents
+            ttl_seconds: Entry lifetime (defaults to settings.question_cache_ttl_seconds)
+            max_entries: Entry cap (defaults to settings.question_cache_max_entries)
+        """
+        super().__init__(cache_dir, ttl_seconds, max_entries)
+        if encoder is None:
+            from services.embedding_service import load_sentence_transformer
+
+            encoder = load_sentence_transformer(settings.embedding_model)
+        self.encoder = encoder
+        self.similarity_threshold = similarity_threshold
+        self.max_length_ratio = max_length_ratio
+        self._index_path = self.cache_dir / "semantic.index"
+        self._entries_path = self.cache_dir / "semantic_entries.pkl"
+        # Guards self.index, self.entries and their files; separate from the
+        # SQLite lock, which is only ever taken inside it
+        self._index_lock = threading.RLock()
+        self._load_index()
+
+    def _load_index(self):
+        """Load the embedding index, or start an empty one."""
+        import faiss
+
+        if self._index_path.exists() and self._entries_path.exists():
+            try:
+                self.index = faiss.read_index(str(self._index_path))
+                with open(self._entries_path, 'rb') as f:
+                    self.entries = pickle.load(f)
+                return
+            except Exception as e:
+                print(f"[Cache] ERROR - Failed to load semantic index: {e}")
+
+        self.index = faiss.IndexFlatIP(self.encoder.get_sentence_embedding_dimension())
+        self.entries = []  # (cache_key, document_length) per index row
+
+    def _embed(self, document_text: str) -> np.ndarray:
+        """Embed a whole document as a normalized mean of chunk embeddings."""
+        chunks = [
+            document_text[i:i + self.CHUNK_CHARS] for i in range(0, len(document_text), self.CHUNK_CHARS)
+        ] or [""]
+        embeddings = self.encoder.encode(chunks, convert_to_numpy=True).astype('float32')
+        embedding = embeddings.mean(axis=0, keepdims=True)
+        embedding /= max(float(np.linalg.norm(embedding)), 1e-12)
+        return embedding
+
+    def get(self, document_text: str) -> Optional[List[str]]:
+        """Retrieve cached questions for an identical or near-identical document.
+
+        Args:
+            document_text: Full text of the RFP document
+
+        Returns:
+            List of questions if cached, None otherwise
+        """
+        return self.lookup(document_text)[0]
+
+    def lookup(self, document_text: str) -> Tuple[Optional[List[str]], Optional[np.ndarray]]:
+        """Retrieve cached questions for an identical or near-identical document.
+
+        The exact key is read once; only on a miss is the document embedded
+        and matched against the index. That embedding is returned so a
+        following set() can index it without encoding the document again.
+
+        Args:
+            document_text: Full text of the RFP document
+
+        Returns:
+            (questions or None, embedding or None) tuple
+        """
+        cache_key = self._generate_cache_key(document_text)
+        questions = self._get_exact(cache_key)
+        if questions is not None:
+            return questions, None
+        with self._index_lock:
+            indexed = self.index.ntotal
+        if indexed == 0:
+            print(f"[Cache] MISS - No cached questions for key {cache_key}")
+            return None, None
+
+        embedding = self._embed(document_text)
+
+        candidates = []
+        with self._index_lock:
+            if self.index.ntotal:
+                scores, rows = self.index.search(embedding, min(5, self.index.ntotal))
+                candidates = [
+                    (score, *self.entries[row]) for score, row in zip(scores[0], rows[0]) if row >= 0
+                ]
+
+        for score, match_key, match_length in candidates:
+            if score < self.similarity_threshold:
+                break
+            ratio = max(len(document_text), match_length) / max(min(len(document_text), match_length), 1)
+            if ratio > self.max_length_ratio:
+                continue
+
+            try:
+                entry = self._load(match_key)
+            except Exception:
+                continue
+            if entry is None:
+                continue
+            questions = entry[0]
+
+            print(f"[Cache] SEMANTIC HIT - {len(questions)} questions from key {match_key} (similarity {score:.3f})")
+            return questions, embedding
+
+        print(f"[Cache] MISS - No cached questions for key {cache_key}")
+        return None, embedding
+
+    def set(self, document_text: str, questions: List[str], embedding: Optional[np.ndarray] = None) -> bool:
+        """Store questions and index the document embedding.
+
+        Args:
+            document_text: Full text of the RFP document
+            questions: Extracted questions to cache
+            embedding: Document embedding returned by lookup(); computed here
+                when not given
+
+        Returns:
+            True if caching succeeded, False otherwise
+        """
+        if not super().set(document_text, questions):
+            return False
+
+        cache_key = self._generate_cache_key(document_text)
+        try:
+            if embedding is None:
+                embedding = self._embed(document_text)
+            with self._index_lock:
+                if any(key == cache_key for key, _ in self.entries):
+                    return True
+                self.index.add(embedding)
+                self.entries.append((cache_key, len(document_text)))
+                self._save_index()
+            return True
+        except Exception as e:
+            print(f"[Cache] ERROR - Failed to index document embedding: {e}")
+            return False
+
+    def _save_index(self):
+        """Write the embedding index and its entries to disk."""
+        import faiss
+
+        with self._index_lock:
+            faiss.write_index(self.index, str(self._index_path))
+            with open(self._entries_path, 'wb') as f:
+                pickle.dump(self.entries, f)
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Delete expired and least recently used entries, and their embeddings.
+
+        Args:
+            max_entries: Entry cap (defaults to self.max_entries)
+
+        Returns:
+            Number of cache entries deleted
+        """
+        removed = super().evict(max_entries)
+        self._prune_index()
+        return removed
+
+    def _prune_index(self):
+        """Rebuild the embedding index without rows whose entries are gone.
+
+        Covers keys removed by eviction and expired keys deleted on lookup.
+        """
+        try:
+            import faiss
+
+            with self._index_lock:
+                with self._lock:
+                    live_keys = {row[0] for row in self._conn.execute("SELECT key FROM question_cache")}
+                keep = [row for row, (key, _) in enumerate(self.entries) if key in live_keys]
+                if len(keep) == len(self.entries):
+                    return
+
+                index = faiss.IndexFlatIP(self.index.d)
+                if keep:
+                    index.add(self.index.reconstruct_n(0, self.index.ntotal)[keep])
+                self.index = index
+                self.entries = [self.entries[row] for row in keep]
+                self._save_index()
+        except Exception as e:
+            print(f"[Cache] ERROR - Failed to prune semantic index: {e}")
+
+    def clear(self) -> int:
+        """Clear all cached questions and the embedding index.
+
+        Returns:
+            Number of cache entries deleted
+        """
+        count = super().clear()
+        with self._index_lock:
+            for path in (self._index_path, self._entries_path):
+                if path.exists():
+                    path.unlink()
+            self._load_index()
+        return count
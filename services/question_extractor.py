@@ -6,10 +6,61 @@ This service follows SOLID principles:
 - Open/Closed: Extensible for different extraction strategies
 """
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+import numpy as np
+
 from services.llm_service import LLMService
 from services.question_cache import QuestionCache
 
+# Question numbering ("1." / "1)") and sentence boundaries
+_NUMBER_PREFIX = re.compile(r'^\d+[\.\)]\s*')
+_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+# Phrases that mark an implicit requirement, matched in one case-insensitive
+# pass instead of lowercasing each sentence and testing every phrase
+_REQUIREMENT_PHRASES = re.compile(
+    '|'.join(re.escape(phrase) for phrase in [
+        'please describe',
+        'please provide',
+        'must provide',
+        'should provide',
+        'vendor must',
+        'vendor should',
+        'explain your',
+        'describe your',
+        'what is your',
+        'how do you',
+        'provide details'
+    ]),
+    re.IGNORECASE,
+)
+
+# Common section header patterns
+_SECTION_PATTERNS = [
+    re.compile(r'^[A-Z][A-Z\s]+$'),  # ALL CAPS
+    re.compile(r'^\d+\.\s+[A-Z]'),  # 1. Section Name
+    re.compile(r'^Section \d+'),  # Section 1
+]
+
+# Static extraction rules, sent as a cacheable system prompt; only the RFP
+# text in the user message changes between calls.
+QUESTION_EXTRACTION_SYSTEM_PROMPT = """You are an RFP analysis expert. Extract ALL questions and requirements from the RFP document you are given.
+
+Rules:
+1. Extract explicit questions (sentences ending with ?)
+2. Extract implicit requirements (e.g., "Vendor must provide...", "Describe your approach to...")
+3. Rephrase implicit requirements as questions
+4. Keep questions clear and specific
+5. Preserve technical terminology
+6. Group related sub-questions together if needed
+7. Number each question
+
+Return ONLY a numbered list of questions, one per line. Format:
+1. First question here?
+2. Second question here?
+..."""
+
 
 class QuestionExtractionStrategy:
     """Base strategy for question extraction (Strategy Pattern)."""
@@ -41,66 +92,98 @@ class LLMQuestionExtractor(QuestionExtractionStrategy):
         Returns:
             List of questions extracted from the RFP
         """
+        return list(self.extract_iter(document_text))
+
+    def extract_iter(self, document_text: str) -> Iterator[str]:
+        """Yield questions as the LLM streams its numbered list.
+
+        Each question is yielded as soon as its line is complete, so callers
+        can start on the first questions while generation continues. The
+        cache is written once the stream has finished.
+
+        Args:
+            document_text: Full text of the RFP document
+
+        Yields:
+            Questions extracted from the RFP, in order
+        """
         # Check cache first
-        cached_questions = self.cache.get(document_text)
+        cached_questions, embedding = self.cache.lookup(document_text)
         if cached_questions is not None:
-            return cached_questions
+            yield from cached_questions
+            return
 
-        # Truncate if too long (keep first 8000 chars)
-        truncated_text = document_text[:8000] if len(document_text) > 8000 else document_text
+        yield from self.extract_uncached_iter(document_text, embedding)
 
-        prompt = f"""You are an RFP analysis expert. Extract ALL questions and requirements from this RFP document.
+    def extract_uncached_iter(self, document_text: str, embedding: Optional[np.ndarray] = None) -> Iterator[str]:
+        """Yield questions from the LLM without checking the cache first.
 
-Rules:
-1. Extract explicit questions (sentences ending with ?)
-2. Extract implicit requirements (e.g., "Vendor must provide...", "Describe your approach to...")
-3. Rephrase implicit requirements as questions
-4. Keep questions clear and specific
-5. Preserve technical terminology
-6. Group related sub-questions together if needed
-7. Number each question
+        For callers that have already looked the document up; the result is
+        still cached.
 
-RFP Document:
-{truncated_text}
+        Args:
+            document_text: Full text of the RFP document
+            embedding: Document embedding returned by the cache lookup, reused
+                when caching the result
 
-Return ONLY a numbered list of questions, one per line. Format:
-1. First question here?
-2. Second question here?
-...
+        Yields:
+            Questions extracted from the RFP, in order
+        """
+        # Truncate if too long (keep first 8000 chars)
+        truncated_text = document_text[:8000] if len(document_text) > 8000 else document_text
+
+        prompt = f"""RFP Document:
+{truncated_text}
 
 Questions:"""
 
+        questions = []
         try:
-            # Generate questions using LLM
-            response = self.llm.generate(
+            # Stream questions from the LLM, parsing each line as it completes
+            stream = self.llm.generate_stream(
                 prompt=prompt,
+                system_prompt=QUESTION_EXTRACTION_SYSTEM_PROMPT,
                 max_tokens=2000,
                 temperature=0.3,  # Lower temperature for more consistent extraction
+                cache_system_prompt=True,
             )
-
-            # Parse the response
-            questions = self._parse_questions(response)
-
-            # If no questions found, try fallback
-            if not questions:
-                questions = self._fallback_extraction(document_text)
-
-            # Cache the extracted questions
-            if questions:
-                self.cache.set(document_text, questions)
-
-            return questions
+            for line in self._iter_lines(stream):
+                question = self._parse_question_line(line)
+                if question:
+                    questions.append(question)
+                    yield question
 
         except Exception as e:
             print(f"Error extracting questions with LLM: {e}")
-            # Fallback to simple extraction
-            fallback_questions = self._fallback_extraction(document_text)
-
-            # Cache fallback questions too
-            if fallback_questions:
-                self.cache.set(document_text, fallback_questions)
-
-            return fallback_questions
+            # Fallback to simple extraction, skipping anything already yielded
+            streamed = set(questions)
+            fallback_questions = [q for q in self._fallback_extraction(document_text) if q not in streamed]
+            yield from fallback_questions
+
+            # Cache fallback questions too (a partial stream is not cached)
+            if fallback_questions and not questions:
+                self.cache.set(document_text, fallback_questions, embedding)
+            return
+
+        # If no questions found, try fallback
+        if not questions:
+            questions = self._fallback_extraction(document_text)
+            yield from questions
+
+        # Cache the extracted questions
+        if questions:
+            self.cache.set(document_text, questions, embedding)
+
+    @staticmethod
+    def _iter_lines(chunks: Iterator[str]) -> Iterator[str]:
+        """Reassemble streamed text deltas into complete lines."""
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split('\n')
+            yield from lines
+        if buffer:
+            yield buffer
 
     def _parse_questions(self, llm_response: str) -> List[str]:
         """Parse questions from LLM response.
@@ -112,25 +195,39 @@ Questions:"""
             List of cleaned questions
         """
         questions = []
-        lines = llm_response.split('\n')
+        for line in llm_response.split('\n'):
+            question = self._parse_question_line(line)
+            if question:
+                questions.append(question)
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        return questions
 
-            # Remove numbering (1. 2. etc.) and clean up
-            cleaned = re.sub(r'^\d+[\.\)]\s*', '', line)
-            cleaned = cleaned.strip()
+    @staticmethod
+    def _parse_question_line(line: str) -> Optional[str]:
+        """Clean one line of the LLM's numbered list.
 
-            # Only add if it looks like a question
-            if cleaned and len(cleaned) > 10:
-                # Ensure it ends with a question mark if it's actually a question
-                if not cleaned.endswith('?') and not cleaned.endswith('.'):
-                    cleaned += '?'
-                questions.append(cleaned)
+        Args:
+            line: A single response line
 
-        return questions
+        Returns:
+            The question, or None if the line is not one
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        # Remove numbering (1. 2. etc.) and clean up
+        cleaned = _NUMBER_PREFIX.sub('', line)
+        cleaned = cleaned.strip()
+
+        # Only add if it looks like a question
+        if cleaned and len(cleaned) > 10:
+            # Ensure it ends with a question mark if it's actually a question
+            if not cleaned.endswith('?') and not cleaned.endswith('.'):
+                cleaned += '?'
+            return cleaned
+
+        return None
 
     def _fallback_extraction(self, document_text: str) -> List[str]:
         """Fallback method using pattern matching.
@@ -144,7 +241,7 @@ Questions:"""
         questions = []
 
         # Split into sentences
-        sentences = re.split(r'[.!?]+', document_text)
+        sentences = _SENTENCE_SPLIT.split(document_text)
 
         for sentence in sentences:
             sentence = sentence.strip()
@@ -154,19 +251,7 @@ Questions:"""
                 questions.append(sentence if sentence.endswith('?') else sentence + '?')
 
             # Look for requirement patterns
-            elif any(pattern in sentence.lower() for pattern in [
-                'please describe',
-                'please provide',
-                'must provide',
-                'should provide',
-                'vendor must',
-                'vendor should',
-                'explain your',
-                'describe your',
-                'what is your',
-                'how do you',
-                'provide details'
-            ]):
+            elif _REQUIREMENT_PHRASES.search(sentence):
                 # Convert to question format
                 if not sentence.endswith('?'):
                     sentence += '?'
@@ -206,7 +291,46 @@ class QuestionExtractorService:
                 - sections: Detected section names (if any)
         """
         questions = self.strategy.extract(document_text)
+        return self._build_analysis(document_text, questions)
 
+    def extract_questions_with_metadata(self, document_text: str, metadata_extractor) -> Dict[str, Any]:
+        """Extract questions and content metadata in one LLM round trip.
+
+        Uses MetadataExtractor.extract_metadata_and_questions when the
+        questions are not cached yet, and adds its result under "metadata".
+        Cached documents are returned from the cache, and unusable combined
+        responses fall back to the plain LLM extraction, so no metadata is
+        returned for them. The cache is consulted once either way.
+
+        Args:
+            document_text: Full text of the RFP document
+            metadata_extractor: MetadataExtractor sharing the same LLM service
+
+        Returns:
+            Same dictionary as extract_questions, plus "metadata" when available
+        """
+        cache = getattr(self.strategy, "cache", None)
+        if cache is not None:
+            # One lookup serves both paths below; its embedding (semantic
+            # cache) is reused when the result is cached
+            cached_questions, embedding = cache.lookup(document_text)
+            if cached_questions is not None:
+                return self._build_analysis(document_text, cached_questions)
+
+            combined = metadata_extractor.extract_metadata_and_questions(document_text)
+            if combined and combined["questions"]:
+                cache.set(document_text, combined["questions"], embedding)
+                analysis = self._build_analysis(document_text, combined["questions"])
+                analysis["metadata"] = combined["metadata"]
+                return analysis
+
+            questions = list(self.strategy.extract_uncached_iter(document_text, embedding))
+            return self._build_analysis(document_text, questions)
+
+        return self.extract_questions(document_text)
+
+    def _build_analysis(self, document_text: str, questions: List[str]) -> Dict[str, Any]:
+        """Assemble the analysis dictionary for extracted questions."""
         # Extract section names (simple heuristic)
         sections = self._extract_sections(document_text)
 
@@ -228,20 +352,13 @@ class QuestionExtractorService:
         sections = []
         lines = document_text.split('\n')
 
-        # Look for common section patterns
-        section_patterns = [
-            r'^[A-Z][A-Z\s]+$',  # ALL CAPS
-            r'^\d+\.\s+[A-Z]',  # 1. Section Name
-            r'^Section \d+',  # Section 1
-        ]
-
         for line in lines:
             line = line.strip()
             if not line or len(line) > 100:  # Skip empty or very long lines
                 continue
 
-            for pattern in section_patterns:
-                if re.match(pattern, line):
+            for pattern in _SECTION_PATTERNS:
+                if pattern.match(line):
                     sections.append(line)
                     break
 
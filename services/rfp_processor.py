@@ -9,22 +9,30 @@ State Machine:
     created → analyzing → routing → generating → reviewing → formatting → ready
 """
 import asyncio
+import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+import numpy as np
+
 from services.llm_service import LLMService
 from services.vector_store import VectorStore
-from services.question_extractor import QuestionExtractorService
+from services.question_extractor import QuestionExtractorService, LLMQuestionExtractor
+from services.question_cache import SemanticQuestionCache
+from services.answer_cache import AnswerCache
+from services.metadata_extractor import MetadataExtractor
 from agents.qa_agent import QAAgent
 from agents.formatter import FormatterAgent
 from models.database import (
-    update_workflow_state,
-    update_workflow_analysis,
-    update_workflow_responses,
-    update_workflow_review,
-    update_workflow_final,
-    get_workflow,
-    save_document
+    aupdate_workflow_state,
+    aupdate_workflow_analysis,
+    aupdate_workflow_responses,
+    aappend_workflow_responses,
+    aupdate_workflow_review,
+    aupdate_workflow_final,
+    aget_workflow,
+    asave_document,
+    get_workflow
 )
 from config import settings
 import os
@@ -37,6 +45,11 @@ class RFPProcessorService:
     4 distinct steps, updating the database at each step for frontend polling.
     """
 
+    # Progressive answer snapshots are written every N answers, or sooner if
+    # this many seconds passed since the last write
+    RESPONSE_FLUSH_EVERY = 5
+    RESPONSE_FLUSH_INTERVAL = 1.0
+
     def __init__(self, llm_service: LLMService, vector_store: VectorStore):
         """Initialize the RFP processor.
 
@@ -46,8 +59,16 @@ class RFPProcessorService:
         """
         self.llm = llm_service
         self.vector_store = vector_store
-        self.question_extractor = QuestionExtractorService(llm_service)
+        # Re-uploaded RFPs with small edits reuse earlier extractions; the
+        # cache shares the vector store's already loaded encoder
+        self.question_extractor = QuestionExtractorService(
+            llm_service,
+            LLMQuestionExtractor(llm_service, SemanticQuestionCache(encoder=vector_store.encoder)),
+        )
+        self.metadata_extractor = MetadataExtractor(llm_service)
         self.qa_agent = QAAgent(llm_service, vector_store)
+        # Questions repeated within or across RFPs reuse earlier answers
+        self.answer_cache = AnswerCache()
         self.formatter = FormatterAgent()
 
         # Ensure output directory exists
@@ -78,7 +99,9 @@ class RFPProcessorService:
             print(f"[{workflow_id}] Starting RFP processing for {client_name}")
 
             # === STEP 1: EXTRACT QUESTIONS ===
-            await self._step_1_extract_questions(workflow_id, rfp_text)
+            rfp_analysis = await self._step_1_extract_questions(workflow_id, rfp_text)
+            # Fall back to the industry inferred during extraction
+            industry = industry or rfp_analysis.get("metadata", {}).get("industry")
 
             # === STEP 2: GENERATE ANSWERS ===
             await self._step_2_generate_answers(workflow_id, client_name, industry)
@@ -90,7 +113,7 @@ class RFPProcessorService:
             await self._step_4_format_document(workflow_id, client_name)
 
             print(f"[{workflow_id}] RFP processing complete!")
-            return get_workflow(workflow_id)
+            return await aget_workflow(workflow_id)
 
         except Exception as e:
             print(f"[{workflow_id}] Error during processing: {e}")
@@ -99,7 +122,7 @@ class RFPProcessorService:
 
             # Update workflow to error state
             try:
-                update_workflow_state(workflow_id, "error")
+                await aupdate_workflow_state(workflow_id, "error")
             except:
                 pass
 
@@ -113,23 +136,28 @@ class RFPProcessorService:
         Args:
             workflow_id: Workflow identifier
             rfp_text: Full text of RFP document
+
+        Returns:
+            The RFP analysis saved to the workflow
         """
         print(f"[{workflow_id}] === STEP 1: EXTRACT QUESTIONS ===")
 
         # Update state to 'analyzing'
-        update_workflow_state(workflow_id, "analyzing")
+        await aupdate_workflow_state(workflow_id, "analyzing")
 
-        # Extract questions using LLM
-        rfp_analysis = self.question_extractor.extract_questions(rfp_text)
+        # Extract questions (and content metadata) with one LLM call, off the
+        # event loop so event streams and other requests keep being served
+        rfp_analysis = await asyncio.to_thread(
+            self.question_extractor.extract_questions_with_metadata, rfp_text, self.metadata_extractor
+        )
 
         print(f"[{workflow_id}] Extracted {rfp_analysis['total_questions']} questions")
         print(f"[{workflow_id}] Detected {len(rfp_analysis['sections'])} sections")
 
         # Save analysis to workflow
-        update_workflow_analysis(workflow_id, rfp_analysis)
+        await aupdate_workflow_analysis(workflow_id, rfp_analysis)
 
-        # Small delay to make the state visible to frontend
-        await asyncio.sleep(0.5)
+        return rfp_analysis
 
     async def _step_2_generate_answers(
         self,
@@ -149,70 +177,144 @@ class RFPProcessorService:
         print(f"[{workflow_id}] === STEP 2: GENERATE ANSWERS ===")
 
         # Get workflow to retrieve questions
-        workflow = get_workflow(workflow_id)
+        workflow = await aget_workflow(workflow_id)
         questions = workflow.get("rfp_analysis", {}).get("questions", [])
 
         if not questions:
             raise ValueError("No questions found in workflow analysis")
 
         # Update state to 'routing'
-        update_workflow_state(workflow_id, "routing")
-        await asyncio.sleep(0.5)
+        await aupdate_workflow_state(workflow_id, "routing")
 
         # Update state to 'generating'
-        update_workflow_state(workflow_id, "generating")
-
-        # Generate answers progressively
-        generated_responses = []
-
+        await aupdate_workflow_state(workflow_id, "generating")
+
+        # Generate answers concurrently; each QA call is I/O bound on the LLM
+        context = f"Client: {client_name}, Industry: {industry or 'Not specified'}"
+        semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        write_lock = asyncio.Lock()
+        answered = [None] * len(questions)
+        completed = 0
+        flushed = 0
+        written = 0  # leading answers already saved to the workflow
+        last_flush = time.monotonic()
+
+        # Repeated questions (ignoring case and spacing) are answered once and
+        # copied to every position that asks them
+        first_positions = {}
+        positions = {}  # first position -> all positions of that question
         for i, question in enumerate(questions):
-            print(f"[{workflow_id}] Generating answer {i+1}/{len(questions)}: {question[:60]}...")
-
-            try:
-                # Generate answer using QA agent
-                answer_result = self.qa_agent.ask(
-                    question=question,
-                    top_k=5,
-                    include_sources=True,
-                    context=f"Client: {client_name}, Industry: {industry or 'Not specified'}"
-                )
-
-                # Format response for storage
-                response = {
-                    "question": question,
-                    "answer": answer_result.answer,
-                    "sources": [
-                        {
-                            "text": source.text,
-                            "score": source.score,
-                            "metadata": source.metadata
+            first = first_positions.setdefault(AnswerCache.normalize_question(question), i)
+            positions.setdefault(first, []).append(i)
+
+        # Cached answers are only reused for the same model, retrieval depth,
+        # client context and knowledge base version
+        answer_scope = f"{self.llm.model}|top_k=5|{context}|kb={self.vector_store.version}"
+        cached_answers = {i: self.answer_cache.get_answer(questions[i], answer_scope) for i in positions}
+
+        # Embed the questions left for the QA agent in one encoder batch up
+        # front, so each QA call only does the index lookup and the LLM round trip
+        to_answer = [i for i, response in cached_answers.items() if response is None]
+        question_embeddings = {}
+        if to_answer:
+            embeddings = await asyncio.to_thread(
+                self.vector_store.encode_queries, [questions[i] for i in to_answer]
+            )
+            question_embeddings = dict(zip(to_answer, embeddings))
+
+        async def answer_question(i: int, question: str):
+            nonlocal completed, flushed, written, last_flush
+            async with semaphore:
+                response = cached_answers[i]
+                if response is not None:
+                    print(f"[{workflow_id}] Reusing cached answer {i+1}/{len(questions)}: {question[:60]}...")
+                else:
+                    response = await self._generate_answer(workflow_id, i, questions, context, question_embeddings)
+                    if response is None:
+                        # Add error response
+                        response = {
+                            "question": question,
+                            "answer": "Unable to generate answer at this time. Please review manually.",
+                            "sources": [],
+                            "confidence": 0.0
                         }
-                        for source in answer_result.sources
-                    ],
-                    "confidence": answer_result.confidence
-                }
-
-                generated_responses.append(response)
-
-                # Progressive update - save after each answer
-                update_workflow_responses(workflow_id, generated_responses)
-
-                # Small delay between questions
-                await asyncio.sleep(0.2)
-
-            except Exception as e:
-                print(f"[{workflow_id}] Error generating answer for question {i+1}: {e}")
-                # Add error response
-                response = {
-                    "question": question,
-                    "answer": "Unable to generate answer at this time. Please review manually.",
-                    "sources": [],
-                    "confidence": 0.0
+                    elif response["confidence"] > 0:
+                        # The QA agent reports LLM failures with zero confidence;
+                        # those are left uncached so the next run retries them
+                        self.answer_cache.set_answer(question, answer_scope, response)
+
+            # Progressive update - save the answers finished so far, in question order,
+            # batched so N answers do not mean N writes. Only the newly completed
+            # run of leading answers is sent, appended to what is already stored;
+            # the first write replaces any list left by an earlier run.
+            # The lock keeps writes from being issued out of order.
+            async with write_lock:
+                for position in positions[i]:
+                    answered[position] = {**response, "question": questions[position]}
+                completed += len(positions[i])
+                if (
+                    completed - flushed >= self.RESPONSE_FLUSH_EVERY
+                    or completed == len(questions)
+                    or time.monotonic() - last_flush > self.RESPONSE_FLUSH_INTERVAL
+                ):
+                    ready = written
+                    while ready < len(answered) and answered[ready] is not None:
+                        ready += 1
+                    if ready > written:
+                        if written == 0:
+                            await aupdate_workflow_responses(workflow_id, answered[:ready])
+                        else:
+                            await aappend_workflow_responses(workflow_id, answered[written:ready])
+                        written = ready
+                    flushed = completed
+                    last_flush = time.monotonic()
+
+        await asyncio.gather(*(answer_question(i, questions[i]) for i in positions))
+
+        print(f"[{workflow_id}] Generated {len(answered)} answers ({len(positions)} unique questions)")
+
+    async def _generate_answer(
+        self,
+        workflow_id: str,
+        i: int,
+        questions: List[str],
+        context: str,
+        question_embeddings: Dict[int, np.ndarray]
+    ) -> Optional[Dict[str, Any]]:
+        """Answer question i with the QA agent, formatted for storage.
+
+        Returns None (after logging) if the answer could not be generated.
+        """
+        question = questions[i]
+        print(f"[{workflow_id}] Generating answer {i+1}/{len(questions)}: {question[:60]}...")
+        try:
+            # Generate answer using QA agent
+            answer_result = await asyncio.to_thread(
+                self.qa_agent.ask,
+                question=question,
+                top_k=5,
+                include_sources=True,
+                context=context,
+                query_embedding=question_embeddings[i]
+            )
+        except Exception as e:
+            print(f"[{workflow_id}] Error generating answer for question {i+1}: {e}")
+            return None
+
+        # Format response for storage
+        return {
+            "question": question,
+            "answer": answer_result.answer,
+            "sources": [
+                {
+                    "text": source.text,
+                    "score": source.score,
+                    "metadata": source.metadata
                 }
-                generated_responses.append(response)
-                update_workflow_responses(workflow_id, generated_responses)
-
-        print(f"[{workflow_id}] Generated {len(generated_responses)} answers")
+                for source in answer_result.sources
+            ],
+            "confidence": answer_result.confidence
+        }
 
     async def _step_3_quality_review(self, workflow_id: str):
         """Step 3: Quality review of generated responses.
@@ -225,19 +327,24 @@ class RFPProcessorService:
         print(f"[{workflow_id}] === STEP 3: QUALITY REVIEW ===")
 
         # Update state to 'reviewing'
-        update_workflow_state(workflow_id, "reviewing")
+        await aupdate_workflow_state(workflow_id, "reviewing")
 
         # Get workflow to retrieve responses
-        workflow = get_workflow(workflow_id)
+        workflow = await aget_workflow(workflow_id)
         responses = workflow.get("generated_responses", [])
 
         if not responses:
             raise ValueError("No responses found in workflow")
 
-        # Perform quality review
-        high_confidence = sum(1 for r in responses if r.get("confidence", 0) >= 0.8)
-        medium_confidence = sum(1 for r in responses if 0.5 <= r.get("confidence", 0) < 0.8)
-        low_confidence = sum(1 for r in responses if r.get("confidence", 0) < 0.5)
+        # Perform quality review on one array of confidences (float64 so the
+        # bucket boundaries compare exactly as the stored floats do)
+        confidence = np.fromiter(
+            (r.get("confidence", 0) for r in responses), dtype=np.float64, count=len(responses)
+        )
+        is_low = confidence < 0.5
+        high_confidence = int(np.count_nonzero(confidence >= 0.8))
+        low_confidence = int(np.count_nonzero(is_low))
+        medium_confidence = int(np.count_nonzero((confidence >= 0.5) & (confidence < 0.8)))
 
         # Calculate completeness
         completeness_score = (high_confidence * 1.0 + medium_confidence * 0.7 + low_confidence * 0.3) / len(responses)
@@ -256,26 +363,23 @@ class RFPProcessorService:
             "high_confidence_count": high_confidence,
             "medium_confidence_count": medium_confidence,
             "low_confidence_count": low_confidence,
-            "issues_found": [],
-            "reviewed_at": datetime.utcnow().isoformat()
-        }
-
-        # Flag low confidence responses
-        for i, response in enumerate(responses):
-            if response.get("confidence", 0) < 0.5:
-                review_result["issues_found"].append({
+            # Flag low confidence responses
+            "issues_found": [
+                {
                     "question_index": i,
-                    "question": response["question"],
+                    "question": responses[i]["question"],
                     "issue": "Low confidence answer - may need manual review",
                     "severity": "warning"
-                })
+                }
+                for i in np.flatnonzero(is_low).tolist()
+            ],
+            "reviewed_at": datetime.utcnow().isoformat()
+        }
 
         print(f"[{workflow_id}] Review complete: {overall_quality} quality, {completeness_score:.2f} completeness")
 
         # Save review result
-        update_workflow_review(workflow_id, review_result)
-
-        await asyncio.sleep(0.5)
+        await aupdate_workflow_review(workflow_id, review_result)
 
     async def _step_4_format_document(self, workflow_id: str, client_name: str):
         """Step 4: Format final document.
@@ -288,11 +392,12 @@ class RFPProcessorService:
         """
         print(f"[{workflow_id}] === STEP 4: FORMAT DOCUMENT ===")
 
-        # Update state to 'formatting'
-        update_workflow_state(workflow_id, "formatting")
-
-        # Get workflow to retrieve all data
-        workflow = get_workflow(workflow_id)
+        # Update state to 'formatting' while reading the workflow data (the
+        # write and read go to separate database executors)
+        _, workflow = await asyncio.gather(
+            aupdate_workflow_state(workflow_id, "formatting"),
+            aget_workflow(workflow_id)
+        )
         questions = workflow.get("rfp_analysis", {}).get("questions", [])
         responses = workflow.get("generated_responses", [])
 
@@ -304,7 +409,9 @@ class RFPProcessorService:
 
         # Format document
         try:
-            formatted_file = self.formatter.format_rfp_response_from_qa(
+            # Building the .docx is blocking work; keep it off the event loop
+            formatted_file = await asyncio.to_thread(
+                self.formatter.format_rfp_response_from_qa,
                 responses=responses,
                 client_name=client_name,
                 output_path=output_path
@@ -313,7 +420,7 @@ class RFPProcessorService:
             print(f"[{workflow_id}] Document formatted: {formatted_file}")
 
             # Update workflow to ready state with output file
-            update_workflow_final(
+            await aupdate_workflow_final(
                 workflow_id=workflow_id,
                 output_file_path=formatted_file,
                 state="ready"
@@ -321,9 +428,9 @@ class RFPProcessorService:
 
             # Create document record for Workflows page
             print(f"[{workflow_id}] Creating document record for Workflows page")
-            markdown_content = self._format_rfp_response_as_markdown(workflow_id)
+            markdown_content = await asyncio.to_thread(self._format_rfp_response_as_markdown, workflow_id)
 
-            save_document(
+            await asave_document(
                 workflow_id=workflow_id,
                 title=f"RFP Response for {client_name}",
                 content=markdown_content,
@@ -335,7 +442,7 @@ class RFPProcessorService:
         except Exception as e:
             print(f"[{workflow_id}] Error formatting document: {e}")
             # Still mark as ready but without file
-            update_workflow_final(
+            await aupdate_workflow_final(
                 workflow_id=workflow_id,
                 state="ready"
             )
@@ -344,9 +451,9 @@ class RFPProcessorService:
             # This ensures the RFP appears in Workflows page
             try:
                 print(f"[{workflow_id}] Creating document record despite formatting error")
-                markdown_content = self._format_rfp_response_as_markdown(workflow_id)
+                markdown_content = await asyncio.to_thread(self._format_rfp_response_as_markdown, workflow_id)
 
-                save_document(
+                await asave_document(
                     workflow_id=workflow_id,
                     title=f"RFP Response for {client_name}",
                     content=markdown_content,
@@ -359,8 +466,6 @@ class RFPProcessorService:
 
             raise
 
-        await asyncio.sleep(0.5)
-
     def _format_rfp_response_as_markdown(self, workflow_id: str) -> str:
         """
         Convert RFP workflow responses into markdown format for document storage.
@@ -447,7 +552,12 @@ class RFPProcessorService:
         Returns:
             Final workflow state dictionary
         """
+        async def run():
+            try:
+                return await self.process_rfp_async(workflow_id, rfp_text, client_name, industry)
+            finally:
+                # Async LLM clients are bound to this loop; release them with it
+                await self.llm.aclose()
+
         # Run the async function in a new event loop
-        return asyncio.run(
-            self.process_rfp_async(workflow_id, rfp_text, client_name, industry)
-        )
+        return asyncio.run(run())
@@ -1,23 +1,128 @@
 """Vector store for semantic search using FAISS."""
+import hashlib
 import os
 import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from config import settings
+from services.embedding_service import load_sentence_transformer
+
+
+class _MmapStringList:
+    """Read-mostly list of strings backed by a memory-mapped UTF-8 file.
+
+    ``offsets`` holds n + 1 cumulative byte offsets into ``data``; strings are
+    decoded when accessed. Strings added after loading stay in memory until
+    the store is saved again.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+        self._loaded = len(offsets) - 1
+        self._added = []
+
+    @classmethod
+    def load(cls, data_file: str, offsets_file: str) -> "_MmapStringList":
+        """Map a documents file written by ``write``."""
+        offsets = np.load(offsets_file, mmap_mode="r")
+        if os.path.getsize(data_file) == 0:
+            data = np.empty(0, dtype=np.uint8)  # np.memmap rejects empty files
+        else:
+            data = np.memmap(data_file, dtype=np.uint8, mode="r")
+        return cls(data, offsets)
+
+    @staticmethod
+    def write(strings, data_file: str, offsets_file: str):
+        """Write strings as one concatenated UTF-8 file plus an offsets array."""
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        with open(data_file, "wb") as f:
+            for i, text in enumerate(strings):
+                encoded = text.encode("utf-8")
+                f.write(encoded)
+                offsets[i + 1] = offsets[i] + len(encoded)
+        # Pass a file object so np.save keeps the name (it appends ".npy" to paths)
+        with open(offsets_file, "wb") as f:
+            np.save(f, offsets)
+
+    def __len__(self) -> int:
+        return self._loaded + len(self._added)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if 0 <= i < self._loaded:
+            start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+            return self._data[start:end].tobytes().decode("utf-8")
+        return self._added[i - self._loaded]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, text: str):
+        self._added.append(text)
+
+    def extend(self, texts: List[str]):
+        self._added.extend(texts)
 
 
 class VectorStore:
     """Vector store for embeddings and semantic search."""
 
-    def __init__(self, model_name: Optional[str] = None, store_path: Optional[str] = None):
-        """Initialize vector store."""
+    # Query embeddings kept in memory (least recently used evicted first)
+    QUERY_CACHE_SIZE = 2048
+
+    # On-disk query embedding cache is pruned once per this many writes
+    EMBEDDING_CACHE_PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        store_path: Optional[str] = None,
+        encoder: Optional[SentenceTransformer] = None,
+        embedding_cache_dir: Optional[str] = "./data/cache/embeddings",
+    ):
+        """Initialize vector store.
+
+        Args:
+            model_name: Sentence-transformers model used to encode queries
+            store_path: Directory holding the persisted index
+            encoder: Already loaded model to reuse instead of loading model_name again
+            embedding_cache_dir: Directory persisting query embeddings across
+                restarts (None keeps the cache in memory only). Holds at most
+                settings.embedding_cache_max_files embeddings.
+        """
         self.model_name = model_name or settings.embedding_model
         self.store_path = store_path or settings.vector_store_path
-        self.encoder = SentenceTransformer(self.model_name)
+        self.encoder = encoder or load_sentence_transformer(self.model_name)
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()  # searches may run in worker threads
+        self.embedding_cache_dir = Path(embedding_cache_dir) if embedding_cache_dir else None
+        if self.embedding_cache_dir is not None:
+            self.embedding_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_writes_since_prune = 0
+        if settings.faiss_omp_threads > 0:
+            import faiss
+
+            # Process-wide; lets deployments that run many searches from
+            # worker threads avoid oversubscribing cores
+            faiss.omp_set_num_threads(settings.faiss_omp_threads)
         self.index = None
+        self._index_mapped = False  # index data is a read-only view of faiss.index
         self.documents = []
         self.metadata = []
+        self._filter_columns = {}
+        # Changes whenever the stored documents do; callers caching results
+        # derived from the knowledge base key them on it
+        self.version = None
         self._load_or_create_index()
 
     def _load_or_create_index(self):
@@ -25,18 +130,41 @@ class VectorStore:
         os.makedirs(self.store_path, exist_ok=True)
 
         index_file = f"{self.store_path}/faiss.index"
-        docs_file = f"{self.store_path}/documents.pkl"
+        docs_file = f"{self.store_path}/documents.bin"
+        offsets_file = f"{self.store_path}/documents.offsets.npy"
+        legacy_docs_file = f"{self.store_path}/documents.pkl"
         meta_file = f"{self.store_path}/metadata.pkl"
+        version_file = f"{self.store_path}/version"
 
         if os.path.exists(index_file):
             try:
                 import faiss
 
-                self.index = faiss.read_index(index_file)
-                with open(docs_file, "rb") as f:
-                    self.documents = pickle.load(f)
+                # Memory-map the vectors instead of reading them into RAM; pages
+                # are loaded on demand and shared between worker processes.
+                # IO_FLAG_MMAP_IFC is the flag that maps flat, scalar-quantized
+                # and HNSW storage (plain IO_FLAG_MMAP reads those fully).
+                self.index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+                self._index_mapped = True
+                self._configure_search()
+                self._ensure_inner_product()
+                self._maybe_upgrade_index()
+                if os.path.exists(docs_file):
+                    self.documents = _MmapStringList.load(docs_file, offsets_file)
+                else:
+                    # Stores saved before documents.bin existed
+                    with open(legacy_docs_file, "rb") as f:
+                        self.documents = pickle.load(f)
                 with open(meta_file, "rb") as f:
                     self.metadata = pickle.load(f)
+                self._filter_columns = {}
+                if os.path.exists(version_file):
+                    with open(version_file) as f:
+                        self.version = f.read().strip()
+                else:
+                    # Stores saved before the version file existed
+                    stat = os.stat(index_file)
+                    self.version = f"{stat.st_size}-{stat.st_mtime_ns}"
                 print(f"Loaded existing index with {len(self.documents)} documents")
             except Exception as e:
                 print(f"Failed to load index: {e}. Creating new index.")
@@ -45,69 +173,495 @@ class VectorStore:
             self._create_new_index()
 
     def _create_new_index(self):
-        """Create a new FAISS index."""
-        import faiss
+        """Create a new FAISS index.
 
-        # Create a flat L2 index (simple but works well for small datasets)
+        With ``vector_index_type="hnsw"`` the store still starts as an exact
+        flat index and switches to HNSW once it holds ``hnsw_min_documents``
+        vectors; below that a brute-force scan is as fast and exact. Likewise
+        int8 storage is only used once ``int8_min_documents`` vectors exist to
+        train the quantizer on.
+        """
         dimension = self.encoder.get_sentence_embedding_dimension()
-        self.index = faiss.IndexFlatL2(dimension)
+        index_type, dtype = self._target_index_kind(0)
+        self.index = self._build_index(index_type, dimension, dtype)
+        self._index_mapped = False
         self.documents = []
         self.metadata = []
-        print(f"Created new FAISS index with dimension {dimension}")
+        self._filter_columns = {}
+        self._bump_version()
+        print(f"Created new FAISS {index_type} ({dtype}) index with dimension {dimension}")
+
+    def _target_index_kind(self, ntotal: int) -> Tuple[str, str]:
+        """Return the (index_type, dtype) the settings call for at ntotal vectors."""
+        index_type = "flat"
+        if settings.vector_index_type == "hnsw" and ntotal >= settings.hnsw_min_documents:
+            index_type = "hnsw"
+        dtype = settings.vector_storage_dtype
+        if dtype == "int8" and ntotal < max(settings.int8_min_documents, 1):
+            dtype = "fp32"
+        return index_type, dtype
+
+    def _index_kind(self) -> Tuple[str, str]:
+        """Return the (index_type, dtype) of the current index."""
+        import faiss
+
+        is_hnsw = hasattr(self.index, "hnsw")
+        storage = faiss.downcast_index(self.index.storage) if is_hnsw else self.index
+        qtype = getattr(getattr(storage, "sq", None), "qtype", None)
+        dtype = {
+            faiss.ScalarQuantizer.QT_fp16: "fp16",
+            faiss.ScalarQuantizer.QT_8bit: "int8",
+        }.get(qtype, "fp32")
+        return ("hnsw" if is_hnsw else "flat"), dtype
+
+    def _build_index(self, index_type: str, dimension: int, dtype: str = "fp32"):
+        """Build an empty FAISS index of the given type ("hnsw" or "flat").
+
+        Indexes use inner product over L2-normalized vectors, so search
+        distances are cosine similarities. int8 indexes must be trained before
+        vectors are added.
+        """
+        import faiss
+
+        # fp16 needs no training, so it works with incremental adds while
+        # halving the memory held per vector; int8 quarters it but learns
+        # each dimension's range from training vectors
+        qtype = {
+            "fp16": faiss.ScalarQuantizer.QT_fp16,
+            "int8": faiss.ScalarQuantizer.QT_8bit,
+        }.get(dtype)
+        if index_type == "hnsw":
+            # Approximate graph index: search cost grows ~log(N) instead of N
+            if qtype is not None:
+                index = faiss.IndexHNSWSQ(dimension, qtype, settings.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexHNSWFlat(dimension, settings.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = settings.hnsw_ef_construction
+            index.hnsw.efSearch = settings.hnsw_ef_search
+            return index
+        if qtype is not None:
+            return faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+        # Exact flat index (brute force, fine for small datasets)
+        return faiss.IndexFlatIP(dimension)
 
-    def add_documents(self, documents: List[str], metadata: Optional[List[Dict[str, Any]]] = None):
-        """Add documents to the vector store."""
+    def _ensure_inner_product(self):
+        """Rebuild an index saved with the old L2 metric as a cosine index."""
+        import faiss
+
+        if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            return
+
+        index_type, dtype = self._index_kind()
+        vectors = np.ascontiguousarray(self.index.reconstruct_n(0, self.index.ntotal), dtype="float32")
+        faiss.normalize_L2(vectors)
+        index = self._build_index(index_type, self.index.d, dtype)
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        self.index = index
+        self._index_mapped = False
+        print(f"Converted FAISS index to inner product (cosine) at {index.ntotal} vectors")
+
+    def _maybe_upgrade_index(self):
+        """Rebuild the index once it has grown enough for HNSW or int8 storage.
+
+        Indexes are only ever upgraded (flat to HNSW, float to int8), never
+        converted back.
+        """
+        current_type, current_dtype = self._index_kind()
+        target_type, target_dtype = self._target_index_kind(self.index.ntotal)
+        needs_hnsw = target_type == "hnsw" and current_type != "hnsw"
+        needs_int8 = target_dtype == "int8" and current_dtype != "int8"
+        if not (needs_hnsw or needs_int8):
+            return
+
+        index_type = "hnsw" if needs_hnsw else current_type
+        dtype = "int8" if needs_int8 else current_dtype
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        index = self._build_index(index_type, self.index.d, dtype)
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        self.index = index
+        self._index_mapped = False
+        print(f"Switched to FAISS {index_type} ({dtype}) index at {index.ntotal} vectors")
+
+    def _own_index(self):
+        """Copy a memory-mapped index into memory before it is modified.
+
+        Mapped storage is a read-only view, and FAISS aborts the process
+        (rather than raising) when a view is resized.
+        """
+        import faiss
+
+        if not self._index_mapped:
+            return
+        self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+        self._index_mapped = False
+        self._configure_search()
+
+    def _configure_search(self):
+        """Apply search-time parameters to HNSW indexes."""
+        if hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = settings.hnsw_ef_search
+
+    def add_documents(
+        self,
+        documents: List[str],
+        metadata: Optional[List[Dict[str, Any]]] = None,
+        batch_size: int = 64,
+        dedup_threshold: Optional[float] = 0.95,
+    ):
+        """Add documents to the vector store.
+
+        Documents whose embedding has cosine similarity of at least
+        ``dedup_threshold`` with a stored document (or an earlier one in the
+        same call) are skipped; pass None to add everything.
+        """
         if not documents:
             return
 
         # Generate embeddings
-        embeddings = self.encoder.encode(documents, convert_to_numpy=True)
+        embeddings = self.encoder.encode(
+            documents, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+        )
+
+        self.add_documents_with_embeddings(documents, embeddings, metadata, dedup_threshold=dedup_threshold)
+
+    def add_documents_with_embeddings(
+        self,
+        documents: List[str],
+        embeddings: np.ndarray,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+        dedup_threshold: Optional[float] = 0.95,
+    ):
+        """Add documents whose embeddings were already computed.
+
+        The embeddings must come from the same model as this store's encoder,
+        otherwise search results are meaningless. Near-duplicates are skipped
+        as in ``add_documents``.
+        """
+        import faiss
+
+        if not documents:
+            return
+
+        # Normalize a private copy, so inner product search yields cosine
+        embeddings = np.array(embeddings, dtype="float32", order="C")
+        if embeddings.shape != (len(documents), self.index.d):
+            raise ValueError(
+                f"Expected embeddings of shape ({len(documents)}, {self.index.d}), got {embeddings.shape}"
+            )
+        faiss.normalize_L2(embeddings)
+        if not metadata:
+            metadata = [{}] * len(documents)
 
-        # Add to FAISS index
-        self.index.add(embeddings.astype("float32"))
+        skipped = 0
+        if dedup_threshold is not None:
+            keep = self._novel_mask(embeddings, dedup_threshold)
+            skipped = len(documents) - int(keep.sum())
+            if skipped:
+                embeddings = embeddings[keep]
+                documents = [doc for doc, kept in zip(documents, keep) if kept]
+                metadata = [meta for meta, kept in zip(metadata, keep) if kept]
 
-        # Store documents and metadata
-        self.documents.extend(documents)
-        if metadata:
+        if documents:
+            # Add to FAISS index
+            self._own_index()
+            self.index.add(embeddings)
+            self._maybe_upgrade_index()
+
+            # Store documents and metadata
+            self.documents.extend(documents)
             self.metadata.extend(metadata)
-        else:
-            self.metadata.extend([{}] * len(documents))
+            self._filter_columns.clear()
+            self._bump_version()
+
+        skipped_note = f" ({skipped} near-duplicates skipped)" if skipped else ""
+        print(f"Added {len(documents)} documents{skipped_note}. Total: {len(self.documents)}")
+
+    def _bump_version(self):
+        """Give the store a new version after its contents changed."""
+        self.version = uuid.uuid4().hex
+
+    def _novel_mask(self, embeddings: np.ndarray, threshold: float, block_size: int = 256) -> np.ndarray:
+        """Mask of rows that are not near-duplicates of stored or earlier rows.
+
+        ``embeddings`` must be L2-normalized. A row is a near-duplicate when
+        its cosine similarity with its nearest stored vector, or with a row
+        kept earlier in ``embeddings``, reaches ``threshold``. The batch is
+        compared block by block so large ingests never build a full pairwise
+        matrix.
+        """
+        import faiss
+
+        keep = np.ones(len(embeddings), dtype=bool)
+        if self.index.ntotal:
+            # Index distances are cosine similarities (-inf padding when none found)
+            similarities, _ = self.index.search(embeddings, 1)
+            keep &= similarities[:, 0] < threshold
 
-        print(f"Added {len(documents)} documents. Total: {len(self.documents)}")
+        kept = faiss.IndexFlatIP(embeddings.shape[1])  # rows kept so far in this batch
+        for start in range(0, len(embeddings), block_size):
+            block = embeddings[start:start + block_size]
+            block_keep = keep[start:start + block_size].copy()
+            if kept.ntotal:
+                similarities, _ = kept.search(block, 1)
+                block_keep &= similarities[:, 0] < threshold
+            pairwise = block @ block.T
+            for i in range(1, len(block)):
+                if block_keep[i] and (pairwise[i, :i][block_keep[:i]] >= threshold).any():
+                    block_keep[i] = False
+            keep[start:start + block_size] = block_keep
+            kept.add(block[block_keep])
+        return keep
 
     def search(self, query: str, top_k: Optional[int] = None, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
         """Search for similar documents."""
-        k = top_k or settings.top_k_results
+        return self.search_batch([query], top_k=top_k, filters=filters)[0]
+
+    def search_batch(self, queries: List[str], top_k: Optional[int] = None, filters: Optional[Dict[str, Any]] = None) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """Search for several queries with one encoder pass and one index lookup.
+
+        Returns one result list per query, aligned with ``queries``.
+        """
+        if len(self.documents) == 0 or not queries:
+            return [[] for _ in queries]
+
+        # Encode queries (repeated questions are served from the cache)
+        query_embeddings = self.encode_queries(queries)
 
+        return self._search_embeddings(query_embeddings, top_k, filters)
+
+    def search_with_embedding(
+        self, query_embedding: np.ndarray, top_k: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Search with a query embedding already computed by encode_queries."""
         if len(self.documents) == 0:
             return []
 
-        # Encode query
-        query_embedding = self.encoder.encode([query], convert_to_numpy=True).astype("float32")
+        query_embeddings = np.asarray(query_embedding, dtype="float32").reshape(1, -1)
+        return self._search_embeddings(query_embeddings, top_k, filters)[0]
+
+    def _search_embeddings(
+        self, query_embeddings: np.ndarray, top_k: Optional[int], filters: Optional[Dict[str, Any]]
+    ) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """Run the index lookup for a (n, d) float32 batch of query embeddings.
+
+        Filters are applied before the lookup, so up to ``top_k`` matching
+        documents are returned rather than the matches among the top k.
+        """
+        import faiss
+
+        k = top_k or settings.top_k_results
+
+        params = None
+        candidates = len(self.documents)
+        if filters:
+            mask = self._filter_mask(filters)
+            candidates = int(mask.sum())
+            if candidates == 0:
+                return [[] for _ in query_embeddings]
+            if candidates < len(mask):
+                params = self._selector_params(np.flatnonzero(mask))
+
+        # Search in FAISS; with normalized queries the distances are cosine similarities
+        query_embeddings = np.array(query_embeddings, dtype="float32", order="C")
+        faiss.normalize_L2(query_embeddings)
+        distances, indices = self.index.search(query_embeddings, min(k, candidates), params=params)
+
+        all_results = []
+        for row_indices, row_distances in zip(indices, distances):
+            results = []
+            for idx, distance in zip(row_indices, row_distances):
+                # HNSW pads with -1 when fewer than k neighbours are found
+                if 0 <= idx < len(self.documents):
+                    # Clamp cosine to the 0-1 range scores are used in (scalar
+                    # quantized indexes can land slightly outside it)
+                    similarity = min(max(distance, 0.0), 1.0)
+
+                    doc = self.documents[idx]
+                    meta = self.metadata[idx] if idx < len(self.metadata) else {}
+
+                    results.append((doc, float(similarity), meta))
+            all_results.append(results)
+
+        return all_results
 
-        # Search in FAISS
-        # FAISS returns distances, we convert to similarity scores
-        distances, indices = self.index.search(query_embedding, min(k, len(self.documents)))
+    def _filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of documents matching ``filters``.
 
-        results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.documents):
-                # Convert L2 distance to similarity score (inverse)
-                # Normalize to 0-1 range
-                similarity = 1 / (1 + distance)
+        A document matches when every filter key it has equals the filter
+        value; keys a document lacks are ignored.
+        """
+        mask = np.ones(len(self.documents), dtype=bool)
+        for key, value in filters.items():
+            codes, interned = self._filter_column(key)
+            try:
+                code = interned.get(value, -2) if interned is not None else None
+            except TypeError:
+                code = None
+            if code is None:
+                # Unhashable values cannot be interned; compare row by row
+                mask &= np.fromiter(
+                    (key not in meta or meta.get(key) == value for meta in self._metadata_rows()),
+                    dtype=bool,
+                    count=len(self.documents),
+                )
+            else:
+                mask &= (codes == code) | (codes == -1)
+        return mask
+
+    def _filter_column(self, key: str):
+        """Return (codes, interned) for one metadata key, building it on first use.
+
+        ``codes`` holds an integer id per document for the key's value (-1 when
+        the document lacks the key), so filters compare whole arrays at once.
+        ``interned`` maps values to ids; both are None if values are unhashable.
+        """
+        column = self._filter_columns.get(key)
+        if column is None:
+            codes = np.full(len(self.documents), -1, dtype=np.int64)
+            interned = {}
+            try:
+                for i, meta in enumerate(self._metadata_rows()):
+                    if key in meta:
+                        codes[i] = interned.setdefault(meta.get(key), len(interned))
+                column = (codes, interned)
+            except TypeError:
+                column = (None, None)
+            self._filter_columns[key] = column
+        return column
+
+    def _metadata_rows(self):
+        """Yield one metadata dict per document (empty where metadata is missing)."""
+        for i in range(len(self.documents)):
+            yield self.metadata[i] if i < len(self.metadata) else {}
+
+    def _selector_params(self, ids: np.ndarray):
+        """Build FAISS search parameters restricting results to ``ids``."""
+        import faiss
+
+        selector = faiss.IDSelectorBatch(ids.astype("int64"))
+        if hasattr(self.index, "hnsw"):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.index.hnsw.efSearch)
+        return faiss.SearchParameters(sel=selector)
+
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries, reusing cached embeddings for ones seen before.
+
+        Lookups go to the in-memory LRU first, then to the on-disk cache; only
+        the remaining queries are sent to the encoder, in one batch.
+        """
+        keys = [
+            hashlib.blake2b(f"{self.model_name}\0{query}".encode("utf-8"), digest_size=16).hexdigest()
+            for query in queries
+        ]
+
+        embeddings = [None] * len(queries)
+        missing = {}  # key -> positions still needing an embedding
+        for i, key in enumerate(keys):
+            embedding = self._cached_query_embedding(key)
+            if embedding is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                embeddings[i] = embedding
+
+        if missing:
+            to_encode = [queries[positions[0]] for positions in missing.values()]
+            encoded = self.encoder.encode(to_encode, batch_size=len(to_encode), convert_to_numpy=True).astype("float32")
+            for (key, positions), embedding in zip(missing.items(), encoded):
+                self._store_query_embedding(key, embedding)
+                for i in positions:
+                    embeddings[i] = embedding
 
-                doc = self.documents[idx]
-                meta = self.metadata[idx] if idx < len(self.metadata) else {}
+        return np.stack(embeddings)
 
-                # Apply filters if provided
-                if filters:
-                    match = all(meta.get(k) == v for k, v in filters.items() if k in meta)
-                    if not match:
-                        continue
+    def _cached_query_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Look up a query embedding in memory, then on disk."""
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(key)
+            if embedding is not None:
+                self._query_cache.move_to_end(key)
+                return embedding
 
-                results.append((doc, float(similarity), meta))
+        if self.embedding_cache_dir is None:
+            return None
+        cache_path = self.embedding_cache_dir / key[:2] / f"{key}.npy"
+        try:
+            embedding = np.load(cache_path)
+            os.utime(cache_path)  # mtime tracks last use for pruning
+        except (OSError, ValueError):
+            return None
+        self._remember_query_embedding(key, embedding)
+        return embedding
 
-        return results
+    def _store_query_embedding(self, key: str, embedding: np.ndarray):
+        """Cache a freshly encoded query embedding in memory and on disk."""
+        self._remember_query_embedding(key, embedding)
+        if self.embedding_cache_dir is None:
+            return
+        cache_path = self.embedding_cache_dir / key[:2] / f"{key}.npy"
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            # np.save appends ".npy", so the temp name must already end with it
+            tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, embedding)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            print(f"[VectorStore] ERROR - Failed to write embedding cache: {e}")
+            return
+
+        with self._query_cache_lock:
+            self._cache_writes_since_prune += 1
+            prune_due = self._cache_writes_since_prune >= self.EMBEDDING_CACHE_PRUNE_EVERY
+            if prune_due:
+                self._cache_writes_since_prune = 0
+        if prune_due:
+            self.prune_embedding_cache()
+
+    def prune_embedding_cache(self, max_files: Optional[int] = None) -> int:
+        """Delete the least recently used on-disk query embeddings beyond the cap.
+
+        Args:
+            max_files: File cap (defaults to settings.embedding_cache_max_files)
+
+        Returns:
+            Number of cached embeddings deleted
+        """
+        if self.embedding_cache_dir is None:
+            return 0
+        if max_files is None:
+            max_files = settings.embedding_cache_max_files
+
+        files = []
+        for path in self.embedding_cache_dir.glob("*/*.npy"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        excess = len(files) - max_files
+        if excess <= 0:
+            return 0
+
+        files.sort()
+        removed = 0
+        for _, path in files[:excess]:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        print(f"[VectorStore] Pruned {removed} cached query embeddings")
+        return removed
+
+    def _remember_query_embedding(self, key: str, embedding: np.ndarray):
+        """Insert into the in-memory LRU, evicting the oldest entry when full."""
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
 
     def save(self):
         """Save the index to disk."""
@@ -116,14 +670,31 @@ class VectorStore:
         os.makedirs(self.store_path, exist_ok=True)
 
         index_file = f"{self.store_path}/faiss.index"
-        docs_file = f"{self.store_path}/documents.pkl"
+        docs_file = f"{self.store_path}/documents.bin"
+        offsets_file = f"{self.store_path}/documents.offsets.npy"
+        legacy_docs_file = f"{self.store_path}/documents.pkl"
         meta_file = f"{self.store_path}/metadata.pkl"
+        version_file = f"{self.store_path}/version"
 
-        faiss.write_index(self.index, index_file)
-        with open(docs_file, "wb") as f:
-            pickle.dump(self.documents, f)
-        with open(meta_file, "wb") as f:
+        # Every file is written beside its target and then renamed over it:
+        # the loaded index and documents may be memory-mapped from the old
+        # files, and truncating those in place would invalidate the mappings
+        tmp_suffix = f".{os.getpid()}.tmp"
+        faiss.write_index(self.index, index_file + tmp_suffix)
+        _MmapStringList.write(self.documents, docs_file + tmp_suffix, offsets_file + tmp_suffix)
+        with open(meta_file + tmp_suffix, "wb") as f:
             pickle.dump(self.metadata, f)
+        self._bump_version()
+        with open(version_file + tmp_suffix, "w") as f:
+            f.write(self.version)
+
+        os.replace(index_file + tmp_suffix, index_file)
+        os.replace(docs_file + tmp_suffix, docs_file)
+        os.replace(offsets_file + tmp_suffix, offsets_file)
+        os.replace(meta_file + tmp_suffix, meta_file)
+        os.replace(version_file + tmp_suffix, version_file)
+        if os.path.exists(legacy_docs_file):
+            os.remove(legacy_docs_file)
 
         print(f"Saved index with {len(self.documents)} documents")
 
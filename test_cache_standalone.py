@@ -6,38 +6,57 @@ This script tests the cache without needing any dependencies.
 import json
 import hashlib
 import os
+import sqlite3
 import time
 from pathlib import Path
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 # Inline cache implementation for testing
 class QuestionCache:
-    """File-based cache for extracted questions."""
+    """SQLite-backed cache for extracted questions (same layout as services/question_cache.py)."""
+
+    # Demo entries expire like the service's default TTL
+    TTL_SECONDS = 86400
 
     def __init__(self, cache_dir: str = "./data/cache/questions"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_dir / "cache.db"), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            "key TEXT PRIMARY KEY, questions BLOB NOT NULL, cached_at TEXT, document_length INTEGER, "
+            "last_access INTEGER, expires_at INTEGER)"
+        )
 
     def _generate_cache_key(self, document_text: str) -> str:
-        text_hash = hashlib.sha256(document_text.encode('utf-8')).hexdigest()
+        # Same key as services/question_cache.py: xxh3 when installed
+        data = document_text.encode('utf-8')
+        if xxhash is not None:
+            text_hash = xxhash.xxh3_128_hexdigest(data)
+        else:
+            text_hash = hashlib.sha256(data).hexdigest()
         return text_hash[:16]
 
-    def _get_cache_path(self, cache_key: str) -> Path:
-        return self.cache_dir / f"{cache_key}.json"
-
     def get(self, document_text: str):
         cache_key = self._generate_cache_key(document_text)
-        cache_path = self._get_cache_path(cache_key)
-
-        if not cache_path.exists():
-            print(f"[Cache] MISS - No cached questions for key {cache_key}")
-            return None
 
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            row = self.conn.execute(
+                "SELECT questions, cached_at FROM question_cache WHERE key = ? AND expires_at > ?",
+                (cache_key, int(time.time()))
+            ).fetchone()
+            if row is None:
+                print(f"[Cache] MISS - No cached questions for key {cache_key}")
+                return None
 
-            questions = cache_data.get('questions', [])
-            cached_at = cache_data.get('cached_at', 'unknown')
+            questions = json.loads(row[0])
+            cached_at = row[1] or 'unknown'
 
             print(f"[Cache] HIT - Found {len(questions)} cached questions (key: {cache_key}, cached: {cached_at})")
             return questions
@@ -48,19 +67,23 @@ class QuestionCache:
 
     def set(self, document_text: str, questions: list) -> bool:
         cache_key = self._generate_cache_key(document_text)
-        cache_path = self._get_cache_path(cache_key)
+        now = int(time.time())
 
         try:
             from datetime import datetime
-            cache_data = {
-                'questions': questions,
-                'cached_at': datetime.utcnow().isoformat(),
-                'question_count': len(questions),
-                'document_length': len(document_text)
-            }
-
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO question_cache "
+                "(key, questions, cached_at, document_length, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    json.dumps(questions, ensure_ascii=False).encode('utf-8'),
+                    datetime.utcnow().isoformat(),
+                    len(document_text),
+                    now,
+                    now + self.TTL_SECONDS
+                )
+            )
 
             print(f"[Cache] SAVED - Cached {len(questions)} questions (key: {cache_key})")
             return True
@@ -71,11 +94,12 @@ class QuestionCache:
 
     def get_cache_stats(self) -> dict:
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_size = sum(f.stat().st_size for f in cache_files)
+            count, total_size = self.conn.execute(
+                "SELECT count(*), coalesce(sum(length(questions)), 0) FROM question_cache"
+            ).fetchone()
 
             return {
-                'cache_count': len(cache_files),
+                'cache_count': count,
                 'total_size_bytes': total_size,
                 'cache_dir': str(self.cache_dir)
             }
@@ -184,7 +208,7 @@ def main():
     print("📊 TEST 3: Cache Statistics")
     print("-" * 80)
     stats = cache.get_cache_stats()
-    print(f"  Cache files: {stats['cache_count']}")
+    print(f"  Cache entries: {stats['cache_count']}")
     print(f"  Total size: {stats['total_size_bytes']} bytes")
     print(f"  Cache directory: {stats['cache_dir']}")
     print()
@@ -224,7 +248,7 @@ def main():
     print("=" * 80)
     print("✅ SUMMARY")
     print("=" * 80)
-    print("✓ File-based caching is working correctly!")
+    print("✓ SQLite-backed caching is working correctly!")
     print("✓ Cache MISS on first call → calls LLM (~2-5 seconds)")
     print("✓ Cache HIT on subsequent calls → instant (<5ms)")
     print("✓ Different content correctly generates different cache keys")
@@ -233,7 +257,7 @@ def main():
     print(f"💰 Performance benefit: ~2-5 seconds saved per cache hit (avoids LLM call)")
     print(f"💵 Cost benefit: Saves OpenAI API costs on repeated requests")
     print()
-    print("🔍 Cache files stored at: ./data/cache/questions/")
+    print("🔍 Cache database stored at: ./data/cache/questions/cache.db")
     print()
 
 if __name__ == "__main__":
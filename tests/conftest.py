@@ -0,0 +1,25 @@
+"""Shared pytest configuration.
+
+Runs the suite against a shared-cache in-memory SQLite database instead of
+./data/proposals.db, so tests skip disk writes and leave the development
+database untouched. Set DATABASE_URL to run them against a real database.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the project packages (config, models, services, ...) importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Must be set before config.settings is first imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///file:test_proposals?mode=memory&cache=shared&uri=true")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once per run (the in-memory database starts empty)."""
+    from models.database import init_database
+
+    init_database()
@@ -4,7 +4,7 @@ Integration Test Script for RFP Upload Flow
 
 This script tests the complete end-to-end RFP processing workflow:
 1. Upload RFP document
-2. Poll workflow status
+2. Stream workflow status (polling fallback)
 3. Monitor state transitions
 4. Download generated document
 
@@ -16,15 +16,59 @@ import requests
 import time
 import sys
 import os
+import shutil
 import argparse
 from pathlib import Path
 from datetime import datetime
-import json
+import numpy as np
+import orjson
+import random
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 API_BASE_URL = os.getenv("API_URL", "http://localhost:8000")
-POLL_INTERVAL = 2  # seconds
+POLL_INTERVAL_MIN = 0.25  # seconds; first poll after a state change
+POLL_INTERVAL_MAX = 5.0  # seconds; backoff cap
+POLL_BACKOFF = 1.5
 MAX_WAIT_TIME = 300  # 5 minutes
+# Created once in main()
+UPLOAD_DIR = Path("./data/uploads")
+OUTPUT_DIR = Path("./data/outputs")
+# States after which the server's event stream closes
+TERMINAL_STATES = {"ready", "human_review", "closed", "error"}
+STATE_MESSAGES = {
+    "analyzing": "Extracting questions from RFP...",
+    "routing": "Routing questions to agents...",
+    "generating": "Generating answers...",
+    "reviewing": "Performing quality review...",
+    "formatting": "Formatting final document...",
+    "ready": "RFP processing complete! ✓",
+}
+
+
+def _make_session() -> requests.Session:
+    """Session reusing pooled keep-alive connections across all API calls.
+
+    Idempotent requests are retried on transient gateway errors; POSTs are
+    never retried (urllib3's default), so uploads are not duplicated.
+
+    HTTP/1.1 is deliberate: uvicorn does not serve HTTP/2, and the calls
+    here are sequential (the event stream is the only long-lived request),
+    so a multiplexing client would gain nothing.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = _make_session()
 
 
 class Colors:
@@ -38,32 +82,48 @@ class Colors:
     END = '\033[0m'
     BOLD = '\033[1m'
 
+    @classmethod
+    def disable(cls):
+        """Blank every code, e.g. when output is piped to a file."""
+        for name in ("HEADER", "BLUE", "CYAN", "GREEN", "YELLOW", "RED", "END", "BOLD"):
+            setattr(cls, name, "")
+
+
+if not sys.stdout.isatty():
+    Colors.disable()
+
+# Message prefixes, built once; each helper emits its message in one write
+_HEADER_RULE = f"{Colors.BOLD}{Colors.HEADER}{'=' * 80}{Colors.END}\n"
+_HEADER_PREFIX = f"{Colors.BOLD}{Colors.HEADER}"
+_STEP_PREFIX = f"{Colors.BOLD}{Colors.CYAN}[Step "
+_SUCCESS_PREFIX = f"{Colors.GREEN}✓ "
+_ERROR_PREFIX = f"{Colors.RED}✗ "
+_INFO_PREFIX = f"{Colors.BLUE}ℹ "
+
 
 def print_header(text):
     """Print colored header."""
-    print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.HEADER}{text.center(80)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.HEADER}{'='*80}{Colors.END}\n")
+    sys.stdout.write(f"\n{_HEADER_RULE}{_HEADER_PREFIX}{text.center(80)}{Colors.END}\n{_HEADER_RULE}\n")
 
 
 def print_step(step_num, text):
     """Print step indicator."""
-    print(f"{Colors.BOLD}{Colors.CYAN}[Step {step_num}]{Colors.END} {text}")
+    sys.stdout.write(f"{_STEP_PREFIX}{step_num}]{Colors.END} {text}\n")
 
 
 def print_success(text):
     """Print success message."""
-    print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+    sys.stdout.write(f"{_SUCCESS_PREFIX}{text}{Colors.END}\n")
 
 
 def print_error(text):
     """Print error message."""
-    print(f"{Colors.RED}✗ {text}{Colors.END}")
+    sys.stdout.write(f"{_ERROR_PREFIX}{text}{Colors.END}\n")
 
 
 def print_info(text):
     """Print info message."""
-    print(f"{Colors.BLUE}ℹ {text}{Colors.END}")
+    sys.stdout.write(f"{_INFO_PREFIX}{text}{Colors.END}\n")
 
 
 def create_sample_rfp_file():
@@ -150,11 +210,13 @@ Thank you for your submission. We look forward to reviewing your proposal.
 """
 
     # Create sample file
-    sample_file = Path("./data/uploads/sample_rfp.txt")
-    sample_file.parent.mkdir(parents=True, exist_ok=True)
+    sample_file = UPLOAD_DIR / "sample_rfp.txt"
+    data = sample_rfp.encode("utf-8")
 
-    with open(sample_file, "w") as f:
-        f.write(sample_rfp)
+    # The content is constant, so keep a file left by an earlier run
+    if not (sample_file.is_file() and sample_file.stat().st_size == len(data)
+            and sample_file.read_bytes() == data):
+        sample_file.write_bytes(data)
 
     return str(sample_file)
 
@@ -177,7 +239,7 @@ def upload_rfp(file_path: str, client_name: str, industry: str = None):
             if industry:
                 data['industry'] = industry
 
-            response = requests.post(
+            response = SESSION.post(
                 f"{API_BASE_URL}/api/v1/rfp/upload",
                 files=files,
                 data=data,
@@ -185,7 +247,7 @@ def upload_rfp(file_path: str, client_name: str, industry: str = None):
             )
 
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             workflow_id = result.get("workflow_id")
             print_success(f"RFP uploaded successfully!")
             print_info(f"Workflow ID: {workflow_id}")
@@ -201,80 +263,164 @@ def upload_rfp(file_path: str, client_name: str, industry: str = None):
         return None, False
 
 
-def poll_workflow_status(workflow_id: str):
+def print_state_transition(workflow):
+    """Print a one-line description of the workflow's new state."""
+    current_state = workflow.get("state")
+    message = STATE_MESSAGES.get(current_state)
+
+    if current_state == "ready":
+        print_success(f"State: {current_state} - {message}")
+    elif message:
+        print_info(f"State: {current_state} - {message}")
+    else:
+        print_info(f"State: {current_state}")
+
+    if current_state == "generating":
+        # Show progress if responses are available
+        done, total = response_progress(workflow)
+        if done:
+            print_info(f"  Progress: {done}/{total} answers generated")
+
+
+def response_progress(workflow):
+    """Return (answers generated, total questions) from a workflow or a status summary."""
+    if "responses_count" in workflow:
+        return workflow["responses_count"], workflow.get("total_questions") or 0
+    total = (workflow.get("rfp_analysis") or {}).get("total_questions", 0)
+    return len(workflow.get("generated_responses") or []), total
+
+
+def watch_workflow_status(workflow_id: str):
     """
-    Step 2: Poll workflow status and monitor state transitions.
+    Step 2: Monitor workflow state transitions.
+
+    Subscribes once to the server-sent events stream, so each transition
+    arrives as it happens instead of being discovered by a later poll. Falls
+    back to polling when the stream is unavailable or interrupted.
 
     Returns:
         tuple: (final_workflow, success)
     """
     print_step(2, "Monitoring workflow progress...")
 
-    start_time = time.time()
-    last_state = None
+    start_time = time.monotonic()
     state_history = []
 
+    try:
+        response = SESSION.get(
+            f"{API_BASE_URL}/api/v1/workflows/{workflow_id}/events",
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(10, MAX_WAIT_TIME)
+        )
+    except requests.exceptions.RequestException as e:
+        print_info(f"Event stream unavailable ({e}), polling instead")
+        return poll_workflow_status(workflow_id, start_time, state_history)
+
+    if response.status_code != 200:
+        response.close()
+        print_info(f"Event stream unavailable ({response.status_code}), polling instead")
+        return poll_workflow_status(workflow_id, start_time, state_history)
+
+    with response:
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                elapsed = time.monotonic() - start_time
+                if elapsed > MAX_WAIT_TIME:
+                    print_error(f"Timeout: Workflow did not complete within {MAX_WAIT_TIME} seconds")
+                    return None, False
+
+                # Skip keep-alive comments and event-name lines
+                if not line or not line.startswith("data:"):
+                    continue
+
+                workflow = orjson.loads(line[5:])
+                current_state = workflow.get("state")
+                state_history.append((current_state, elapsed))
+                print_state_transition(workflow)
+
+                if current_state == "ready":
+                    print_success(f"Workflow completed in {elapsed:.1f} seconds")
+                    print_state_summary(state_history)
+                    return workflow, True
+
+                elif current_state in TERMINAL_STATES:
+                    print_error(f"Workflow stopped in state '{current_state}'")
+                    return workflow, False
+        except requests.exceptions.RequestException as e:
+            print_info(f"Event stream interrupted ({e}), polling instead")
+            return poll_workflow_status(workflow_id, start_time, state_history)
+
+    # Stream closed without a terminal state (e.g. workflow deleted)
+    print_error("Event stream ended before the workflow finished")
+    return None, False
+
+
+def poll_workflow_status(workflow_id: str, start_time: float = None, state_history: list = None):
+    """
+    Poll workflow status and monitor state transitions.
+
+    Fallback for servers without the event stream.
+
+    Args:
+        workflow_id: Workflow to poll
+        start_time: time.monotonic() when monitoring started (defaults to now)
+        state_history: Transitions already observed, extended in place
+
+    Returns:
+        tuple: (final_workflow, success)
+    """
+    if start_time is None:
+        start_time = time.monotonic()
+    if state_history is None:
+        state_history = []
+
+    last_state = state_history[-1][0] if state_history else None
+    last_response_count = 0
+    poll_count = 0
+
     while True:
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         if elapsed > MAX_WAIT_TIME:
             print_error(f"Timeout: Workflow did not complete within {MAX_WAIT_TIME} seconds")
             return None, False
 
         try:
-            response = requests.get(
-                f"{API_BASE_URL}/api/v1/workflows/{workflow_id}",
+            # Poll the lightweight summary; the full workflow is fetched once at the end
+            response = SESSION.get(
+                f"{API_BASE_URL}/api/v1/workflows/{workflow_id}/status",
                 timeout=10
             )
 
             if response.status_code == 200:
-                workflow = response.json()
-                current_state = workflow.get("state")
+                status = orjson.loads(response.content)
+                current_state = status.get("state")
 
                 # Print state transition
                 if current_state != last_state:
-                    state_history.append((current_state, time.time() - start_time))
-
-                    if current_state == "analyzing":
-                        print_info(f"State: {current_state} - Extracting questions from RFP...")
-                    elif current_state == "routing":
-                        print_info(f"State: {current_state} - Routing questions to agents...")
-                    elif current_state == "generating":
-                        print_info(f"State: {current_state} - Generating answers...")
-                        # Show progress if responses are available
-                        responses = workflow.get("generated_responses", [])
-                        if responses:
-                            total = workflow.get("rfp_analysis", {}).get("total_questions", 0)
-                            print_info(f"  Progress: {len(responses)}/{total} answers generated")
-                    elif current_state == "reviewing":
-                        print_info(f"State: {current_state} - Performing quality review...")
-                    elif current_state == "formatting":
-                        print_info(f"State: {current_state} - Formatting final document...")
-                    elif current_state == "ready":
-                        print_success(f"State: {current_state} - RFP processing complete! ✓")
-                    else:
-                        print_info(f"State: {current_state}")
-
+                    state_history.append((current_state, time.monotonic() - start_time))
+                    print_state_transition(status)
                     last_state = current_state
+                    # Progress restarts the fast-poll regime
+                    poll_count = 0
 
                 # Check if complete
                 if current_state == "ready":
                     print_success(f"Workflow completed in {elapsed:.1f} seconds")
                     print_state_summary(state_history)
-                    return workflow, True
+                    return fetch_workflow(workflow_id), True
 
                 elif current_state == "error":
                     print_error("Workflow encountered an error")
-                    return workflow, False
+                    return fetch_workflow(workflow_id), False
 
-                # Progressive update during generating
+                # Progressive update during generating, only when a new answer arrived
                 if current_state == "generating":
-                    responses = workflow.get("generated_responses", [])
-                    if responses:
-                        # Show latest answer briefly
-                        latest = responses[-1]
-                        question = latest.get("question", "")[:60] + "..."
-                        print(f"  ├─ Latest: {question}", end='\r')
+                    done, total = response_progress(status)
+                    if done != last_response_count:
+                        last_response_count = done
+                        print(f"  ├─ Answers: {done}/{total}", end='\r')
 
             else:
                 print_error(f"Failed to get workflow status: {response.status_code}")
@@ -284,7 +430,18 @@ def poll_workflow_status(workflow_id: str):
             print_error(f"Polling error: {str(e)}")
             return None, False
 
-        time.sleep(POLL_INTERVAL)
+        # Exponential backoff with jitter: quick to notice fast transitions,
+        # few pointless GETs while a long step is running
+        interval = min(POLL_INTERVAL_MAX, POLL_INTERVAL_MIN * (POLL_BACKOFF ** poll_count))
+        poll_count += 1
+        time.sleep(interval + random.uniform(0, 0.1))
+
+
+def fetch_workflow(workflow_id: str):
+    """Fetch the full workflow JSON once polling has finished."""
+    response = SESSION.get(f"{API_BASE_URL}/api/v1/workflows/{workflow_id}", timeout=30)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
 def print_state_summary(state_history):
@@ -323,14 +480,20 @@ def print_workflow_results(workflow):
         print(f"\n{Colors.BOLD}Generated Responses:{Colors.END}")
         print(f"  Total Responses: {len(responses)}")
 
+        # One pass to collect confidences (float64 so bucket boundaries
+        # compare exactly as the stored floats do)
+        confidence = np.fromiter(
+            (r.get("confidence", 0) for r in responses), dtype=np.float64, count=len(responses)
+        )
+
         # Calculate average confidence
-        avg_confidence = sum(r.get("confidence", 0) for r in responses) / len(responses)
+        avg_confidence = float(confidence.mean())
         print(f"  Average Confidence: {avg_confidence:.2%}")
 
         # Show confidence distribution
-        high = sum(1 for r in responses if r.get("confidence", 0) >= 0.8)
-        medium = sum(1 for r in responses if 0.5 <= r.get("confidence", 0) < 0.8)
-        low = sum(1 for r in responses if r.get("confidence", 0) < 0.5)
+        high = int(np.count_nonzero(confidence >= 0.8))
+        medium = int(np.count_nonzero((confidence >= 0.5) & (confidence < 0.8)))
+        low = int(np.count_nonzero(confidence < 0.5))
 
         print(f"  Confidence Distribution:")
         print(f"    High (≥80%):   {high}")
@@ -364,27 +527,28 @@ def download_document(workflow_id: str):
     print_step(4, "Downloading generated document...")
 
     try:
-        response = requests.get(
+        with SESSION.get(
             f"{API_BASE_URL}/api/v1/download/{workflow_id}",
+            stream=True,
             timeout=30
-        )
+        ) as response:
 
-        if response.status_code == 200:
-            # Save file
-            filename = f"rfp_response_{workflow_id}.docx"
-            output_path = Path("./data/outputs") / filename
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if response.status_code == 200:
+                # Save file, copying the raw stream to disk in 1 MiB reads
+                filename = f"rfp_response_{workflow_id}.docx"
+                output_path = OUTPUT_DIR / filename
 
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+                response.raw.decode_content = True
+                with open(output_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
 
-            print_success(f"Document downloaded successfully!")
-            print_info(f"Saved to: {output_path}")
-            return str(output_path), True
+                print_success(f"Document downloaded successfully!")
+                print_info(f"Saved to: {output_path}")
+                return str(output_path), True
 
-        else:
-            print_error(f"Download failed: {response.status_code}")
-            return None, False
+            else:
+                print_error(f"Download failed: {response.status_code}")
+                return None, False
 
     except Exception as e:
         print_error(f"Download error: {str(e)}")
@@ -394,7 +558,7 @@ def download_document(workflow_id: str):
 def test_health_check():
     """Test API health check."""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             print_success("API is healthy and running")
             return True
@@ -421,6 +585,9 @@ def main():
 
     API_BASE_URL = args.api_url
 
+    for directory in (UPLOAD_DIR, OUTPUT_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
     print_header("RFP UPLOAD WORKFLOW - INTEGRATION TEST")
 
     # Pre-flight check
@@ -441,7 +608,7 @@ def main():
         print_success(f"Sample RFP created: {rfp_file}")
 
     # Execute test steps
-    start_time = time.time()
+    start_time = time.monotonic()
 
     # Step 1: Upload
     workflow_id, success = upload_rfp(rfp_file, args.client, args.industry)
@@ -450,7 +617,7 @@ def main():
         sys.exit(1)
 
     # Step 2: Poll and monitor
-    workflow, success = poll_workflow_status(workflow_id)
+    workflow, success = watch_workflow_status(workflow_id)
     if not success or not workflow:
         print_error("\nTest failed at Step 2: Polling")
         sys.exit(1)
@@ -465,7 +632,7 @@ def main():
         sys.exit(1)
 
     # Final summary
-    total_time = time.time() - start_time
+    total_time = time.monotonic() - start_time
 
     print_header("TEST SUMMARY")
     print_success(f"All tests passed! ✓")
@@ -497,13 +497,10 @@ async function handleAddKnowledge(e) {
             }
         }
 
-        const params = new URLSearchParams({ text });
-        if (metadata) {
-            params.append('metadata', JSON.stringify(metadata));
-        }
-
-        const response = await fetch(`${API_BASE_URL}/api/v1/knowledge/add?${params}`, {
+        const response = await fetch(`${API_BASE_URL}/api/v1/knowledge/add`, {
             method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(metadata ? { text, metadata } : { text }),
         });
 
         if (!response.ok) {